@@ -7,7 +7,12 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import streamlit as st
+import trading_environment.env
 import xgboost as xgb
+from core_utils.config import load_config
+from core_utils.intervals import periods_per_year
+from data_ingestor.store import MarketDataStore, dataset_name
+from feature_engineer.store import FeatureStore
 from gymnasium import spaces
 from scipy.stats import gaussian_kde
 from stable_baselines3 import PPO
@@ -15,6 +20,8 @@ from stable_baselines3 import PPO
 # Add project root to sys path for imports
 sys.path.append(os.path.abspath("."))
 
+from src.backtesting.cache import BacktestCache  # noqa: E402
+
 # ==============================================================================
 # 🚀 PAGE CONFIG & THEMING (Bloomberg & Palantir Dark Aesthetic)
 # ==============================================================================
@@ -116,25 +123,15 @@ st.markdown(
 )
 
 # Paths
-DATA_PATH = "data/RELIANCE.NS_processed.parquet"
+SYMBOL = "RELIANCE.NS"
+INTERVAL = "1d"
+ANN_FACTOR = periods_per_year(INTERVAL)  # bars per year
 XGB_PATH = "artifacts/xgb/xgb_directional.json"
 PPO_META_PATH = "artifacts/ppo/ppo_meta_policy"
 PPO_DIR_PATH = "artifacts/ppo/ppo_directional"
 
 # Feature Columns (Used in observation space)
-feature_cols = [
-    "ret_1d_z",
-    "ret_5d_z",
-    "sma_20_z",
-    "sma_50_z",
-    "rsi_z",
-    "macd_z",
-    "macd_signal_z",
-    "bb_width_z",
-    "vol_sma_z",
-    "vol_ratio_z",
-    "trend_sma",
-]
+feature_cols = load_config().features.model_columns()
 
 
 # ==============================================================================
@@ -220,13 +217,49 @@ class TradingEnv(gym.Env):
 @st.cache_data
 def run_cached_backtests():
     try:
-        df = pd.read_parquet(DATA_PATH).reset_index()
+        df = (
+            MarketDataStore()
+            .read(dataset_name("processed", INTERVAL), symbols=[SYMBOL])
+            .reset_index()
+        )
+        if df.empty:
+            raise FileNotFoundError(f"No processed data stored for {SYMBOL}")
     except Exception as e:
         st.error(f"Error loading processed market data: {e}")
         return None
 
+    if FeatureStore.from_config(INTERVAL).stale([SYMBOL]):
+        st.warning(f"Stored features for {SYMBOL} are stale; rerun run_feature_engineer.py")
+
     df = df[np.isfinite(df[feature_cols]).all(axis=1)].reset_index(drop=True)
 
+    # Persistent across restarts while the models, this file and the data are unchanged
+    cache = BacktestCache()
+    cache_key = cache.key(
+        [
+            XGB_PATH,
+            f"{PPO_DIR_PATH}.zip",
+            f"{PPO_META_PATH}.zip",
+            __file__,
+            trading_environment.env.__file__,
+        ],
+        df,
+        {"symbol": SYMBOL, "interval": INTERVAL, "feature_cols": feature_cols},
+    )
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached[0]
+
+    df, complete = simulate_strategies(df)
+    if complete:  # never persist fallback predictions
+        cache.put(cache_key, df, params={"script": "dashboard", "symbol": SYMBOL})
+    return df
+
+
+def simulate_strategies(df):
+    """Run all four strategies; returns (df, False if any model fell back)."""
+    complete = True
+
     # Precompute XGBoost directional probabilities
     try:
         booster = xgb.Booster()
@@ -236,6 +269,7 @@ def run_cached_backtests():
     except Exception as e:
         st.warning(f"Failed to load XGBoost model: {e}. Falling back to default predictions.")
         df["xgb_prob"] = 0.50
+        complete = False
 
     # 1. Buy & Hold Strategy
     bh_pnl = df["ret_1d"].iloc[1:].values
@@ -277,6 +311,7 @@ def run_cached_backtests():
     except Exception:
         ppo_only_pnl = df["ret_1d"].values * 0.2
         ppo_only_pos = [0] * len(df)
+        complete = False
 
     while len(ppo_only_pnl) < len(df):
         ppo_only_pnl.append(0.0)
@@ -303,6 +338,7 @@ def run_cached_backtests():
     except Exception:
         aegis_pnl = df["ret_1d"].values * 1.2
         aegis_pos = [1] * len(df)
+        complete = False
 
     while len(aegis_pnl) < len(df):
         aegis_pnl.append(0.0)
@@ -325,7 +361,7 @@ def run_cached_backtests():
             periods.append("OOS Test")
     df["period"] = periods
 
-    return df
+    return df, complete
 
 
 # ==============================================================================
@@ -395,13 +431,15 @@ if raw_df is not None:
 
     # Performance Calculator
     def calculate_stats(pnl, eq):
-        ann_ret = (eq.iloc[-1] / eq.iloc[0]) ** (252 / len(eq)) - 1 if eq.iloc[-1] > 0 else -1.0
-        ann_vol = pnl.std() * np.sqrt(252)
-        sharpe = np.sqrt(252) * pnl.mean() / pnl.std() if pnl.std() != 0 else 0
+        ann_ret = (
+            (eq.iloc[-1] / eq.iloc[0]) ** (ANN_FACTOR / len(eq)) - 1 if eq.iloc[-1] > 0 else -1.0
+        )
+        ann_vol = pnl.std() * np.sqrt(ANN_FACTOR)
+        sharpe = np.sqrt(ANN_FACTOR) * pnl.mean() / pnl.std() if pnl.std() != 0 else 0
 
         downside_pnl = pnl[pnl < 0]
-        downside_std = downside_pnl.std() * np.sqrt(252) if len(downside_pnl) > 0 else 0
-        sortino = (pnl.mean() * 252) / downside_std if downside_std != 0 else 0
+        downside_std = downside_pnl.std() * np.sqrt(ANN_FACTOR) if len(downside_pnl) > 0 else 0
+        sortino = (pnl.mean() * ANN_FACTOR) / downside_std if downside_std != 0 else 0
 
         peak = eq.cummax()
         drawdowns = (eq / peak) - 1
@@ -1316,8 +1354,8 @@ if raw_df is not None:
 
         with col_risk_right:
             st.subheader("Rolling 30D Volatility Surface")
-            rolling_vol_aegis = df["sim_aegis_pnl"].rolling(30).std() * np.sqrt(252) * 100.0
-            rolling_vol_bh = df["sim_bh_pnl"].rolling(30).std() * np.sqrt(252) * 100.0
+            rolling_vol_aegis = df["sim_aegis_pnl"].rolling(30).std() * np.sqrt(ANN_FACTOR) * 100.0
+            rolling_vol_bh = df["sim_bh_pnl"].rolling(30).std() * np.sqrt(ANN_FACTOR) * 100.0
 
             fig_vol = go.Figure()
             fig_vol.add_trace(
@@ -1,3 +1,4 @@
 from core_utils.config import AegisSettings, load_config
 from core_utils.errors import AegisException, ConfigError, DataLeakageError, RiskLimitBreachedError
 from core_utils.logger import get_logger
+from core_utils.schema import compact_schema
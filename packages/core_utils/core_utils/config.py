@@ -4,6 +4,8 @@ import yaml
 from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from core_utils.schema import BINARY_COLS
+
 
 class XGBoostConfig(BaseModel):
     n_estimators: int = Field(default=500, ge=10)
@@ -34,6 +36,41 @@ class StrategyParams(BaseModel):
     consensus_gate: str = "hard_agreement"
 
 
+class IndicatorParams(BaseModel):
+    """Indicator lookbacks in trading days (converted to bars per interval)."""
+
+    ret_period: int = Field(default=5, ge=1)
+    sma_short: int = Field(default=20, ge=1)
+    sma_long: int = Field(default=50, ge=1)
+    rsi_period: int = Field(default=14, ge=1)
+    macd_fast: int = Field(default=12, ge=1)
+    macd_slow: int = Field(default=26, ge=1)
+    macd_signal: int = Field(default=9, ge=1)
+
+
+class FeatureParams(BaseModel):
+    rolling_window: int = Field(default=60, ge=2)
+    indicators: IndicatorParams = IndicatorParams()
+    columns: list[str] = [
+        "ret_1d",
+        "ret_5d",
+        "sma_20",
+        "sma_50",
+        "rsi",
+        "macd",
+        "macd_signal",
+        "bb_width",
+        "vol_sma",
+        "vol_ratio",
+        "trend_sma",
+    ]
+
+    def model_columns(self) -> list[str]:
+        """Model inputs: z-scores of continuous features, then raw binary flags."""
+        continuous = [f"{c}_z" for c in self.columns if c not in BINARY_COLS]
+        return continuous + [c for c in self.columns if c in BINARY_COLS]
+
+
 class RiskParams(BaseModel):
     max_drawdown_limit: float = Field(default=0.15, gt=0.0, lt=1.0)
     max_volatility_limit: float = Field(default=0.03, gt=0.0, lt=1.0)
@@ -47,6 +84,7 @@ class AegisSettings(BaseSettings):
     use_mock_broker: bool = True
 
     strategy: StrategyParams = StrategyParams()
+    features: FeatureParams = FeatureParams()
     xgboost: XGBoostConfig = XGBoostConfig()
     ppo: PPOConfig = PPOConfig()
     risk: RiskParams = RiskParams()
@@ -0,0 +1,28 @@
+import math
+
+# NSE cash session: 09:15 - 15:30 IST
+SESSION_OPEN = "09:15"
+SESSION_MINUTES = 375
+TRADING_DAYS_PER_YEAR = 252
+
+INTERVAL_MINUTES = {"1m": 1, "5m": 5, "15m": 15, "30m": 30, "1h": 60}
+SUPPORTED_INTERVALS = ("1d", *INTERVAL_MINUTES)
+
+
+def bars_per_day(interval: str = "1d") -> int:
+    """Bars in one trading session (a partial last bar counts as a bar)."""
+    if interval == "1d":
+        return 1
+    if interval not in INTERVAL_MINUTES:
+        raise ValueError(f"Unsupported interval '{interval}'. Use one of {SUPPORTED_INTERVALS}")
+    return math.ceil(SESSION_MINUTES / INTERVAL_MINUTES[interval])
+
+
+def periods_per_year(interval: str = "1d") -> int:
+    """Annualisation factor for per-bar returns."""
+    return TRADING_DAYS_PER_YEAR * bars_per_day(interval)
+
+
+def bars_for_days(days: float, interval: str = "1d") -> int:
+    """Convert a lookback expressed in trading days into bars at `interval`."""
+    return max(1, int(round(days * bars_per_day(interval))))
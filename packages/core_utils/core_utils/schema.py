@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+# Raw prices stay float64: returns are differences of nearby prices and float32
+# would cost ~1e-4 absolute precision on a 4-digit quote.
+PRICE_COLS = ("open", "high", "low", "close")
+BINARY_COLS = ("trend_sma",)
+CATEGORICAL_COLS = ("symbol",)
+
+
+def volume_dtype(values: pd.Series) -> type | None:
+    """int32 when integral volumes fit, int64 when they do not, None if not integral."""
+    arr = values.to_numpy()
+    if values.isna().any() or (arr.dtype.kind == "f" and not np.all(np.mod(arr, 1) == 0)):
+        return None
+
+    info = np.iinfo(np.int32)
+    if arr.size == 0 or (info.min <= arr.min() and arr.max() <= info.max):
+        return np.int32
+    return np.int64
+
+
+def compact_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compact dtypes for market and feature frames:
+    - `symbol` -> category (dictionary-encoded in parquet)
+    - `volume` -> int32 when it fits, else int64
+    - binary flags (`trend_sma`) -> int8
+    - every other float column (features, z-scores) -> float32
+    OHLC prices keep float64.
+    """
+    mapping: dict[str, object] = {}
+
+    for col in df.columns:
+        dtype = df[col].dtype
+        if col in CATEGORICAL_COLS:
+            if not isinstance(dtype, pd.CategoricalDtype):
+                mapping[col] = "category"
+        elif col in PRICE_COLS:
+            continue
+        elif col == "volume":
+            narrow = volume_dtype(df[col])
+            if narrow is not None and narrow != dtype:
+                mapping[col] = narrow
+        elif col in BINARY_COLS:
+            if not df[col].isna().any():
+                mapping[col] = np.int8
+        elif pd.api.types.is_float_dtype(dtype) and dtype != np.float32:
+            mapping[col] = np.float32
+
+    return df.astype(mapping) if mapping else df
@@ -1 +1,12 @@
-from data_ingestor.ingestor import DataIngestor
+from data_ingestor.cache import CachedSource
+from data_ingestor.ingestor import DataIngestor, FetchReport, canonicalize_ohlcv
+from data_ingestor.sources import (
+    DataSource,
+    LocalParquetSource,
+    YFinanceSource,
+    get_source,
+    register_source,
+)
+from data_ingestor.store import MarketDataStore
+from data_ingestor.synthetic import SyntheticSource, synthetic_symbols
+from data_ingestor.validation import ValidationReport, validate_panel, validate_store
@@ -0,0 +1,201 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+import pandas as pd
+
+from data_ingestor.sources import DataSource
+
+
+class CachedSource(DataSource):
+    """
+    Content-addressed on-disk cache in front of another DataSource.
+
+    Entries are keyed by (source, symbol, interval, start, end). A range that ends
+    before today is closed history and never expires; an open-ended range (the
+    most recent, still-forming period) expires after `recent_ttl` seconds.
+    Open-ended requests are split at the start of the current year, so the bulk of
+    the history lands in an immutable entry that later runs keep hitting.
+    Least-recently-used entries are evicted once the cache exceeds `max_bytes`.
+    """
+
+    def __init__(
+        self,
+        source: DataSource,
+        cache_dir: str = "data/cache/raw",
+        max_bytes: int = 2 * 1024**3,
+        recent_ttl: float = 6 * 3600,
+    ):
+        self.source = source
+        self.name = source.name
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.recent_ttl = recent_ttl
+
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._index_path = os.path.join(cache_dir, "index.json")
+        os.makedirs(cache_dir, exist_ok=True)
+        self._index = self._load_index()
+
+    # ==================================================
+    # KEYS & INDEX
+    # ==================================================
+    @staticmethod
+    def cache_key(source_name, symbol, interval, start, end) -> str:
+        raw = json.dumps([source_name, symbol, interval, str(start), str(end)])
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.parquet")
+
+    @staticmethod
+    def is_closed_range(end) -> bool:
+        return end is not None and pd.Timestamp(end) <= pd.Timestamp.now().normalize()
+
+    def _load_index(self) -> dict:
+        if not os.path.exists(self._index_path):
+            return {}
+        try:
+            with open(self._index_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self):
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".json.tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(self._index, f)
+        os.replace(tmp, self._index_path)
+
+    # ==================================================
+    # FETCH
+    # ==================================================
+    def fetch(self, symbol, start=None, end=None, interval="1d"):
+        if self.is_closed_range(end):
+            return self._fetch_cached(symbol, start, end, interval)
+
+        boundary = pd.Timestamp.now().normalize().replace(month=1, day=1)
+        if start is None or pd.Timestamp(start) >= boundary:
+            return self._fetch_cached(symbol, start, end, interval)
+
+        closed = self._fetch_cached(symbol, start, boundary.strftime("%Y-%m-%d"), interval)
+        recent = self._fetch_cached(symbol, boundary.strftime("%Y-%m-%d"), end, interval)
+        parts = [p for p in (closed, recent) if not p.empty]
+        if len(parts) < 2:
+            return parts[0] if parts else closed
+
+        df = pd.concat(parts)
+        return df[~df.index.duplicated(keep="last")]
+
+    def _fetch_cached(self, symbol, start, end, interval):
+        key = self.cache_key(self.source.name, symbol, interval, start, end)
+        path = self._entry_path(key)
+        now = time.time()
+
+        with self._lock:
+            entry = self._index.get(key)
+            fresh = entry is not None and os.path.exists(path)
+            if fresh and entry["expires"] is not None and now >= entry["expires"]:
+                self.expired += 1
+                fresh = False
+            if fresh:
+                entry["last_access"] = now
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if fresh:
+            return pd.read_parquet(path)
+
+        df = self.source.fetch(symbol, start=start, end=end, interval=interval)
+        if not df.empty:
+            self._put(key, path, df, symbol, interval, start, end)
+        return df
+
+    def _put(self, key, path, df, symbol, interval, start, end):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".parquet.tmp")
+        os.close(fd)
+        df.to_parquet(tmp)
+        os.replace(tmp, path)
+
+        now = time.time()
+        with self._lock:
+            self._index[key] = {
+                "source": self.source.name,
+                "symbol": symbol,
+                "interval": interval,
+                "start": str(start),
+                "end": str(end),
+                "size": os.path.getsize(path),
+                "created": now,
+                "last_access": now,
+                "expires": None if self.is_closed_range(end) else now + self.recent_ttl,
+            }
+            self._evict()
+            self._save_index()
+
+    def _evict(self):
+        total = sum(e["size"] for e in self._index.values())
+        if total <= self.max_bytes:
+            return
+
+        for key in sorted(self._index, key=lambda k: self._index[k]["last_access"]):
+            if total <= self.max_bytes:
+                break
+            total -= self._index.pop(key)["size"]
+            path = self._entry_path(key)
+            if os.path.exists(path):
+                os.remove(path)
+            self.evictions += 1
+
+    # ==================================================
+    # MAINTENANCE
+    # ==================================================
+    def flush(self):
+        """Persist last-access times (hits only update them in memory)."""
+        with self._lock:
+            self._save_index()
+
+    def invalidate(self, symbol) -> int:
+        """Drop every entry of `symbol`, closed history included; returns the count."""
+        with self._lock:
+            keys = [k for k, e in self._index.items() if e["symbol"] == symbol]
+            for key in keys:
+                del self._index[key]
+                path = self._entry_path(key)
+                if os.path.exists(path):
+                    os.remove(path)
+            if keys:
+                self._save_index()
+        return len(keys)
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._index):
+                path = self._entry_path(key)
+                if os.path.exists(path):
+                    os.remove(path)
+            self._index = {}
+            self._save_index()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._index),
+                "bytes": sum(e["size"] for e in self._index.values()),
+            }
@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+
+from data_ingestor.ingestor import OHLCV_COLS
+
+
+def merge_new_bars(
+    existing: pd.DataFrame,
+    new: pd.DataFrame,
+    rtol: float = 1e-6,
+) -> pd.DataFrame:
+    """
+    Append bars newer than the last stored one.
+    Bars present in both frames must agree; a mismatch means the source restated
+    history (split, dividend, correction) and the symbol needs a full refresh.
+
+    The last stored bar is exempt: it may have been fetched while its period was
+    still open (a partial intraday daily bar), so a refetched version replaces it.
+    """
+    last = existing.index.max()
+    overlap = existing.index.intersection(new.index)
+    overlap = overlap[overlap < last]
+    if len(overlap) > 0:
+        old_vals = existing.loc[overlap, OHLCV_COLS].to_numpy(dtype=float)
+        new_vals = new.loc[overlap, OHLCV_COLS].to_numpy(dtype=float)
+        if not np.allclose(old_vals, new_vals, rtol=rtol, atol=0.0, equal_nan=True):
+            raise ValueError(
+                f"Overlapping bars differ from stored history ({len(overlap)} overlapping rows)"
+            )
+
+    if last in new.index:
+        return pd.concat([existing[existing.index < last], new[new.index >= last]])
+    return pd.concat([existing, new[new.index > last]])
@@ -1,59 +1,154 @@
+import time
 import warnings
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 
 import pandas as pd
-import yfinance as yf
+
+from data_ingestor.sources import DataSource, RateLimiter, YFinanceSource
 
 warnings.filterwarnings("ignore")
 
+OHLCV_COLS = ["open", "high", "low", "close", "volume"]
+
+
+def canonicalize_ohlcv(df: pd.DataFrame, symbol: str) -> pd.DataFrame:
+    """Map a raw source frame onto the canonical open/high/low/close/volume/symbol schema."""
+    # Flatten yfinance (Price, Ticker) column MultiIndex
+    if isinstance(df.columns, pd.MultiIndex):
+        df = df.copy()
+        df.columns = [c[0] for c in df.columns]
+
+    # SAFE column mapping
+    df = df.rename(
+        columns={
+            "Open": "open",
+            "High": "high",
+            "Low": "low",
+            "Close": "close",
+            "Volume": "volume",
+        }
+    )
+    df = df.loc[:, ~df.columns.duplicated()]
+
+    # HARD RULE: drop adjusted close to avoid corporate-action leakage
+    df = df[OHLCV_COLS].copy()
+
+    # Enforce datetime index (intraday feeds are tz-aware: keep exchange wall-clock time)
+    df.index = pd.to_datetime(df.index)
+    if df.index.tz is not None:
+        df.index = df.index.tz_localize(None)
+    df = df.sort_index()
+    df.index.name = "date"
+
+    df["symbol"] = symbol
+    return df
+
+
+@dataclass
+class FetchReport:
+    """Structured outcome of a multi-symbol fetch."""
+
+    successes: dict[str, pd.DataFrame] = field(default_factory=dict)
+    failures: dict[str, str] = field(default_factory=dict)
+    timings: dict[str, float] = field(default_factory=dict)
+    attempts: dict[str, int] = field(default_factory=dict)
+    wall_time: float = 0.0
+
+    def summary(self) -> pd.DataFrame:
+        rows = []
+        for symbol in list(self.successes) + list(self.failures):
+            rows.append(
+                {
+                    "symbol": symbol,
+                    "status": "ok" if symbol in self.successes else "failed",
+                    "rows": len(self.successes[symbol]) if symbol in self.successes else 0,
+                    "attempts": self.attempts.get(symbol, 0),
+                    "seconds": self.timings.get(symbol, 0.0),
+                    "error": self.failures.get(symbol, ""),
+                }
+            )
+        return pd.DataFrame(rows)
+
 
 class DataIngestor:
-    def __init__(self, symbols, start_date="2020-01-01"):
+    def __init__(
+        self,
+        symbols,
+        start_date="2020-01-01",
+        source: DataSource | None = None,
+        interval: str = "1d",
+        max_workers: int = 1,
+        rate_limit: float | None = None,
+        max_retries: int = 2,
+        backoff: float = 1.0,
+    ):
         self.symbols = symbols
         self.start_date = start_date
+        self.source = source or YFinanceSource()
+        self.interval = interval
+        self.max_workers = max(1, max_workers)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.rate_limiter = RateLimiter(rate_limit)
 
     def fetch_historical(self) -> dict[str, pd.DataFrame]:
-        data = {}
-
-        for symbol in self.symbols:
-            print(f"Fetching {symbol}...")
+        return self.fetch_report().successes
+
+    def fetch_report(self, start_dates: dict | None = None) -> FetchReport:
+        """
+        Fetch every symbol with at most `max_workers` requests in flight.
+        Each symbol is retried with exponential backoff before being reported as failed.
+        `start_dates` overrides the start date per symbol (incremental ingestion).
+        """
+        start_dates = start_dates or {}
+        report = FetchReport()
+        t0 = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            results = pool.map(
+                lambda s: self._fetch_symbol(s, start_dates.get(s, self.start_date)),
+                self.symbols,
+            )
+
+            for symbol, df, error, attempts, elapsed in results:
+                report.attempts[symbol] = attempts
+                report.timings[symbol] = elapsed
+                if error is None:
+                    report.successes[symbol] = df
+                else:
+                    report.failures[symbol] = error
+
+        report.wall_time = time.perf_counter() - t0
+        return report
+
+    def _fetch_symbol(self, symbol, start):
+        print(f"Fetching {symbol}...")
+        t0 = time.perf_counter()
+        error = None
+        attempts = 0
+
+        for attempt in range(self.max_retries + 1):
+            attempts = attempt + 1
+            self.rate_limiter.wait()
             try:
-                df = yf.download(
-                    symbol,
-                    start=self.start_date,
-                    progress=False,
-                    auto_adjust=False,
-                )
+                df = self.source.fetch(symbol, start=start, interval=self.interval)
 
                 if df.empty:
+                    # Not transient: the source has nothing for this symbol/range
                     print(f"WARNING: No data for {symbol}")
-                    continue
-
-                # SAFE column mapping
-                df = df.rename(
-                    columns={
-                        "Open": "open",
-                        "High": "high",
-                        "Low": "low",
-                        "Close": "close",
-                        "Volume": "volume",
-                    }
-                )
-
-                # HARD RULE: drop adjusted close to avoid corporate-action leakage
-                df = df[["open", "high", "low", "close", "volume"]]
-
-                # Enforce datetime index
-                df.index = pd.to_datetime(df.index)
-                df = df.sort_index()
-                df.index.name = "date"
-
-                df["symbol"] = symbol
-                data[symbol] = df
+                    return symbol, None, "No data", attempts, time.perf_counter() - t0
+
+                df = canonicalize_ohlcv(df, symbol)
+                return symbol, df, None, attempts, time.perf_counter() - t0
 
             except Exception as e:
-                print(f"ERROR: Error fetching {symbol}: {e}")
+                error = f"{type(e).__name__}: {e}"
+                if attempt < self.max_retries:
+                    time.sleep(self.backoff * (2**attempt))
 
-        return data
+        print(f"ERROR: Error fetching {symbol}: {error}")
+        return symbol, None, error, attempts, time.perf_counter() - t0
 
     @staticmethod
     def basic_validation(df: pd.DataFrame):
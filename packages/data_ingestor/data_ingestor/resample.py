@@ -0,0 +1,121 @@
+from collections.abc import Iterable, Iterator
+
+import pandas as pd
+from core_utils.intervals import INTERVAL_MINUTES, SESSION_OPEN
+
+from data_ingestor.ingestor import OHLCV_COLS
+
+AGG = {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+
+
+def interval_rule(interval: str) -> tuple[str, pd.Timedelta | None]:
+    """pandas floor rule and bucket offset for an interval (intraday buckets anchor at the open)."""
+    if interval == "1d":
+        return "1D", None
+    if interval not in INTERVAL_MINUTES:
+        raise ValueError(f"Unsupported interval '{interval}'")
+    return f"{INTERVAL_MINUTES[interval]}min", pd.Timedelta(SESSION_OPEN + ":00")
+
+
+class StreamingResampler:
+    """
+    Incremental OHLCV aggregation (open=first, high=max, low=min, close=last, volume=sum).
+
+    Feed time-ordered chunks of fine bars (any number of symbols) to update(); it returns
+    the coarse bars that can no longer change. The last, still-open bucket of every symbol
+    is carried over to the next chunk, so memory is bounded by the chunk size. Call
+    flush() after the final chunk to emit the remaining partial buckets.
+    """
+
+    def __init__(self, interval: str = "15m"):
+        self.interval = interval
+        self.rule, self.offset = interval_rule(interval)
+        self._pending = pd.DataFrame()
+
+    def _bucket(self, idx: pd.DatetimeIndex) -> pd.DatetimeIndex:
+        if self.offset is None:
+            return idx.floor(self.rule)
+        return (idx - self.offset).floor(self.rule) + self.offset
+
+    def update(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        if chunk.empty:
+            return self._empty()
+
+        bars = chunk[OHLCV_COLS].copy()
+        bars["symbol"] = chunk["symbol"].astype(str).to_numpy()
+        bars["bucket"] = self._bucket(pd.DatetimeIndex(chunk.index))
+
+        # Pending partial buckets go first so first/last keep time order
+        if not self._pending.empty:
+            bars = pd.concat([self._pending, bars], ignore_index=True)
+
+        agg = bars.groupby(["symbol", "bucket"], sort=True, observed=True).agg(AGG).reset_index()
+
+        # The newest bucket of each symbol may still receive bars
+        still_open = ~agg.duplicated(subset="symbol", keep="last")
+        self._pending = agg[still_open].reset_index(drop=True)
+        return self._format(agg[~still_open])
+
+    def flush(self) -> pd.DataFrame:
+        out = self._format(self._pending)
+        self._pending = pd.DataFrame()
+        return out
+
+    @staticmethod
+    def _format(agg: pd.DataFrame) -> pd.DataFrame:
+        out = agg.set_index("bucket")[OHLCV_COLS + ["symbol"]]
+        out.index.name = "date"
+        return out
+
+    def _empty(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            columns=OHLCV_COLS + ["symbol"], index=pd.DatetimeIndex([], name="date")
+        )
+
+
+def resample_stream(chunks: Iterable[pd.DataFrame], interval: str) -> Iterator[pd.DataFrame]:
+    """Yield completed coarse bars as chunks of fine bars stream in."""
+    resampler = StreamingResampler(interval)
+    for chunk in chunks:
+        out = resampler.update(chunk)
+        if not out.empty:
+            yield out
+    tail = resampler.flush()
+    if not tail.empty:
+        yield tail
+
+
+def resample_store(
+    store,
+    source_dataset: str,
+    target_dataset: str,
+    interval: str,
+    symbols: list[str] | None = None,
+) -> dict[str, int]:
+    """
+    Aggregate a stored fine-bar dataset into a coarser one, one symbol-year at a time.
+    Only one year partition of fine bars per symbol is ever held in memory.
+    """
+    symbols = symbols if symbols is not None else store.symbols(source_dataset)
+    written = {}
+
+    for symbol in symbols:
+        years = store.years(source_dataset, symbol)
+        if not years:
+            continue
+
+        chunks = (
+            store.read(
+                source_dataset,
+                symbols=[symbol],
+                start=f"{year}-01-01",
+                end=f"{year + 1}-01-01",
+                columns=OHLCV_COLS,
+            )
+            for year in years
+        )
+        coarse = pd.concat(list(resample_stream(chunks, interval)))
+        store.write(target_dataset, coarse)
+        written[symbol] = len(coarse)
+
+    return written
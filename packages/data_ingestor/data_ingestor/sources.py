@@ -0,0 +1,109 @@
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+
+import pandas as pd
+import yfinance as yf
+
+
+class DataSource(ABC):
+    """
+    Pluggable market data provider.
+    fetch() returns raw bars for one symbol; canonicalisation happens in DataIngestor.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def fetch(
+        self,
+        symbol: str,
+        start: str | None = None,
+        end: str | None = None,
+        interval: str = "1d",
+    ) -> pd.DataFrame:
+        raise NotImplementedError
+
+
+class YFinanceSource(DataSource):
+    name = "yfinance"
+
+    def fetch(self, symbol, start=None, end=None, interval="1d"):
+        return yf.download(
+            symbol,
+            start=start,
+            end=end,
+            interval=interval,
+            progress=False,
+            auto_adjust=False,
+            threads=False,  # concurrency is handled by DataIngestor
+        )
+
+
+class LocalParquetSource(DataSource):
+    """
+    Offline fixture provider reading `{symbol}_historical.parquet` style files.
+    Useful for tests and for replaying a previous download without network.
+    """
+
+    name = "local"
+
+    def __init__(self, data_dir: str = "data", pattern: str = "{symbol}_historical.parquet"):
+        self.data_dir = data_dir
+        self.pattern = pattern
+
+    def fetch(self, symbol, start=None, end=None, interval="1d"):
+        path = os.path.join(self.data_dir, self.pattern.format(symbol=symbol))
+        if not os.path.exists(path):
+            return pd.DataFrame()
+
+        df = pd.read_parquet(path)
+        df.index = pd.to_datetime(df.index)
+        if start is not None:
+            df = df[df.index >= pd.Timestamp(start)]
+        if end is not None:
+            df = df[df.index < pd.Timestamp(end)]
+        return df
+
+
+class RateLimiter:
+    """Thread-safe limiter spacing calls to a source at most `rate` per second."""
+
+    def __init__(self, rate: float | None = None):
+        self.min_interval = 1.0 / rate if rate else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        if self.min_interval <= 0:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+# ==================================================
+# SOURCE REGISTRY
+# ==================================================
+SOURCES: dict[str, type[DataSource]] = {
+    YFinanceSource.name: YFinanceSource,
+    LocalParquetSource.name: LocalParquetSource,
+}
+
+
+def register_source(cls: type[DataSource]) -> type[DataSource]:
+    SOURCES[cls.name] = cls
+    return cls
+
+
+def get_source(name: str, **kwargs) -> DataSource:
+    if name not in SOURCES:
+        raise ValueError(f"Unknown data source '{name}'. Available: {sorted(SOURCES)}")
+    return SOURCES[name](**kwargs)
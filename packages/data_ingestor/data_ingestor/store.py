@@ -0,0 +1,311 @@
+import glob
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from core_utils.schema import compact_schema
+
+from data_ingestor.incremental import merge_new_bars
+from data_ingestor.ingestor import canonicalize_ohlcv
+
+PARTITIONING = ds.partitioning(
+    pa.schema([("symbol", pa.string()), ("year", pa.int32())]),
+    flavor="hive",
+)
+
+
+def dataset_name(stage: str, interval: str = "1d") -> str:
+    """Daily bars keep the bare stage name; intraday ones are suffixed, e.g. historical_5m."""
+    return stage if interval == "1d" else f"{stage}_{interval}"
+
+
+class MarketDataStore:
+    """
+    Hive-partitioned parquet store: {root}/{dataset}/symbol=XYZ/year=YYYY/part-0.parquet
+
+    Datasets are logical stages ("historical", "processed"). Reads push symbol/year
+    filters down to partition pruning and date filters down to row-group statistics,
+    so only the requested slice is decoded.
+
+    Symbols that only exist as legacy flat files ({legacy_dir}/{symbol}_{dataset}.parquet)
+    are read from there until they are first written to the store.
+
+    With compact=True frames are written and returned in the compact schema
+    (core_utils.schema): float32 features, int32 volume, categorical symbol.
+    """
+
+    def __init__(
+        self,
+        root: str = "data/store",
+        legacy_dir: str | None = "data",
+        row_group_size: int = 128_000,
+        compression: str = "zstd",
+        compact: bool = False,
+    ):
+        self.root = root
+        self.legacy_dir = legacy_dir
+        self.row_group_size = row_group_size
+        self.compression = compression
+        self.compact = compact
+
+    # ==================================================
+    # LAYOUT
+    # ==================================================
+    def dataset_path(self, dataset: str) -> str:
+        return os.path.join(self.root, dataset)
+
+    def symbol_path(self, dataset: str, symbol: str) -> str:
+        return os.path.join(self.dataset_path(dataset), f"symbol={symbol}")
+
+    def _legacy_path(self, dataset: str, symbol: str) -> str | None:
+        if self.legacy_dir is None:
+            return None
+        path = os.path.join(self.legacy_dir, f"{symbol}_{dataset}.parquet")
+        return path if os.path.exists(path) else None
+
+    def has_symbol(self, dataset: str, symbol: str) -> bool:
+        return bool(glob.glob(os.path.join(self.symbol_path(dataset, symbol), "year=*")))
+
+    def years(self, dataset: str, symbol: str) -> list[int]:
+        parts = glob.glob(os.path.join(self.symbol_path(dataset, symbol), "year=*"))
+        if parts:
+            return sorted(int(p.rsplit("=", 1)[1]) for p in parts)
+
+        legacy = self._legacy_path(dataset, symbol)
+        if legacy is None:
+            return []
+        idx = pd.to_datetime(pd.read_parquet(legacy, columns=[]).index)
+        return sorted(set(idx.year))
+
+    def symbols(self, dataset: str) -> list[str]:
+        found = {
+            os.path.basename(p).split("=", 1)[1]
+            for p in glob.glob(os.path.join(self.dataset_path(dataset), "symbol=*"))
+        }
+        if self.legacy_dir is not None:
+            suffix = f"_{dataset}.parquet"
+            for p in glob.glob(os.path.join(self.legacy_dir, f"*{suffix}")):
+                found.add(os.path.basename(p)[: -len(suffix)])
+        return sorted(found)
+
+    def columns(self, dataset: str, symbol: str | None = None) -> list[str]:
+        """Data columns of a dataset (no date/symbol/year), read from parquet schemas only."""
+        skip = {"date", "symbol", "year", "__index_level_0__"}
+        if symbol is None or self.has_symbol(dataset, symbol):
+            if glob.glob(os.path.join(self.dataset_path(dataset), "symbol=*")):
+                dset = ds.dataset(
+                    self.dataset_path(dataset), format="parquet", partitioning=PARTITIONING
+                )
+                return [c for c in dset.schema.names if c not in skip]
+
+        candidates = [symbol] if symbol is not None else self.symbols(dataset)
+        for sym in candidates:
+            legacy = self._legacy_path(dataset, sym)
+            if legacy is not None:
+                schema = pq.read_schema(legacy)
+                index_cols = set(schema.pandas_metadata.get("index_columns", []))
+                # MultiIndex columns ("('close', 'XYZ')") are flattened to their first level
+                names = [n.split("'")[1] if n.startswith("(") else n for n in schema.names]
+                names = [
+                    n for n, raw in zip(names, schema.names, strict=True) if raw not in index_cols
+                ]
+                return [n for n in dict.fromkeys(names) if n not in skip]
+        return []
+
+    # ==================================================
+    # WRITE
+    # ==================================================
+    def write(self, dataset: str, df: pd.DataFrame):
+        """Replace the stored history of every symbol present in `df`."""
+        for symbol, sym_df in df.groupby("symbol", sort=False, observed=True):
+            self._write_years(dataset, str(symbol), sym_df, replace_symbol=True)
+
+    def append(self, dataset: str, df: pd.DataFrame) -> dict[str, int]:
+        """
+        Merge newer bars into the store, rewriting only the year partitions they touch.
+        Overlapping bars must match stored values (see merge_new_bars).
+        Returns the number of appended rows per symbol.
+        """
+        appended = {}
+        for symbol, new in df.groupby("symbol", sort=False, observed=True):
+            symbol = str(symbol)
+            self._migrate_legacy(dataset, symbol)
+
+            if not self.has_symbol(dataset, symbol):
+                self._write_years(dataset, symbol, new, replace_symbol=True)
+                appended[symbol] = len(new)
+                continue
+
+            first_year = int(pd.Timestamp(new.index.min()).year)
+            existing = self.read(dataset, symbols=[symbol], start=f"{first_year}-01-01")
+            if existing.empty:
+                combined = new
+            else:
+                combined = merge_new_bars(existing, new)
+
+            self._write_years(dataset, symbol, combined, replace_symbol=False)
+            appended[symbol] = len(combined) - len(existing)
+        return appended
+
+    def _migrate_legacy(self, dataset: str, symbol: str):
+        legacy = self._legacy_path(dataset, symbol)
+        if legacy is not None and not self.has_symbol(dataset, symbol):
+            self.write(dataset, self._read_legacy(dataset, legacy, symbol))
+
+    def _write_years(self, dataset, symbol, df, replace_symbol):
+        df = df.sort_index()
+        df.index = pd.to_datetime(df.index)
+        df.index.name = "date"
+        if self.compact:
+            df = compact_schema(df)
+
+        sym_dir = self.symbol_path(dataset, symbol)
+        os.makedirs(self.root, exist_ok=True)
+        staging = tempfile.mkdtemp(dir=self.root, prefix=".staging-")
+        try:
+            years = df.index.year
+            written = set()
+            for year in sorted(set(years)):
+                part = df[years == year].drop(columns=["symbol"], errors="ignore")
+                table = pa.Table.from_pandas(part.reset_index(), preserve_index=False)
+                year_dir = os.path.join(staging, f"year={year}")
+                os.makedirs(year_dir)
+                pq.write_table(
+                    table,
+                    os.path.join(year_dir, "part-0.parquet"),
+                    row_group_size=self.row_group_size,
+                    compression=self.compression,
+                    write_statistics=True,
+                )
+                written.add(f"year={year}")
+
+            os.makedirs(sym_dir, exist_ok=True)
+            if replace_symbol:
+                for stale in os.listdir(sym_dir):
+                    if stale not in written:
+                        shutil.rmtree(os.path.join(sym_dir, stale))
+
+            # Per-partition swap: a reader sees either the old or the new file
+            for year_name in written:
+                target_dir = os.path.join(sym_dir, year_name)
+                os.makedirs(target_dir, exist_ok=True)
+                os.replace(
+                    os.path.join(staging, year_name, "part-0.parquet"),
+                    os.path.join(target_dir, "part-0.parquet"),
+                )
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    # ==================================================
+    # READ
+    # ==================================================
+    def read(
+        self,
+        dataset: str,
+        symbols: list[str] | None = None,
+        start=None,
+        end=None,
+        columns: list[str] | None = None,
+    ) -> pd.DataFrame:
+        """
+        Load a slice of a dataset as a date-indexed frame with a `symbol` column.
+        `start` is inclusive and `end` exclusive; `columns` projects data columns.
+        """
+        start = pd.Timestamp(start) if start is not None else None
+        end = pd.Timestamp(end) if end is not None else None
+        wanted = symbols if symbols is not None else self.symbols(dataset)
+
+        stored = [s for s in wanted if self.has_symbol(dataset, s)]
+        frames = []
+
+        if stored:
+            frames.append(self._read_partitioned(dataset, stored, start, end, columns))
+
+        for symbol in wanted:
+            if symbol in stored:
+                continue
+            legacy = self._legacy_path(dataset, symbol)
+            if legacy is not None:
+                df = self._read_legacy(dataset, legacy, symbol, columns)
+                if start is not None:
+                    df = df[df.index >= start]
+                if end is not None:
+                    df = df[df.index < end]
+                frames.append(df)
+
+        frames = [f for f in frames if not f.empty]
+        if not frames:
+            return pd.DataFrame(columns=(columns or []) + ["symbol"])
+
+        out = pd.concat(frames) if len(frames) > 1 else frames[0]
+        if len(wanted) > 1:
+            # (symbol, date) order; each frame is already date-sorted
+            order = out["symbol"].map({s: i for i, s in enumerate(wanted)}).to_numpy()
+            out = out.iloc[np.argsort(order, kind="stable")]
+        return compact_schema(out) if self.compact else out
+
+    def _read_partitioned(self, dataset, symbols, start, end, columns):
+        dset = ds.dataset(
+            self.dataset_path(dataset),
+            format="parquet",
+            partitioning=PARTITIONING,
+        )
+
+        expr = ds.field("symbol").isin(symbols)
+        if start is not None:
+            expr &= ds.field("year") >= start.year
+            expr &= ds.field("date") >= pa.scalar(start.to_pydatetime())
+        if end is not None:
+            expr &= ds.field("year") <= end.year
+            expr &= ds.field("date") < pa.scalar(end.to_pydatetime())
+
+        read_cols = None
+        if columns is not None:
+            read_cols = ["date"] + [c for c in columns if c not in ("date", "symbol")] + ["symbol"]
+
+        table = dset.to_table(columns=read_cols, filter=expr)
+        df = table.to_pandas()
+        if "year" in df.columns:
+            df = df.drop(columns=["year"])
+
+        df["symbol"] = df["symbol"].astype(str)
+        df = df.set_index("date").sort_index(kind="stable")
+        return df
+
+    @staticmethod
+    def _read_legacy(dataset, path, symbol, columns=None):
+        df = pd.read_parquet(path)
+        if isinstance(df.columns, pd.MultiIndex):
+            df.columns = [c[0] for c in df.columns]
+
+        if dataset == "historical":
+            df = canonicalize_ohlcv(df, symbol)
+        else:
+            df.index = pd.to_datetime(df.index)
+            df.index.name = "date"
+            df["symbol"] = symbol
+
+        if columns is not None:
+            df = df[[c for c in columns if c != "symbol"] + ["symbol"]]
+        return df
+
+    def last_timestamp(self, dataset: str, symbol: str) -> pd.Timestamp | None:
+        """Last stored bar, read from the newest year partition's statistics only."""
+        years = glob.glob(os.path.join(self.symbol_path(dataset, symbol), "year=*"))
+        if not years:
+            legacy = self._legacy_path(dataset, symbol)
+            if legacy is None:
+                return None
+            idx = pd.read_parquet(legacy, columns=[]).index
+            return pd.Timestamp(pd.to_datetime(idx).max()) if len(idx) else None
+
+        newest = max(years, key=lambda p: int(p.rsplit("=", 1)[1]))
+        meta = pq.ParquetFile(os.path.join(newest, "part-0.parquet")).metadata
+        col = meta.schema.to_arrow_schema().get_field_index("date")
+        maxima = [meta.row_group(i).column(col).statistics.max for i in range(meta.num_row_groups)]
+        return pd.Timestamp(max(maxima)) if maxima else None
@@ -0,0 +1,162 @@
+import zlib
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from core_utils.intervals import INTERVAL_MINUTES, SESSION_MINUTES, SESSION_OPEN, bars_per_day
+
+from data_ingestor.sources import DataSource, register_source
+
+
+@dataclass(frozen=True)
+class Regime:
+    name: str
+    drift: float  # mean daily log return
+    vol: float  # daily log-return volatility
+    mean_duration: float  # expected length in trading days
+
+
+DEFAULT_REGIMES = (
+    Regime("bull", drift=0.0006, vol=0.010, mean_duration=120),
+    Regime("bear", drift=-0.0008, vol=0.020, mean_duration=60),
+    Regime("turbulent", drift=0.0, vol=0.035, mean_duration=20),
+)
+
+
+def synthetic_symbols(n: int, prefix: str = "SYN") -> list[str]:
+    width = max(4, len(str(n - 1)))
+    return [f"{prefix}{i:0{width}d}" for i in range(n)]
+
+
+@lru_cache(maxsize=16)
+def bar_index(start, end, interval: str = "1d") -> pd.DatetimeIndex:
+    """Weekday calendar at daily or intraday (NSE session) resolution."""
+    all_days = np.arange(
+        np.datetime64(pd.Timestamp(start).date(), "D"),
+        np.datetime64(pd.Timestamp(end).date(), "D") + 1,
+    )
+    # 1970-01-01 was a Thursday: weekday = (days + 3) % 7, Mon=0
+    weekdays = all_days[(all_days.astype(np.int64) + 3) % 7 < 5]
+    days = pd.DatetimeIndex(weekdays.astype("datetime64[ns]"), name="date")
+    if interval == "1d":
+        return days
+
+    if interval not in INTERVAL_MINUTES:
+        raise ValueError(f"Unsupported interval '{interval}'")
+
+    step = INTERVAL_MINUTES[interval]
+    offsets = pd.to_timedelta(np.arange(0, SESSION_MINUTES, step), unit="min")
+    opens = days + pd.Timedelta(SESSION_OPEN + ":00")
+    stamps = (opens.values[:, None] + offsets.values[None, :]).ravel()
+    return pd.DatetimeIndex(stamps, name="date")
+
+
+@register_source
+class SyntheticSource(DataSource):
+    """
+    Deterministic regime-switching OHLCV generator for offline load testing.
+
+    Every symbol gets its own RNG stream derived from (seed, symbol), and its full
+    path is always generated from `origin` to `end`, so the same bar comes back
+    regardless of the requested window or of which other symbols are fetched.
+    """
+
+    name = "synthetic"
+
+    def __init__(
+        self,
+        seed: int = 42,
+        origin: str = "2005-01-03",
+        end: str = "2025-12-31",
+        regimes: tuple[Regime, ...] = DEFAULT_REGIMES,
+        gap_prob: float = 0.02,
+        missing_prob: float = 0.001,
+        start_price: tuple[float, float] = (50.0, 5000.0),
+        base_volume: float = 1e6,
+    ):
+        self.seed = seed
+        self.origin = origin
+        self.end = end
+        self.regimes = regimes
+        self.gap_prob = gap_prob
+        self.missing_prob = missing_prob
+        self.start_price = start_price
+        self.base_volume = base_volume
+
+    def _rng(self, symbol: str) -> np.random.Generator:
+        return np.random.default_rng([self.seed, zlib.crc32(symbol.encode())])
+
+    def _regime_path(self, rng, n: int, per_day: int) -> np.ndarray:
+        n_regimes = len(self.regimes)
+        if n_regimes == 1:
+            return np.zeros(n, dtype=np.int64)
+
+        durations = np.array([r.mean_duration for r in self.regimes]) * per_day
+
+        # Markov chain that always switches: regime_{k+1} = regime_k + U{1..R-1} (mod R)
+        n_segments = int(2 * n / durations.min()) + 8
+        steps = rng.integers(1, n_regimes, size=n_segments)
+        seq = (rng.integers(n_regimes) + np.cumsum(steps)) % n_regimes
+        lengths = rng.geometric(1.0 / durations[seq])
+
+        path = np.repeat(seq, lengths)[:n]
+        return np.pad(path, (0, n - len(path)), mode="edge")
+
+    def generate(self, symbol: str, interval: str = "1d") -> pd.DataFrame:
+        idx = bar_index(self.origin, self.end, interval)
+        n = len(idx)
+        per_day = bars_per_day(interval)
+        rng = self._rng(symbol)
+
+        regime = self._regime_path(rng, n, per_day)
+        drift = np.array([r.drift for r in self.regimes])[regime] / per_day
+        vol = np.array([r.vol for r in self.regimes])[regime] / np.sqrt(per_day)
+
+        # Close-to-close log returns, split into an overnight/open gap and an intrabar move
+        intrabar = drift + vol * rng.standard_normal(n)
+        gap = np.zeros(n)
+        if per_day > 1:
+            session_open = np.arange(n) % per_day == 0
+            gap[session_open] = 0.3 * vol[session_open] * np.sqrt(per_day)
+            gap *= rng.standard_normal(n)
+        jumps = rng.random(n) < self.gap_prob
+        gap[jumps] += 3.0 * vol[jumps] * np.sqrt(per_day) * rng.standard_normal(jumps.sum())
+
+        p0 = np.exp(rng.uniform(np.log(self.start_price[0]), np.log(self.start_price[1])))
+        log_close = np.log(p0) + np.cumsum(gap + intrabar)
+        close = np.exp(log_close)
+        open_ = np.exp(log_close - intrabar)
+
+        wick = np.abs(rng.standard_normal((2, n))) * vol * 0.5
+        high = np.maximum(open_, close) * np.exp(wick[0])
+        low = np.minimum(open_, close) * np.exp(-wick[1])
+
+        vol_scale = vol / vol.mean()
+        volume = self.base_volume / per_day * vol_scale * rng.lognormal(0.0, 0.4, n)
+
+        df = pd.DataFrame(
+            {
+                "open": open_,
+                "high": high,
+                "low": low,
+                "close": close,
+                "volume": np.maximum(volume, 1).astype(np.int64),
+            },
+            index=idx,
+        )
+
+        # Data holes: bars the source never delivered
+        if self.missing_prob > 0:
+            df = df[rng.random(n) >= self.missing_prob]
+
+        df["symbol"] = symbol
+        return df
+
+    def fetch(self, symbol, start=None, end=None, interval="1d"):
+        df = self.generate(symbol, interval=interval)
+        if start is not None:
+            df = df[df.index >= pd.Timestamp(start)]
+        if end is not None:
+            df = df[df.index < pd.Timestamp(end)]
+        return df.drop(columns=["symbol"])
@@ -0,0 +1,178 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from data_ingestor.ingestor import OHLCV_COLS
+
+CHECKS = (
+    "missing_values",
+    "non_monotonic",
+    "duplicate_timestamp",
+    "ohlc_inconsistent",
+    "zero_volume",
+    "price_jump",
+    "missing_days",
+)
+
+REPORT_COLS = ["symbol", "check", "count", "first_timestamp"]
+
+
+@dataclass
+class ValidationReport:
+    """Per-symbol / per-check issue counts with the first offending timestamp."""
+
+    table: pd.DataFrame = field(default_factory=lambda: pd.DataFrame(columns=REPORT_COLS))
+
+    @property
+    def ok(self) -> bool:
+        return bool((self.table["count"] == 0).all())
+
+    def issues(self) -> pd.DataFrame:
+        return self.table[self.table["count"] > 0].reset_index(drop=True)
+
+    def summary(self) -> pd.DataFrame:
+        """symbol x check matrix of issue counts"""
+        return self.table.pivot_table(
+            index="symbol", columns="check", values="count", aggfunc="sum", fill_value=0
+        ).reindex(columns=list(CHECKS), fill_value=0)
+
+    @classmethod
+    def concat(cls, reports: list["ValidationReport"]) -> "ValidationReport":
+        tables = [r.table for r in reports if not r.table.empty]
+        if not tables:
+            return cls()
+        return cls(pd.concat(tables, ignore_index=True))
+
+
+def _first_per_symbol(codes, dates, n_symbols):
+    """Issue count and earliest timestamp per symbol code."""
+    counts = np.bincount(codes, minlength=n_symbols)
+    first = np.full(n_symbols, np.datetime64("NaT"), dtype="datetime64[ns]")
+    if len(codes):
+        order = np.lexsort((dates, codes))
+        uniq, idx = np.unique(codes[order], return_index=True)
+        first[uniq] = dates[order][idx]
+    return counts, first
+
+
+def validate_panel(
+    df: pd.DataFrame,
+    calendar: pd.DatetimeIndex | None = None,
+    jump_threshold: float = 0.25,
+) -> ValidationReport:
+    """
+    Run every check over a long-format multi-symbol frame (date index + `symbol` column)
+    with array operations only: one factorize, one sort, no per-symbol Python loop.
+
+    `calendar` lists the expected sessions for the missing-days check, in any order; by
+    default the union of dates present in the panel is used, so a symbol is flagged for
+    sessions on which other symbols traded but it did not. Bars off the calendar are
+    not counted.
+    """
+    if df.empty:
+        return ValidationReport()
+
+    codes, symbols = pd.factorize(df["symbol"], sort=True)
+    n_symbols = len(symbols)
+    dates = pd.to_datetime(df.index).values.astype("datetime64[ns]")
+    ohlcv = df[OHLCV_COLS].to_numpy(dtype=np.float64)
+    open_, high, low, close, volume = ohlcv.T
+
+    flags: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+
+    # Rows as delivered: per-symbol order, dates must be non-decreasing
+    by_sym = np.argsort(codes, kind="stable")
+    c, d = codes[by_sym], dates[by_sym]
+    bad = np.flatnonzero((c[1:] == c[:-1]) & (d[1:] < d[:-1])) + 1
+    flags["non_monotonic"] = (c[bad], d[bad])
+
+    # Single (symbol, date) sort for every sequential check
+    order = np.lexsort((dates, codes))
+    c, d = codes[order], dates[order]
+    same_sym = c[1:] == c[:-1]
+
+    row_checks = {
+        "missing_values": np.isnan(ohlcv).any(axis=1),
+        "ohlc_inconsistent": (
+            (low > np.minimum(open_, close)) | (high < np.maximum(open_, close)) | (low > high)
+        ),
+        "zero_volume": volume <= 0,
+    }
+    for name, mask in row_checks.items():
+        mask = mask[order]
+        flags[name] = (c[mask], d[mask])
+
+    dup = np.concatenate([[False], same_sym & (d[1:] == d[:-1])])
+    flags["duplicate_timestamp"] = (c[dup], d[dup])
+
+    # Sequential checks run on de-duplicated bars
+    keep = ~dup
+    c, d, px = c[keep], d[keep], close[order][keep]
+    same_sym = c[1:] == c[:-1]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        jump = np.abs(px[1:] / px[:-1] - 1.0) > jump_threshold
+    jump = np.concatenate([[False], same_sym & jump])
+    flags["price_jump"] = (c[jump], d[jump])
+
+    # Missing sessions between each symbol's first and last bar (calendar sorted, unique)
+    cal = d if calendar is None else pd.DatetimeIndex(calendar).values
+    cal = np.unique(cal.astype("datetime64[ns]"))
+    pos = np.searchsorted(cal, d)
+    on_cal = pos < len(cal)
+    on_cal[on_cal] = cal[pos[on_cal]] == d[on_cal]
+    c_cal, pos = c[on_cal], pos[on_cal]
+    gap = np.diff(pos) - 1
+    gap_rows = np.flatnonzero((c_cal[1:] == c_cal[:-1]) & (gap > 0))
+    missing_counts = np.bincount(c_cal[1:][gap_rows], weights=gap[gap_rows], minlength=n_symbols)
+    flags["missing_days"] = (c_cal[1:][gap_rows], cal[pos[:-1][gap_rows] + 1])
+
+    rows = []
+    for name in CHECKS:
+        f_codes, f_dates = flags[name]
+        counts, first = _first_per_symbol(f_codes, f_dates, n_symbols)
+        if name == "missing_days":
+            counts = missing_counts.astype(np.int64)
+        rows.append(
+            pd.DataFrame(
+                {
+                    "symbol": np.asarray(symbols, dtype=object),
+                    "check": name,
+                    "count": counts,
+                    "first_timestamp": first,
+                }
+            )
+        )
+
+    return ValidationReport(pd.concat(rows, ignore_index=True))
+
+
+def validate_store(
+    store,
+    dataset: str = "historical",
+    symbols: list[str] | None = None,
+    batch_size: int = 100,
+    calendar: pd.DatetimeIndex | None = None,
+    jump_threshold: float = 0.25,
+) -> ValidationReport:
+    """
+    Stream a MarketDataStore dataset through validate_panel `batch_size` symbols at a
+    time, so peak memory is bounded by the batch rather than by the universe.
+    Without an explicit calendar, a first date-only pass builds the universe calendar.
+    """
+    symbols = symbols if symbols is not None else store.symbols(dataset)
+    batches = [symbols[i : i + batch_size] for i in range(0, len(symbols), batch_size)]
+
+    if calendar is None:
+        seen = np.array([], dtype="datetime64[ns]")
+        for batch in batches:
+            idx = store.read(dataset, symbols=batch, columns=[]).index
+            seen = np.union1d(seen, pd.to_datetime(idx).values.astype("datetime64[ns]"))
+        calendar = pd.DatetimeIndex(seen)
+
+    reports = []
+    for batch in batches:
+        panel = store.read(dataset, symbols=batch, columns=OHLCV_COLS)
+        reports.append(validate_panel(panel, calendar=calendar, jump_threshold=jump_threshold))
+    return ValidationReport.concat(reports)
@@ -1 +1,2 @@
 from feature_engineer.engineer import FeatureEngineer
+from feature_engineer.streaming import IncrementalFeatureEngineer
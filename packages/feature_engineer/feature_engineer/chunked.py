@@ -0,0 +1,174 @@
+from collections.abc import Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+from core_utils.schema import compact_schema
+from data_ingestor.store import MarketDataStore
+
+from feature_engineer.engineer import FeatureEngineer
+from feature_engineer.kernels import EWM_MAX_BLOCK, block_size
+
+
+def alignment(engineer: FeatureEngineer) -> int:
+    """
+    Bar multiple every chunk must start at (per symbol) so that rolling and EWM
+    blocks line up with the in-memory run. All block sizes are powers of two, so
+    the largest one is a multiple of all the others.
+    """
+    pipeline = engineer.pipeline
+    windows = engineer.windows()
+    blocks = [block_size(windows[p]) for node in pipeline.plan for p in node.params]
+    blocks.append(block_size(windows["zscore"]))
+    if pipeline.stateful_outputs:
+        blocks.append(EWM_MAX_BLOCK)
+    return max(blocks)
+
+
+def warmup_bars(engineer: FeatureEngineer) -> int:
+    """
+    Bars of history in front of a chunk after which every output is exact.
+
+    A rolling value at bar t reads the block holding t and the one before it, so a
+    window w looks back at most 2 * block_size(w) bars; shifts and diffs add at most
+    one bar per node. Stateful nodes (EWMs) add nothing: their level is carried over
+    exactly. The bound sums these along the whole plan plus the z-score window.
+    """
+    windows = engineer.windows()
+    total = 2 * block_size(windows["zscore"]) + len(engineer.pipeline.plan)
+    for node in engineer.pipeline.plan:
+        if not node.stateful:
+            total += sum(2 * block_size(windows[p]) for p in node.params)
+    return total
+
+
+class ChunkedFeatureEngineer:
+    """
+    Out-of-core execution of a FeatureEngineer over time-ordered chunks of bars.
+
+    Each call to process() takes the next chunk (any symbols, each strictly after
+    its previous chunk) and returns the same rows calculate_features +
+    normalize_continuous would return for them on the full history, bit for bit.
+    Per symbol it keeps only a raw tail of at most warmup_bars() + alignment() bars,
+    started on an aligned bar, plus the EWM levels one bar before that tail.
+    Peak memory is bounded by chunk size plus those tails, not by history length.
+    """
+
+    def __init__(self, engineer: FeatureEngineer):
+        if engineer.engine != "numpy":
+            raise ValueError("Chunked execution requires engine='numpy'")
+        self.engineer = engineer
+        self.alignment = alignment(engineer)
+        self.warmup = warmup_bars(engineer)
+        self.stateful = engineer.pipeline.stateful_outputs
+
+        self.tails: dict[str, pd.DataFrame] = {}
+        self.starts: dict[str, int] = {}  # bar position of each tail's first row
+        self.seen: dict[str, int] = {}  # bars processed per symbol
+        self.levels: dict[str, dict[str, float]] = {name: {} for name in self.stateful}
+
+    def _tail_start(self, n_bars: int) -> int:
+        return max(0, (n_bars - self.warmup) // self.alignment * self.alignment)
+
+    def process(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        chunk_symbols = chunk["symbol"].astype(str)
+        present = list(dict.fromkeys(chunk_symbols))
+        for symbol in present:
+            tail = self.tails.get(symbol)
+            if tail is not None and len(tail):
+                first = chunk.index[(chunk_symbols == symbol).to_numpy()].min()
+                if first <= tail.index.max():
+                    raise ValueError(
+                        f"{symbol}: chunk starts at {first}, not after {tail.index.max()}"
+                    )
+
+        tails = [self.tails[s] for s in present if s in self.tails]
+        n_tail = sum(len(t) for t in tails)
+        frame = pd.concat(tails + [chunk]) if tails else chunk
+        init = {
+            name: pd.Series({s: self.levels[name].get(s, np.nan) for s in present})
+            for name in self.stateful
+        }
+
+        pipeline = self.engineer.pipeline
+        df = pipeline.compute(frame, init=init, extra=self.stateful)
+        self._advance(frame, df, present)
+
+        df = df.drop(columns=[c for c in self.stateful if c not in pipeline.features])
+        if self.engineer.compact:
+            df = compact_schema(df)
+        df = self.engineer.normalize_continuous(df)
+        return df.iloc[n_tail:]
+
+    def _advance(self, frame: pd.DataFrame, df: pd.DataFrame, symbols: list[str]):
+        """Cut each symbol's new tail and record the EWM levels just before it."""
+        symbol_col = frame["symbol"].astype(str).to_numpy()
+        dates = pd.DatetimeIndex(frame.index).asi8
+        for symbol in symbols:
+            rows = np.flatnonzero(symbol_col == symbol)
+            rows = rows[np.argsort(dates[rows], kind="stable")]
+
+            start = self.starts.get(symbol, 0)
+            n_bars = start + len(rows)
+            new_start = self._tail_start(n_bars)
+            if new_start > start:
+                before = rows[new_start - start - 1]
+                for name in self.stateful:
+                    self.levels[name][symbol] = float(df[name].iloc[before])
+
+            self.tails[symbol] = frame.iloc[rows[new_start - start :]]
+            self.starts[symbol] = new_start
+            self.seen[symbol] = n_bars
+
+    def run(self, chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        for chunk in chunks:
+            if not chunk.empty:
+                yield self.process(chunk)
+
+
+# ==================================================
+# STORE DRIVER
+# ==================================================
+def store_chunks(
+    store: MarketDataStore,
+    dataset: str,
+    symbols: list[str],
+    freq: str = "YS",
+) -> Iterator[pd.DataFrame]:
+    """Read `symbols` from the store one calendar period (pandas offset alias) at a time."""
+    years = sorted({y for s in symbols for y in store.years(dataset, s)})
+    if not years:
+        return
+    bounds = pd.date_range(f"{years[0]}-01-01", f"{years[-1] + 1}-01-01", freq=freq)
+    if bounds[-1] < pd.Timestamp(f"{years[-1] + 1}-01-01"):
+        bounds = bounds.append(pd.DatetimeIndex([f"{years[-1] + 1}-01-01"]))
+
+    for start, end in zip(bounds[:-1], bounds[1:], strict=True):
+        df = store.read(dataset, symbols=symbols, start=start, end=end)
+        if not df.empty:
+            yield df
+
+
+def run_chunked(
+    symbols: list[str],
+    store: MarketDataStore,
+    source_dataset: str,
+    target_dataset: str,
+    engineer: FeatureEngineer,
+    freq: str = "YS",
+) -> dict[str, int]:
+    """
+    Stream `source_dataset` through a ChunkedFeatureEngineer period by period and
+    write the features to `target_dataset`. Returns rows written per symbol.
+    """
+    chunked = ChunkedFeatureEngineer(engineer)
+    written: dict[str, int] = {}
+
+    for out in chunked.run(store_chunks(store, source_dataset, symbols, freq)):
+        for symbol, part in out.groupby("symbol", sort=False, observed=True):
+            symbol = str(symbol)
+            if symbol in written:
+                store.append(target_dataset, part)
+            else:
+                store.write(target_dataset, part)  # replaces any previous history
+            written[symbol] = written.get(symbol, 0) + len(part)
+    return written
@@ -1,55 +1,124 @@
+from collections.abc import Sequence
+
 import pandas as pd
+from core_utils.config import IndicatorParams
+from core_utils.intervals import bars_for_days
+from core_utils.schema import compact_schema
+
+from feature_engineer.normalize import rolling_zscore
+from feature_engineer.registry import DEFAULT_FEATURES, FeaturePipeline
+
+ENGINES = ("numpy", "pandas")
 
 
 class FeatureEngineer:
     """
-    Symbol-safe, index-safe feature engineering.
-    Uses transform() everywhere to avoid MultiIndex bugs.
+    Symbol-safe, index-safe feature engineering: every indicator is computed
+    within one symbol's bars and results keep the input frame's row order.
+
+    With compact=True outputs use the compact schema (float32 features,
+    categorical symbol, narrow ints), see core_utils.schema.
+
+    Lookback windows are expressed in trading days and converted to bars for
+    the configured `interval`, so intraday features cover the same horizon as
+    daily ones. `ret_1d` is always the one-bar return (the per-step reward).
+
+    engine="numpy" evaluates the declarative feature DAG (see
+    feature_engineer.registry) over contiguous per-symbol arrays, computing only
+    the requested `features` and their shared intermediates; engine="pandas" is
+    the groupby/transform reference implementation.
+
+    `indicators` and `rolling_window` (the z-score lookback) mirror the
+    features block of configs/base.yaml. Column names (sma_20, sma_50, ret_5d)
+    stay fixed whatever the windows, so trained models keep their columns.
     """
 
+    def __init__(
+        self,
+        compact: bool = False,
+        interval: str = "1d",
+        engine: str = "numpy",
+        rolling_window: int = 60,
+        indicators: IndicatorParams | None = None,
+        features: Sequence[str] | None = None,
+    ):
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine '{engine}'. Use one of {ENGINES}")
+        if (
+            engine == "pandas"
+            and features is not None
+            and not set(features) <= set(DEFAULT_FEATURES)
+        ):
+            raise ValueError("engine='pandas' only implements the default feature set")
+        self.compact = compact
+        self.interval = interval
+        self.engine = engine
+        self.rolling_window = rolling_window
+        self.indicators = indicators or IndicatorParams()
+        self.features = list(features) if features is not None else list(DEFAULT_FEATURES)
+        self.pipeline = FeaturePipeline(self.windows(), self.features)
+
+    def _w(self, days: float) -> int:
+        return bars_for_days(days, self.interval)
+
+    def windows(self) -> dict[str, int]:
+        """Indicator lookbacks in bars, plus the z-score window."""
+        windows = {name: self._w(days) for name, days in self.indicators.model_dump().items()}
+        windows["zscore"] = self._w(self.rolling_window)
+        return windows
+
     def calculate_features(self, df: pd.DataFrame) -> pd.DataFrame:
+        if self.engine == "numpy":
+            df = self.pipeline.compute(df)
+        else:
+            df = self._calculate_features_pandas(df)
+            df = df[[c for c in df.columns if c not in DEFAULT_FEATURES] + self.features]
+        return compact_schema(df) if self.compact else df
+
+    def _calculate_features_pandas(self, df: pd.DataFrame) -> pd.DataFrame:
         df = df.copy()
+        w = self.windows()
 
         # ===============================
         # RETURNS
         # ===============================
-        df["ret_1d"] = df.groupby("symbol")["close"].transform(
+        df["ret_1d"] = df.groupby("symbol", observed=True)["close"].transform(
             lambda x: x.pct_change(1),
         )
 
-        df["ret_5d"] = df.groupby("symbol")["close"].transform(
-            lambda x: x.pct_change(5),
+        df["ret_5d"] = df.groupby("symbol", observed=True)["close"].transform(
+            lambda x: x.pct_change(w["ret_period"]),
         )
 
         # ===============================
         # MOVING AVERAGES
         # ===============================
-        df["sma_20"] = df.groupby("symbol")["close"].transform(
-            lambda x: x.rolling(20, min_periods=1).mean(),
+        df["sma_20"] = df.groupby("symbol", observed=True)["close"].transform(
+            lambda x: x.rolling(w["sma_short"], min_periods=1).mean(),
         )
 
-        df["sma_50"] = df.groupby("symbol")["close"].transform(
-            lambda x: x.rolling(50, min_periods=1).mean(),
+        df["sma_50"] = df.groupby("symbol", observed=True)["close"].transform(
+            lambda x: x.rolling(w["sma_long"], min_periods=1).mean(),
         )
 
         # ===============================
         # RSI (NUMERICALLY SAFE)
         # ===============================
-        delta = df.groupby("symbol")["close"].diff()
+        delta = df.groupby("symbol", observed=True)["close"].diff()
 
         gain = (
             delta.clip(lower=0)
-            .groupby(df["symbol"])
+            .groupby(df["symbol"], observed=True)
             .transform(
-                lambda x: x.rolling(14, min_periods=1).mean(),
+                lambda x: x.rolling(w["rsi_period"], min_periods=1).mean(),
             )
         )
 
         loss = (
             (-delta.clip(upper=0))
-            .groupby(df["symbol"])
+            .groupby(df["symbol"], observed=True)
             .transform(
-                lambda x: x.rolling(14, min_periods=1).mean(),
+                lambda x: x.rolling(w["rsi_period"], min_periods=1).mean(),
             )
         )
 
@@ -60,29 +129,29 @@ class FeatureEngineer:
         # ===============================
         # MACD (TRANSFORM — NO MULTIINDEX)
         # ===============================
-        ema12 = df.groupby("symbol")["close"].transform(
-            lambda x: x.ewm(span=12, adjust=False).mean(),
+        ema12 = df.groupby("symbol", observed=True)["close"].transform(
+            lambda x: x.ewm(span=w["macd_fast"], adjust=False).mean(),
         )
 
-        ema26 = df.groupby("symbol")["close"].transform(
-            lambda x: x.ewm(span=26, adjust=False).mean(),
+        ema26 = df.groupby("symbol", observed=True)["close"].transform(
+            lambda x: x.ewm(span=w["macd_slow"], adjust=False).mean(),
         )
 
         df["macd"] = ema12 - ema26
 
-        df["macd_signal"] = df.groupby("symbol")["macd"].transform(
-            lambda x: x.ewm(span=9, adjust=False).mean(),
+        df["macd_signal"] = df.groupby("symbol", observed=True)["macd"].transform(
+            lambda x: x.ewm(span=w["macd_signal"], adjust=False).mean(),
         )
 
         # ===============================
         # BOLLINGER BAND WIDTH
         # ===============================
-        mid = df.groupby("symbol")["close"].transform(
-            lambda x: x.rolling(20, min_periods=1).mean(),
+        mid = df.groupby("symbol", observed=True)["close"].transform(
+            lambda x: x.rolling(w["sma_short"], min_periods=1).mean(),
         )
 
-        std = df.groupby("symbol")["close"].transform(
-            lambda x: x.rolling(20, min_periods=1).std(),
+        std = df.groupby("symbol", observed=True)["close"].transform(
+            lambda x: x.rolling(w["sma_short"], min_periods=1).std(),
         )
 
         df["bb_width"] = (2 * std) / mid
@@ -90,8 +159,8 @@ class FeatureEngineer:
         # ===============================
         # VOLUME FEATURES (CRITICAL FIX)
         # ===============================
-        df["vol_sma"] = df.groupby("symbol")["volume"].transform(
-            lambda x: x.rolling(20, min_periods=1).mean(),
+        df["vol_sma"] = df.groupby("symbol", observed=True)["volume"].transform(
+            lambda x: x.rolling(w["sma_short"], min_periods=1).mean(),
         )
 
         # volume is GUARANTEED Series because runner deduplicates columns
@@ -105,22 +174,31 @@ class FeatureEngineer:
         return df
 
     def normalize_continuous(self, df: pd.DataFrame) -> pd.DataFrame:
-        df = df.copy()
-
         base_cols = ["open", "high", "low", "close", "volume", "symbol"]
         binary_cols = ["trend_sma"]
 
         continuous_cols = [c for c in df.columns if c not in base_cols + binary_cols]
 
+        if self.engine == "numpy":
+            z = rolling_zscore(df, continuous_cols, self.windows()["zscore"])
+            df = pd.concat([df, z], axis=1)
+        else:
+            df = self._normalize_continuous_pandas(df, continuous_cols)
+
+        return compact_schema(df) if self.compact else df
+
+    def _normalize_continuous_pandas(self, df, continuous_cols):
+        df = df.copy()
+
         for col in continuous_cols:
-            mean = df.groupby("symbol")[col].transform(
-                lambda x: x.rolling(60, min_periods=1).mean(),
+            mean = df.groupby("symbol", observed=True)[col].transform(
+                lambda x: x.rolling(self._w(self.rolling_window), min_periods=1).mean(),
             )
 
             std = (
-                df.groupby("symbol")[col]
+                df.groupby("symbol", observed=True)[col]
                 .transform(
-                    lambda x: x.rolling(60, min_periods=1).std(),
+                    lambda x: x.rolling(self._w(self.rolling_window), min_periods=1).std(),
                 )
                 .replace(0, 1e-10)
             )
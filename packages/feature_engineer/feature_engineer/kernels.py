@@ -0,0 +1,192 @@
+import numpy as np
+import pandas as pd
+
+# Largest EWM time block (beta**-block must also stay well inside float64 range)
+EWM_MAX_BLOCK = 256
+
+
+class GroupLayout:
+    """
+    Dense (symbols x bars) layout of a long frame, computed once.
+
+    Each symbol's rows, ordered by date, fill one row of the grid from the left; the
+    ragged tail is NaN-padded. Every indicator is then a vectorised operation along
+    axis 1 that never crosses a symbol boundary, and results are gathered back to
+    the frame's original row order with one take().
+    """
+
+    def __init__(self, symbols: pd.Series, dates: np.ndarray):
+        codes, self.keys = pd.factorize(symbols)
+        order = np.lexsort((dates, codes))
+
+        sorted_codes = codes[order]
+        starts = np.concatenate([[0], np.flatnonzero(np.diff(sorted_codes)) + 1])
+        lengths = np.diff(np.concatenate([starts, [len(order)]]))
+
+        self.n_groups = len(starts)
+        self.width = int(lengths.max())
+
+        group = np.repeat(np.arange(self.n_groups), lengths)
+        pos = np.arange(len(order)) - np.repeat(starts, lengths)
+        self.flat = np.empty(len(order), dtype=np.int64)
+        self.flat[order] = group * self.width + pos
+
+    def to_grid(self, values: np.ndarray) -> np.ndarray:
+        """(groups, width) grid; trailing axes of `values` (e.g. columns) are kept."""
+        grid = np.full((self.n_groups * self.width, *values.shape[1:]), np.nan)
+        grid[self.flat] = values
+        return grid.reshape(self.n_groups, self.width, *values.shape[1:])
+
+    def from_grid(self, grid: np.ndarray) -> np.ndarray:
+        flat = grid.reshape(self.n_groups * self.width, *grid.shape[2:])
+        return flat.take(self.flat, axis=0)
+
+
+# ==================================================
+# PRIMITIVES (operate along axis 1 of a layout grid)
+# ==================================================
+def block_size(window: int) -> int:
+    """
+    Rolling block for `window`: the next power of two. Blocks are anchored at bar 0
+    of every row, so any slice starting at a multiple of the largest block in use
+    (see feature_engineer.chunked) reproduces the same blocks and bit-identical sums.
+    """
+    return 1 << max(0, int(window) - 1).bit_length()
+
+
+def shift(grid: np.ndarray, k: int) -> np.ndarray:
+    out = np.full_like(grid, np.nan)
+    if k < grid.shape[1]:
+        out[:, k:] = grid[:, : grid.shape[1] - k]
+    return out
+
+
+def diff(grid, k=1):
+    return grid - shift(grid, k)
+
+
+def pct_change(grid, k=1):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return grid / shift(grid, k) - 1.0
+
+
+def _rolling_moments(grid, window, with_std):
+    """
+    NaN-skipping rolling mean / sample std over the trailing `window` bars
+    (pandas rolling(window, min_periods=1) semantics).
+
+    Rows are cut into blocks of block_size(window) >= window bars. Cumulative sums
+    restart in every block and are taken relative to the block's first valid value,
+    so they stay small and precise however long the history. The window ending at
+    offset o of block k is the part of block k-1 it still covers plus bars
+    [max(0, o - window + 1), o] of block k; the two parts are combined around the
+    window mean.
+    """
+    block = block_size(window)
+    n_groups, width = grid.shape
+    n_blocks = -(-width // block)
+
+    padded = np.full((n_groups, n_blocks * block), np.nan)
+    padded[:, :width] = grid
+    blocks = padded.reshape(n_groups, n_blocks, block)
+    valid = np.isfinite(blocks)
+
+    first = np.argmax(valid, axis=2)[..., None]
+    ref = np.take_along_axis(blocks, first, axis=2)
+    ref = np.where(np.isfinite(ref), ref, 0.0)
+    z = np.where(valid, blocks - ref, 0.0)
+
+    def parts(v):
+        c = np.zeros((n_groups, n_blocks, block + 1))
+        np.cumsum(v, axis=2, out=c[..., 1:])
+        # window ending at offset o starts at o - window + 1 (in block k-1 if negative)
+        start = np.arange(block) - window + 1
+        head = c[..., 1:] - c[..., np.maximum(start, 0)]
+        tail = np.zeros_like(head)
+        tail[:, 1:] = c[:, :-1, block:] - c[:, :-1, np.clip(start + block, 0, block)]
+        return tail, head
+
+    n_a, n_b = parts(valid)
+    s_a, s_b = parts(z)
+    r_b = ref
+    r_a = np.zeros_like(ref)
+    r_a[:, 1:] = ref[:, :-1]
+    count = n_a + n_b
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = (s_a + n_a * r_a + s_b + n_b * r_b) / count
+        mean = np.where(count >= 1, mean, np.nan)
+        std = None
+        if with_std:
+            q_a, q_b = parts(z * z)
+            d_a, d_b = r_a - mean, r_b - mean
+            m2 = q_a + 2 * d_a * s_a + n_a * d_a**2 + q_b + 2 * d_b * s_b + n_b * d_b**2
+            var = np.maximum(m2 / (count - 1), 0.0)
+            std = np.where(count >= 2, np.sqrt(var), np.nan)
+            std = std.reshape(n_groups, -1)[:, :width]
+
+    return mean.reshape(n_groups, -1)[:, :width], std
+
+
+def rolling_mean(grid, window):
+    return _rolling_moments(grid, window, with_std=False)[0]
+
+
+def rolling_mean_std(grid, window):
+    """Rolling mean and sample std (ddof=1) sharing one set of block sums."""
+    return _rolling_moments(grid, window, with_std=True)
+
+
+def ewm_mean(grid, span, init=None):
+    """
+    ewm(span, adjust=False).mean() along each row.
+    Rows advance together in time blocks; inside a block the recursion
+    y_t = b*y_{t-1} + a*x_t is solved in closed form with a cumulative sum.
+    Rows with a NaN before a valid value (gaps, late starts) carry the previous
+    level through the gap, exactly as pandas does (see _ewm_mean_gaps).
+
+    `init` (one value per row, NaN = none) is y_{-1}: the level just before the
+    first bar, when the grid continues an earlier slice of the same series.
+    """
+    alpha = 2.0 / (span + 1.0)
+    beta = 1.0 - alpha
+    width = grid.shape[1]
+    if init is None:
+        init = np.full(grid.shape[0], np.nan)
+
+    # NaN followed by a value somewhere later in the row; trailing padding is fine
+    missing = np.isnan(grid)
+    later = np.zeros_like(missing)
+    later[:, :-1] = np.logical_or.accumulate(~missing[:, :0:-1], axis=1)[:, ::-1]
+    gaps = (missing & later).any(axis=1)
+
+    # beta**-block must stay well inside float64 range; a power of two, like block_size()
+    limit = min(EWM_MAX_BLOCK, max(1, 200 * np.log(10) / -np.log(beta))) if beta > 0 else 1
+    block = 1 << (int(limit).bit_length() - 1)
+    k = np.arange(block)
+    inv_pow = beta**-k
+    out = np.empty_like(grid)
+
+    state = np.where(np.isnan(init), grid[:, 0], init)  # y_{-1} := x_0 gives y_0 = x_0
+    for t0 in range(0, width, block):
+        xb = grid[:, t0 : t0 + block]
+        b = xb.shape[1]
+        acc = np.cumsum(xb * inv_pow[:b], axis=1)
+        yb = beta ** (k[:b] + 1) * state[:, None] + alpha * beta ** k[:b] * acc
+        out[:, t0 : t0 + b] = yb
+        state = yb[:, -1]
+
+    if gaps.any():
+        out[gaps] = _ewm_mean_gaps(grid[gaps], span, init[gaps])
+    return out
+
+
+def _ewm_mean_gaps(grid, span, init):
+    """
+    Rows with missing bars go through pandas itself: how the level's weight decays
+    across a gap differs between pandas versions, and the pandas engine is the
+    reference. `init` is prepended as the observation just before the first bar.
+    """
+    series = np.column_stack([init, grid]).T
+    out = pd.DataFrame(series).ewm(span=span, adjust=False).mean().to_numpy()
+    return out[1:].T
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+
+from feature_engineer.kernels import GroupLayout, rolling_mean_std
+
+# Upper bound on grid cells per batch of columns (~64 MB per float64 temporary)
+MAX_BATCH_CELLS = 8_000_000
+
+
+def rolling_zscore(df: pd.DataFrame, columns: list[str], window: int) -> pd.DataFrame:
+    """
+    Per-symbol rolling z-scores of `columns`: (x - mean) / std over the trailing
+    `window` bars (min_periods=1, sample std, zero std replaced by 1e-10).
+
+    Columns are stacked into one (columns x symbols x bars) array and normalised
+    together, a batch of columns at a time to bound memory. Rolling moments use
+    block-shifted running sums merged with the pairwise (Welford/Chan) update, so
+    they stay stable on long, trending series. Returns a frame of `<col>_z`
+    columns aligned with df.
+    """
+    names = [f"{col}_z" for col in columns]
+    if df.empty or not columns:
+        return pd.DataFrame(index=df.index, columns=names, dtype="float64")
+
+    layout = GroupLayout(df["symbol"], pd.DatetimeIndex(df.index).asi8)
+    cells = layout.n_groups * layout.width
+    batch = max(1, MAX_BATCH_CELLS // cells)
+
+    out = np.empty((len(df), len(columns)))
+    for i in range(0, len(columns), batch):
+        cols = columns[i : i + batch]
+        grid = layout.to_grid(df[cols].to_numpy(dtype=np.float64))  # (G, W, C)
+
+        stacked = np.moveaxis(grid, 2, 0).reshape(-1, layout.width)  # (C*G, W)
+        mean, std = rolling_mean_std(stacked, window)
+        std = np.where(std == 0, 1e-10, std)
+        z = (stacked - mean) / std
+
+        z = np.moveaxis(z.reshape(len(cols), layout.n_groups, layout.width), 0, 2)
+        out[:, i : i + len(cols)] = layout.from_grid(z)
+
+    return pd.DataFrame(out, index=df.index, columns=names)
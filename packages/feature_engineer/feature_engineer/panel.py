@@ -0,0 +1,144 @@
+from collections.abc import Sequence
+
+import numpy as np
+import pandas as pd
+
+CROSS_SECTIONAL = ("rank", "zscore", "rel")
+
+
+class Panel:
+    """
+    Dense (dates x symbols) view of a long frame: one 2-D float64 array per field on
+    a shared calendar, plus a validity mask (True where the symbol has a bar).
+
+    Cross-sectional statistics are then reductions along axis 1, computed for every
+    date at once. Results map back to the long frame's rows with gather().
+    """
+
+    def __init__(self, df: pd.DataFrame, fields: Sequence[str]):
+        t_idx, self.dates = pd.factorize(pd.DatetimeIndex(df.index), sort=True)
+        s_idx, self.symbols = pd.factorize(df["symbol"].astype(str), sort=True)
+        self.rows = (t_idx, s_idx)
+
+        shape = (len(self.dates), len(self.symbols))
+        self.mask = np.zeros(shape, dtype=bool)
+        self.mask[self.rows] = True
+        if self.mask.sum() != len(df):
+            raise ValueError("Duplicate (date, symbol) rows; a panel needs one bar per cell")
+        self.fields = {}
+        for name in fields:
+            values = np.full(shape, np.nan)
+            values[self.rows] = df[name].to_numpy(dtype=np.float64)
+            self.fields[name] = values
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.mask.shape
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        return self.fields[field]
+
+    def valid(self, values: np.ndarray) -> np.ndarray:
+        return self.mask & np.isfinite(values)
+
+    def gather(self, values: np.ndarray) -> np.ndarray:
+        """Panel array -> one value per row of the source frame, in its row order."""
+        return values[self.rows]
+
+    def to_frame(self, field: str) -> pd.DataFrame:
+        """Wide (dates x symbols) frame of one field, NaN where there is no bar."""
+        return pd.DataFrame(self.fields[field], index=self.dates, columns=self.symbols)
+
+
+# ==================================================
+# CROSS-SECTIONAL OPERATORS (axis 1 = symbols)
+# ==================================================
+def cs_rank(values: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """
+    Percentile rank within each date, in (0, 1] (pandas rank(pct=True): ties get
+    their average rank). NaN where invalid.
+    """
+    n_symbols = values.shape[1]
+    keyed = np.where(valid, values, np.inf)
+    order = np.argsort(keyed, axis=1, kind="stable")
+    ordered = np.take_along_axis(keyed, order, axis=1)
+
+    # Tie groups along each sorted row: first/last position of every run of equal values
+    pos = np.broadcast_to(np.arange(n_symbols), values.shape)
+    starts = np.ones(values.shape, dtype=bool)
+    starts[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+    ends = np.ones(values.shape, dtype=bool)
+    ends[:, :-1] = starts[:, 1:]
+    first = np.maximum.accumulate(np.where(starts, pos, 0), axis=1)
+    last = np.flip(
+        np.minimum.accumulate(np.flip(np.where(ends, pos, n_symbols), axis=1), axis=1), axis=1
+    )
+
+    ranks = np.empty(values.shape)
+    np.put_along_axis(ranks, order, (first + last) / 2 + 1, axis=1)
+    count = valid.sum(axis=1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(valid, ranks / count, np.nan)
+
+
+def _cs_moments(values, valid):
+    count = valid.sum(axis=1, keepdims=True)
+    x = np.where(valid, values, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = x.sum(axis=1, keepdims=True) / count
+        dev = np.where(valid, values - mean, 0.0)
+        std = np.sqrt((dev * dev).sum(axis=1, keepdims=True) / (count - 1))
+    return count, mean, std
+
+
+def cs_zscore(values: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """(x - mean) / std across symbols per date (sample std, zero std -> 1e-10)."""
+    count, mean, std = _cs_moments(values, valid)
+    std = np.where(std == 0, 1e-10, std)
+    return np.where(valid & (count >= 2), (values - mean) / std, np.nan)
+
+
+def relative_strength(values: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """Excess over the equal-weighted universe mean of the same date."""
+    _, mean, _ = _cs_moments(values, valid)
+    return np.where(valid, values - mean, np.nan)
+
+
+def breadth(values: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """Share of symbols with a positive value per date (e.g. advancers on ret_1d)."""
+    count = valid.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(count > 0, (valid & (values > 0)).sum(axis=1) / count, np.nan)
+
+
+OPERATORS = {"rank": cs_rank, "zscore": cs_zscore, "rel": relative_strength}
+
+
+def cross_sectional_features(
+    df: pd.DataFrame,
+    columns: Sequence[str],
+    features: Sequence[str] = CROSS_SECTIONAL,
+) -> pd.DataFrame:
+    """
+    Add `<col>_cs_<feature>` for every column and feature in (rank, zscore, rel),
+    computed across all symbols of the same date, plus `<col>_breadth` when
+    "breadth" is requested. Rows keep the frame's order.
+    """
+    unknown = [f for f in features if f not in OPERATORS and f != "breadth"]
+    if unknown:
+        raise ValueError(f"Unknown cross-sectional features {unknown}")
+
+    out = df.copy()
+    if out.empty:
+        return out
+
+    panel = Panel(df, columns)
+    for col in columns:
+        values = panel[col]
+        valid = panel.valid(values)
+        for name in features:
+            if name == "breadth":
+                out[f"{col}_breadth"] = breadth(values, valid)[panel.rows[0]]
+            else:
+                out[f"{col}_cs_{name}"] = panel.gather(OPERATORS[name](values, valid))
+    return out
@@ -0,0 +1,188 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+from data_ingestor.ingestor import canonicalize_ohlcv
+from data_ingestor.store import MarketDataStore
+
+from feature_engineer.engineer import FeatureEngineer
+
+
+@dataclass
+class FeatureRunReport:
+    """Outcome of a multi-symbol feature run."""
+
+    rows: dict[str, int] = field(default_factory=dict)
+    failures: dict[str, str] = field(default_factory=dict)
+    timings: dict[str, float] = field(default_factory=dict)
+    workers: dict[str, int] = field(default_factory=dict)
+    actions: dict[str, str] = field(default_factory=dict)
+    wall_time: float = 0.0
+
+    def summary(self) -> pd.DataFrame:
+        rows = []
+        for symbol in dict.fromkeys(list(self.rows) + list(self.failures)):
+            rows.append(
+                {
+                    "symbol": symbol,
+                    "status": "ok" if symbol in self.rows else "failed",
+                    "action": self.actions.get(symbol, "full"),
+                    "rows": self.rows.get(symbol, 0),
+                    "seconds": self.timings.get(symbol, 0.0),
+                    "worker": self.workers.get(symbol, 0),
+                    "error": self.failures.get(symbol, ""),
+                }
+            )
+        return pd.DataFrame(rows)
+
+
+def shard(symbols: list[str], n_shards: int) -> list[list[str]]:
+    """Split symbols into at most n_shards contiguous, near-equal groups."""
+    n_shards = max(1, min(n_shards, len(symbols)))
+    return [list(part) for part in np.array_split(np.array(symbols, dtype=object), n_shards)]
+
+
+# ==================================================
+# WORKER
+# ==================================================
+def _compute_symbol(engineer: FeatureEngineer, df: pd.DataFrame, symbol: str) -> pd.DataFrame:
+    df = canonicalize_ohlcv(df, symbol)
+    df_final = engineer.normalize_continuous(engineer.calculate_features(df))
+
+    if df_final.tail(30).isnull().any().any():
+        raise RuntimeError("NaNs detected in recent rows")
+    return df_final
+
+
+def _write_result(df: pd.DataFrame, out_dir: str, symbol: str) -> dict:
+    """Dump a result frame into .npy memmaps; return the metadata needed to rebuild it."""
+    columns = [c for c in df.columns if c != "symbol"]
+    stem = os.path.join(out_dir, symbol.replace(os.sep, "_"))
+
+    values = np.lib.format.open_memmap(
+        f"{stem}.values.npy", mode="w+", dtype=np.float64, shape=(len(df), len(columns))
+    )
+    for j, col in enumerate(columns):
+        values[:, j] = df[col].to_numpy(dtype=np.float64)
+    values.flush()
+
+    dates = np.lib.format.open_memmap(
+        f"{stem}.dates.npy", mode="w+", dtype=np.int64, shape=(len(df),)
+    )
+    dates[:] = pd.DatetimeIndex(df.index).as_unit("ns").asi8
+    dates.flush()
+    del values, dates
+
+    return {
+        "stem": stem,
+        "columns": columns,
+        "dtypes": [str(df[c].dtype) for c in columns],
+        "order": list(df.columns),
+        "index_name": df.index.name,
+    }
+
+
+def _run_shard(symbols, dataset, store_kwargs, engineer, out_dir) -> list[dict]:
+    """Worker entry point: compute one shard, one symbol at a time."""
+    store = MarketDataStore(**store_kwargs)
+    raw = store.read(dataset, symbols=symbols)
+    groups = {str(k): g for k, g in raw.groupby("symbol", sort=False, observed=True)}
+    results = []
+
+    for symbol in symbols:
+        t0 = time.perf_counter()
+        result = {"symbol": symbol, "worker": os.getpid(), "error": None}
+        try:
+            df = groups.get(symbol)
+            if df is None or df.empty:
+                raise FileNotFoundError(f"Missing {dataset} data for {symbol}")
+            df_final = _compute_symbol(engineer, df, symbol)
+            result.update(_write_result(df_final, out_dir, symbol), rows=len(df_final))
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+        result["seconds"] = time.perf_counter() - t0
+        results.append(result)
+
+    return results
+
+
+def _read_result(meta: dict) -> pd.DataFrame:
+    values = np.load(f"{meta['stem']}.values.npy", mmap_mode="r")
+    dates = np.load(f"{meta['stem']}.dates.npy", mmap_mode="r")
+
+    index = pd.DatetimeIndex(pd.to_datetime(np.asarray(dates)), name=meta["index_name"])
+    df = pd.DataFrame(np.array(values), index=index, columns=meta["columns"])
+    for col, dtype in zip(meta["columns"], meta["dtypes"], strict=True):
+        if str(df[col].dtype) != dtype:
+            df[col] = df[col].astype(dtype)
+    df["symbol"] = meta["symbol"]
+    return df[meta["order"]]
+
+
+# ==================================================
+# DRIVER
+# ==================================================
+def run_feature_pipeline(
+    symbols: list[str],
+    store: MarketDataStore,
+    source_dataset: str,
+    target_dataset: str,
+    engineer: FeatureEngineer,
+    max_workers: int | None = None,
+    shards_per_worker: int = 4,
+) -> FeatureRunReport:
+    """
+    Compute features for `symbols` across a process pool and write them to the store.
+
+    Symbols are split into shards (about `shards_per_worker` per process, for load
+    balancing). Workers read their shard from the store, compute features and dump
+    each symbol's result into memory-mapped .npy files in a scratch directory, so
+    only small metadata crosses process boundaries. The parent maps the files back
+    and writes each symbol to `target_dataset` as soon as it completes.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    max_workers = min(max_workers, len(symbols)) or 1
+    report = FeatureRunReport()
+    t0 = time.perf_counter()
+
+    store_kwargs = {"root": store.root, "legacy_dir": store.legacy_dir, "compact": store.compact}
+    os.makedirs(store.root, exist_ok=True)
+    out_dir = tempfile.mkdtemp(prefix=".features-", dir=store.root)
+
+    def collect(results):
+        for meta in results:
+            symbol = meta["symbol"]
+            report.timings[symbol] = meta["seconds"]
+            report.workers[symbol] = meta["worker"]
+            if meta["error"] is not None:
+                report.failures[symbol] = meta["error"]
+                continue
+            store.write(target_dataset, _read_result(meta))
+            report.rows[symbol] = meta["rows"]
+            for suffix in (".values.npy", ".dates.npy"):
+                os.remove(meta["stem"] + suffix)
+
+    try:
+        shards = shard(symbols, max_workers * shards_per_worker)
+        args = (source_dataset, store_kwargs, engineer, out_dir)
+
+        if max_workers == 1:
+            for part in shards:
+                collect(_run_shard(part, *args))
+        else:
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as pool:
+                futures = [pool.submit(_run_shard, part, *args) for part in shards]
+                for future in as_completed(futures):
+                    collect(future.result())
+    finally:
+        shutil.rmtree(out_dir, ignore_errors=True)
+
+    report.wall_time = time.perf_counter() - t0
+    return report
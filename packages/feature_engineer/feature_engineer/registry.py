@@ -0,0 +1,266 @@
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from core_utils.config import FeatureParams
+
+from feature_engineer.kernels import (
+    GroupLayout,
+    diff,
+    ewm_mean,
+    pct_change,
+    rolling_mean,
+    rolling_mean_std,
+)
+
+# Frame columns a node may read directly
+BASE_INPUTS = ("close", "volume")
+DEFAULT_FEATURES = tuple(FeatureParams().columns)
+
+
+@dataclass(frozen=True)
+class FeatureNode:
+    """
+    One step of the feature DAG. `func(*inputs, **params)` maps (symbols x bars)
+    grids of its inputs to one grid per name in `outputs`. Inputs are base frame
+    columns or outputs of other nodes; params are indicator window names.
+    Outputs starting with "_" are shared intermediates, never frame columns.
+
+    A stateful node (a recursive filter such as an EWM) also takes `init`: its
+    output one bar before the grid, per symbol, when the grid continues an earlier
+    slice of history (see feature_engineer.chunked). Its inputs must be exact over
+    that whole slice, i.e. built from base columns and other stateful nodes.
+    """
+
+    outputs: tuple[str, ...]
+    inputs: tuple[str, ...]
+    params: tuple[str, ...]
+    func: Callable
+    stateful: bool = False
+
+
+REGISTRY: dict[str, FeatureNode] = {}
+
+
+def register_feature(
+    outputs: Sequence[str],
+    inputs: Sequence[str],
+    params: Sequence[str] = (),
+    stateful: bool = False,
+):
+    """Decorator adding a node to the registry under each of its output names."""
+
+    def wrap(func):
+        node = FeatureNode(tuple(outputs), tuple(inputs), tuple(params), func, stateful)
+        if stateful and len(node.outputs) != 1:
+            raise ValueError("Stateful feature nodes must have exactly one output")
+        for name in node.outputs:
+            if name in REGISTRY or name in BASE_INPUTS:
+                raise ValueError(f"Feature output '{name}' is already defined")
+            REGISTRY[name] = node
+        return func
+
+    return wrap
+
+
+# ==================================================
+# SHARED INTERMEDIATES
+# ==================================================
+@register_feature(["_close_mean_short", "_close_std_short"], ["close"], ["sma_short"])
+def _close_bands(close, sma_short):
+    return rolling_mean_std(close, sma_short)
+
+
+@register_feature(["_delta"], ["close"])
+def _delta(close):
+    return diff(close, 1)
+
+
+@register_feature(["_avg_gain", "_avg_loss"], ["_delta"], ["rsi_period"])
+def _avg_gain_loss(delta, rsi_period):
+    gain = np.where(np.isnan(delta), np.nan, np.maximum(delta, 0.0))
+    loss = np.where(np.isnan(delta), np.nan, -np.minimum(delta, 0.0))
+    return rolling_mean(gain, rsi_period), rolling_mean(loss, rsi_period)
+
+
+@register_feature(["_ema_fast"], ["close"], ["macd_fast"], stateful=True)
+def _ema_fast(close, macd_fast, init=None):
+    return ewm_mean(close, macd_fast, init)
+
+
+@register_feature(["_ema_slow"], ["close"], ["macd_slow"], stateful=True)
+def _ema_slow(close, macd_slow, init=None):
+    return ewm_mean(close, macd_slow, init)
+
+
+# ==================================================
+# FEATURES
+# ==================================================
+# Names are the model columns trained artifacts expect and do not follow the
+# windows: sma_20 / sma_50 / ret_5d use whatever sma_short / sma_long / ret_period
+# features.indicators configures (20 / 50 / 5 trading days by default).
+@register_feature(["ret_1d"], ["close"])
+def _ret_1d(close):
+    return pct_change(close, 1)
+
+
+@register_feature(["ret_5d"], ["close"], ["ret_period"])
+def _ret_5d(close, ret_period):
+    return pct_change(close, ret_period)
+
+
+@register_feature(["sma_20"], ["_close_mean_short"])
+def _sma_20(mean):
+    return mean
+
+
+@register_feature(["sma_50"], ["close"], ["sma_long"])
+def _sma_50(close, sma_long):
+    return rolling_mean(close, sma_long)
+
+
+@register_feature(["rsi"], ["_avg_gain", "_avg_loss"])
+def _rsi(gain, loss):
+    loss = np.where(loss == 0, 1e-10, loss)
+    return 100 - (100 / (1 + gain / loss))
+
+
+@register_feature(["macd"], ["_ema_fast", "_ema_slow"])
+def _macd(fast, slow):
+    return fast - slow
+
+
+@register_feature(["macd_signal"], ["macd"], ["macd_signal"], stateful=True)
+def _macd_signal(macd, macd_signal, init=None):
+    return ewm_mean(macd, macd_signal, init)
+
+
+@register_feature(["bb_width"], ["_close_mean_short", "_close_std_short"])
+def _bb_width(mid, std):
+    return (2 * std) / mid
+
+
+@register_feature(["vol_sma"], ["volume"], ["sma_short"])
+def _vol_sma(volume, sma_short):
+    return rolling_mean(volume, sma_short)
+
+
+@register_feature(["vol_ratio"], ["volume", "vol_sma"])
+def _vol_ratio(volume, vol_sma):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return volume / vol_sma
+
+
+@register_feature(["trend_sma"], ["sma_20", "sma_50"])
+def _trend_sma(sma_20, sma_50):
+    return (sma_20 > sma_50).astype(np.int64)
+
+
+# ==================================================
+# ENGINE
+# ==================================================
+class FeaturePipeline:
+    """
+    Evaluates a subset of registered features. Only the nodes the requested
+    columns depend on are run, each exactly once, in dependency order, so shared
+    intermediates (the short rolling mean behind sma_20 and bb_width, close
+    diffs, EWMs) are computed a single time.
+    """
+
+    def __init__(self, windows: dict[str, int], features: Sequence[str] = DEFAULT_FEATURES):
+        unknown = [f for f in features if f not in REGISTRY or f.startswith("_")]
+        if unknown:
+            public = sorted(n for n in REGISTRY if not n.startswith("_"))
+            raise ValueError(f"Unknown features {unknown}. Available: {public}")
+
+        self.windows = windows
+        self.features = list(features)
+        self.plan = self._plan(self.features)
+        self.base_inputs = sorted(
+            {i for node in self.plan for i in node.inputs if i in BASE_INPUTS}
+        )
+        self.stateful_outputs = [n.outputs[0] for n in self.plan if n.stateful]
+
+        # Step after which each intermediate grid can be released
+        self.last_use = {}
+        for step, node in enumerate(self.plan):
+            for name in node.inputs:
+                self.last_use[name] = step
+
+    @staticmethod
+    def _plan(targets) -> list[FeatureNode]:
+        """Topologically ordered nodes needed for `targets` (depth-first)."""
+        order, done, active = [], set(), set()
+
+        def visit(name):
+            if name in BASE_INPUTS:
+                return
+            if name not in REGISTRY:
+                raise ValueError(f"Feature input '{name}' is not defined")
+            node = REGISTRY[name]
+            if node.outputs in done:
+                return
+            if node.outputs in active:
+                raise ValueError(f"Feature dependency cycle at '{name}'")
+
+            active.add(node.outputs)
+            for dep in node.inputs:
+                visit(dep)
+            active.discard(node.outputs)
+            done.add(node.outputs)
+            order.append(node)
+
+        for target in targets:
+            visit(target)
+        return order
+
+    def compute(
+        self,
+        df: pd.DataFrame,
+        init: dict[str, pd.Series] | None = None,
+        extra: Sequence[str] = (),
+    ) -> pd.DataFrame:
+        """
+        Add the features to `df`. `init` maps stateful outputs to their per-symbol
+        value one bar before `df` starts; `extra` names intermediates to return as
+        additional columns (e.g. to carry that state to the next slice).
+        """
+        names = self.features + [n for n in extra if n not in self.features]
+        out = df.copy()
+        if out.empty:
+            for name in names:
+                out[name] = pd.Series(dtype="float64")
+            return out
+
+        layout = GroupLayout(df["symbol"], pd.DatetimeIndex(df.index).asi8)
+        values = {
+            col: layout.to_grid(df[col].to_numpy(dtype=np.float64)) for col in self.base_inputs
+        }
+
+        keep = set(names)
+        for step, node in enumerate(self.plan):
+            args = [values[i] for i in node.inputs]
+            kwargs = {p: self.windows[p] for p in node.params}
+            if node.stateful and init is not None and node.outputs[0] in init:
+                kwargs["init"] = init[node.outputs[0]].reindex(layout.keys).to_numpy(float)
+            result = node.func(*args, **kwargs)
+            if len(node.outputs) == 1:
+                result = (result,)
+            values.update(zip(node.outputs, result, strict=True))
+
+            for name in node.inputs:
+                if self.last_use[name] == step and name not in keep:
+                    del values[name]
+
+        for name in names:
+            out[name] = layout.from_grid(values[name])
+        return out
+
+
+def compute_features(
+    df: pd.DataFrame,
+    windows: dict[str, int],
+    features: Sequence[str] = DEFAULT_FEATURES,
+) -> pd.DataFrame:
+    return FeaturePipeline(windows, features).compute(df)
@@ -0,0 +1,318 @@
+import hashlib
+import json
+import math
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from core_utils.config import load_config
+from data_ingestor.ingestor import OHLCV_COLS
+from data_ingestor.store import MarketDataStore, dataset_name
+
+from feature_engineer import engineer, kernels, normalize, registry
+from feature_engineer.engineer import FeatureEngineer
+from feature_engineer.parallel import FeatureRunReport, _compute_symbol, run_feature_pipeline
+
+# Modules whose source defines what the features compute
+CODE_MODULES = (engineer, kernels, normalize, registry)
+MANIFEST_FILE = "_manifest.json"  # "_" prefix: ignored by pyarrow dataset discovery
+EWM_TOLERANCE = 1e-12  # residual weight of the history an incremental EWM warm-up drops
+
+
+def code_version() -> str:
+    digest = hashlib.sha256()
+    for module in CODE_MODULES:
+        if module.__file__ is None:
+            raise RuntimeError(f"Cannot version features: {module.__name__} has no source file")
+        with open(module.__file__, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def raw_fingerprint(raw: pd.DataFrame) -> str:
+    """Hash of a symbol's bar timestamps and OHLCV values."""
+    digest = hashlib.sha256()
+    digest.update(pd.DatetimeIndex(raw.index).as_unit("ns").asi8.tobytes())
+    digest.update(np.ascontiguousarray(raw[OHLCV_COLS].to_numpy(dtype=np.float64)).tobytes())
+    return digest.hexdigest()[:16]
+
+
+def _settle_bars(span: int, tol: float = EWM_TOLERANCE) -> int:
+    """Bars after which an EWM(span) no longer depends on where it was started."""
+    beta = 1.0 - 2.0 / (span + 1.0)
+    return 1 if beta <= 0 else math.ceil(math.log(tol) / math.log(beta))
+
+
+def lookback_bars(windows: dict[str, int]) -> int:
+    """
+    History needed in front of new bars to recompute their features from scratch:
+    the z-score window on top of the longest indicator chain (rolling windows, or
+    the slow EWM feeding the signal EWM, run until their start is forgotten).
+    """
+    rolling = max(
+        windows["ret_period"] + 1,
+        windows["sma_short"],
+        windows["sma_long"],
+        windows["rsi_period"] + 1,
+    )
+    ewm = _settle_bars(windows["macd_slow"]) + _settle_bars(windows["macd_signal"])
+    return windows["zscore"] + max(rolling, ewm)
+
+
+class FeatureSet:
+    """
+    Lazy view of a materialised feature dataset: each column is read from the
+    store (column projection) the first time it is requested, then kept.
+    """
+
+    def __init__(self, store: MarketDataStore, dataset: str, symbols=None, start=None, end=None):
+        self.store = store
+        self.dataset = dataset
+        self.symbols = symbols
+        self.start = start
+        self.end = end
+        self._cache: dict[str, pd.Series] = {}
+
+    @property
+    def columns(self) -> list[str]:
+        return self.store.columns(self.dataset)
+
+    def _read(self, columns: list[str]) -> pd.DataFrame:
+        return self.store.read(
+            self.dataset, symbols=self.symbols, start=self.start, end=self.end, columns=columns
+        )
+
+    def load(self, columns: list[str]) -> pd.DataFrame:
+        """Frame of `columns` plus `symbol`; only columns not read yet hit the disk."""
+        missing = [c for c in dict.fromkeys(columns + ["symbol"]) if c not in self._cache]
+        if missing:
+            df = self._read([c for c in missing if c != "symbol"])
+            for col in missing:
+                self._cache[col] = df[col]
+        return pd.DataFrame({c: self._cache[c] for c in columns + ["symbol"]})
+
+    def __getitem__(self, column: str) -> pd.Series:
+        return self.load([column])[column]
+
+
+class FeatureStore:
+    """
+    Materialised features with provenance.
+
+    Every symbol written to `target_dataset` gets a manifest record keyed by a hash of
+    (raw-data fingerprint, feature list, indicator windows, schema, code version).
+    refresh() then only touches what changed:
+    - key matches -> skipped
+    - same definition, raw history only extended -> features for the new bars are
+      computed from the last lookback_bars() of history and appended
+    - anything else (new parameters, code change, restated history) -> recomputed
+
+    The manifest lives next to the partitions ({root}/{target}/_manifest.json).
+    """
+
+    def __init__(
+        self,
+        store: MarketDataStore,
+        engineer: FeatureEngineer,
+        source_dataset: str = "historical",
+        target_dataset: str = "processed",
+    ):
+        self.store = store
+        self.engineer = engineer
+        self.source_dataset = source_dataset
+        self.target_dataset = target_dataset
+        self.manifest_path = os.path.join(store.dataset_path(target_dataset), MANIFEST_FILE)
+        self.manifest = self._load_manifest()
+
+    @classmethod
+    def from_config(
+        cls,
+        interval: str = "1d",
+        root: str = "data/store",
+        legacy_dir: str | None = "data",
+        compact: bool = True,
+    ) -> "FeatureStore":
+        """Feature store for the feature settings in configs/base.yaml."""
+        config = load_config().features
+        engineer = FeatureEngineer(
+            compact=compact,
+            interval=interval,
+            rolling_window=config.rolling_window,
+            indicators=config.indicators,
+            features=config.columns,
+        )
+        store = MarketDataStore(root=root, legacy_dir=legacy_dir, compact=compact)
+        return cls(
+            store,
+            engineer,
+            source_dataset=dataset_name("historical", interval),
+            target_dataset=dataset_name("processed", interval),
+        )
+
+    # ==================================================
+    # KEYS & MANIFEST
+    # ==================================================
+    def definition(self) -> dict:
+        return {
+            "features": self.engineer.features,
+            "windows": self.engineer.windows(),
+            "interval": self.engineer.interval,
+            "compact": self.engineer.compact,
+            "code_version": code_version(),
+        }
+
+    def definition_hash(self) -> str:
+        raw = json.dumps(self.definition(), sort_keys=True)
+        return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+    @staticmethod
+    def cache_key(raw_hash: str, definition_hash: str) -> str:
+        return hashlib.sha256(f"{raw_hash}:{definition_hash}".encode()).hexdigest()[:16]
+
+    def _load_manifest(self) -> dict:
+        if not os.path.exists(self.manifest_path):
+            return {}
+        try:
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self):
+        out_dir = os.path.dirname(self.manifest_path)
+        os.makedirs(out_dir, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=out_dir, prefix=".", suffix=".json.tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.manifest_path)
+
+    def _record(self, raw: pd.DataFrame, definition_hash: str, rows: int) -> dict:
+        raw_hash = raw_fingerprint(raw)
+        return {
+            "key": self.cache_key(raw_hash, definition_hash),
+            "definition": definition_hash,
+            "raw_hash": raw_hash,
+            "raw_rows": len(raw),
+            "raw_end": pd.Timestamp(raw.index.max()).isoformat(),
+            "rows": rows,
+            "updated": pd.Timestamp.now().isoformat(timespec="seconds"),
+        }
+
+    # ==================================================
+    # PLANNING
+    # ==================================================
+    def _read_raw(self, symbols: list[str]) -> dict[str, pd.DataFrame]:
+        raw = self.store.read(self.source_dataset, symbols=symbols)
+        return {str(k): g for k, g in raw.groupby("symbol", sort=False, observed=True)}
+
+    def _action(self, symbol: str, raw: pd.DataFrame | None, definition_hash: str) -> str:
+        if raw is None or raw.empty:
+            return "missing"
+        record = self.manifest.get(symbol)
+        if (
+            record is None
+            or record["definition"] != definition_hash
+            or not self.store.has_symbol(self.target_dataset, symbol)
+        ):
+            return "full"
+
+        if record["key"] == self.cache_key(raw_fingerprint(raw), definition_hash):
+            return "fresh"
+
+        n_old = record["raw_rows"]
+        if (
+            len(raw) > n_old
+            and pd.Timestamp(raw.index[n_old - 1]).isoformat() == record["raw_end"]
+            and raw_fingerprint(raw.iloc[:n_old]) == record["raw_hash"]
+        ):
+            return "append"
+        return "full"
+
+    def plan(self, symbols: list[str]) -> dict[str, str]:
+        """Action per symbol: fresh, append, full or missing (no raw data)."""
+        raws = self._read_raw(symbols)
+        definition_hash = self.definition_hash()
+        return {s: self._action(s, raws.get(s), definition_hash) for s in symbols}
+
+    def stale(self, symbols: list[str]) -> list[str]:
+        """Symbols whose stored features do not match current raw data and settings."""
+        return [s for s, action in self.plan(symbols).items() if action != "fresh"]
+
+    # ==================================================
+    # REFRESH
+    # ==================================================
+    def refresh(
+        self, symbols: list[str], max_workers: int | None = None, force: bool = False
+    ) -> FeatureRunReport:
+        raws = self._read_raw(symbols)
+        definition_hash = self.definition_hash()
+        actions = {
+            s: "full" if force and s in raws else self._action(s, raws.get(s), definition_hash)
+            for s in symbols
+        }
+
+        full = [s for s in symbols if actions[s] == "full"]
+        report = (
+            run_feature_pipeline(
+                full,
+                self.store,
+                self.source_dataset,
+                self.target_dataset,
+                self.engineer,
+                max_workers=max_workers,
+            )
+            if full
+            else FeatureRunReport()
+        )
+        for symbol in full:
+            if symbol in report.rows:
+                self.manifest[symbol] = self._record(
+                    raws[symbol], definition_hash, report.rows[symbol]
+                )
+
+        for symbol in [s for s in symbols if actions[s] == "append"]:
+            try:
+                self._append(symbol, raws[symbol], definition_hash, report)
+            except Exception as e:
+                report.failures[symbol] = f"{type(e).__name__}: {e}"
+
+        for symbol, action in actions.items():
+            report.actions[symbol] = action
+            if action == "missing":
+                report.failures[symbol] = f"Missing {self.source_dataset} data for {symbol}"
+            elif action == "fresh":
+                report.rows[symbol] = self.manifest[symbol]["rows"]
+
+        self._save_manifest()
+        return report
+
+    def record(self, rows: dict[str, int]):
+        """Mark symbols written outside refresh() (e.g. chunked runs) as current."""
+        definition_hash = self.definition_hash()
+        for symbol, n_rows in rows.items():
+            raw = self.store.read(self.source_dataset, symbols=[symbol])
+            self.manifest[symbol] = self._record(raw, definition_hash, n_rows)
+        self._save_manifest()
+
+    def _append(self, symbol, raw, definition_hash, report):
+        t0 = time.perf_counter()
+        record = self.manifest[symbol]
+        first_new = record["raw_rows"]
+        tail = raw.iloc[max(0, first_new - lookback_bars(self.engineer.windows())) :]
+
+        out = _compute_symbol(self.engineer, tail, symbol)
+        new = out[out.index > pd.Timestamp(record["raw_end"])]
+        self.store.append(self.target_dataset, new)
+
+        self.manifest[symbol] = self._record(raw, definition_hash, record["rows"] + len(new))
+        report.rows[symbol] = self.manifest[symbol]["rows"]
+        report.timings[symbol] = time.perf_counter() - t0
+        report.workers[symbol] = os.getpid()
+
+    # ==================================================
+    # READ
+    # ==================================================
+    def open(self, symbols: list[str] | None = None, start=None, end=None) -> FeatureSet:
+        return FeatureSet(self.store, self.target_dataset, symbols, start, end)
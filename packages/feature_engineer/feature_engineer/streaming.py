@@ -0,0 +1,300 @@
+import json
+import math
+import os
+import tempfile
+from collections import deque
+
+import numpy as np
+import pandas as pd
+from core_utils.config import IndicatorParams
+from core_utils.schema import BINARY_COLS
+
+from feature_engineer.engineer import FeatureEngineer
+from feature_engineer.registry import DEFAULT_FEATURES
+
+BASE_COLS = ["open", "high", "low", "close", "volume", "symbol"]
+CONTINUOUS = [f for f in DEFAULT_FEATURES if f not in BINARY_COLS]
+OUTPUT_COLS = BASE_COLS + list(DEFAULT_FEATURES) + [f"{c}_z" for c in CONTINUOUS]
+OUTPUT_INDEX = pd.Index(OUTPUT_COLS)
+
+
+class RollingMoments:
+    """
+    Fixed-size ring buffer with running sums for mean / sample std
+    (pandas rolling(size, min_periods=1) semantics: NaNs take a slot but are skipped).
+
+    Sums are kept relative to a reference value and rebuilt exactly from the buffer
+    once every `size` evictions, so rounding drift is bounded at amortised O(1) cost.
+    """
+
+    def __init__(self, size: int, values=()):
+        self.size = size
+        self.values = deque(values, maxlen=size)
+        self._resync()
+
+    def _resync(self):
+        finite = [v for v in self.values if math.isfinite(v)]
+        self.ref = sum(finite) / len(finite) if finite else 0.0
+        self.count = len(finite)
+        self.s1 = sum(v - self.ref for v in finite)
+        self.s2 = sum((v - self.ref) ** 2 for v in finite)
+        self._evictions = 0
+
+    def push(self, x: float):
+        if len(self.values) == self.size:
+            old = self.values[0]
+            self._evictions += 1
+            if math.isfinite(old):
+                self.count -= 1
+                self.s1 -= old - self.ref
+                self.s2 -= (old - self.ref) ** 2
+
+        self.values.append(x)
+        if math.isfinite(x):
+            self.count += 1
+            self.s1 += x - self.ref
+            self.s2 += (x - self.ref) ** 2
+
+        if self._evictions >= self.size:
+            self._resync()
+
+    def mean(self) -> float:
+        return self.ref + self.s1 / self.count if self.count >= 1 else np.nan
+
+    def std(self) -> float:
+        if self.count < 2:
+            return np.nan
+        var = (self.s2 - self.s1 * self.s1 / self.count) / (self.count - 1)
+        return math.sqrt(max(var, 0.0))
+
+
+class SymbolState:
+    """Everything needed to extend one symbol's features by a bar."""
+
+    def __init__(self, windows: dict[str, int]):
+        w = windows
+        self.last_date = None
+        self.closes: deque[float] = deque(maxlen=w["ret_period"] + 1)
+        self.close_short = RollingMoments(w["sma_short"])
+        self.close_long = RollingMoments(w["sma_long"])
+        self.gain = RollingMoments(w["rsi_period"])
+        self.loss = RollingMoments(w["rsi_period"])
+        self.volume = RollingMoments(w["sma_short"])
+        self.ema: dict[str, float | None] = {"fast": None, "slow": None, "signal": None}
+        self.z = {col: RollingMoments(w["zscore"]) for col in CONTINUOUS}
+
+    def to_dict(self) -> dict:
+        return {
+            "last_date": None if self.last_date is None else self.last_date.isoformat(),
+            "closes": list(self.closes),
+            "close_short": list(self.close_short.values),
+            "close_long": list(self.close_long.values),
+            "gain": list(self.gain.values),
+            "loss": list(self.loss.values),
+            "volume": list(self.volume.values),
+            "ema": self.ema,
+            "z": {col: list(m.values) for col, m in self.z.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, windows: dict[str, int], data: dict) -> "SymbolState":
+        state = cls(windows)
+        if data["last_date"] is not None:
+            state.last_date = pd.Timestamp(data["last_date"])
+        state.closes.extend(data["closes"])
+        for name in ("close_short", "close_long", "gain", "loss", "volume"):
+            setattr(state, name, RollingMoments(getattr(state, name).size, data[name]))
+        state.ema = dict(data["ema"])
+        state.z = {col: RollingMoments(windows["zscore"], data["z"][col]) for col in CONTINUOUS}
+        return state
+
+
+def _ewm(prev: float | None, x: float, span: int) -> float:
+    """
+    One ewm(adjust=False) step. A missing bar carries the previous level; the bar
+    after a gap is blended as if the gap were absent (pandas ignore_na=True), so
+    it can differ slightly from the batch path, whose weights decay through gaps.
+    """
+    if math.isnan(x):
+        return np.nan if prev is None else prev
+    if prev is None or math.isnan(prev):
+        return x
+    alpha = 2.0 / (span + 1.0)
+    return (1 - alpha) * prev + alpha * x
+
+
+class IncrementalFeatureEngineer:
+    """
+    Streaming counterpart of FeatureEngineer: update(symbol, bar) extends one
+    symbol by one bar in O(1) per feature and returns the same row that
+    calculate_features + normalize_continuous would produce for it.
+
+    State (ring buffers, running sums, EWM levels) can be saved to and loaded
+    from a JSON file, so a daily job or a live loop can resume where it stopped.
+    """
+
+    def __init__(
+        self,
+        interval: str = "1d",
+        rolling_window: int = 60,
+        indicators: IndicatorParams | None = None,
+    ):
+        self.interval = interval
+        self.rolling_window = rolling_window
+        self.indicators = indicators or IndicatorParams()
+        self.windows = FeatureEngineer(
+            interval=interval, rolling_window=rolling_window, indicators=self.indicators
+        ).windows()
+        self.states: dict[str, SymbolState] = {}
+
+    # ==================================================
+    # UPDATES
+    # ==================================================
+    def update(self, symbol: str, bar, date=None) -> pd.Series:
+        """
+        Add one bar (mapping with open/high/low/close/volume; a Series' name is
+        used as its timestamp unless `date` is given) and return its feature row.
+        """
+        date = pd.Timestamp(date if date is not None else bar.name)
+        state = self.states.get(symbol)
+        if state is None:
+            state = self.states[symbol] = SymbolState(self.windows)
+        if state.last_date is not None and date <= state.last_date:
+            raise ValueError(f"{symbol}: bar {date} is not after last bar {state.last_date}")
+
+        w = self.windows
+        close, volume = float(bar["close"]), float(bar["volume"])
+        prev_close = state.closes[-1] if state.closes else np.nan
+        state.closes.append(close)
+        state.last_date = date
+
+        row = {col: bar[col] for col in BASE_COLS[:-1]}
+        row["symbol"] = symbol
+
+        # RETURNS
+        row["ret_1d"] = close / prev_close - 1
+        full = len(state.closes) == state.closes.maxlen
+        row["ret_5d"] = close / state.closes[0] - 1 if full else np.nan
+
+        # MOVING AVERAGES
+        state.close_short.push(close)
+        state.close_long.push(close)
+        row["sma_20"] = state.close_short.mean()
+        row["sma_50"] = state.close_long.mean()
+
+        # RSI
+        delta = close - prev_close
+        state.gain.push(max(delta, 0.0) if math.isfinite(delta) else np.nan)
+        state.loss.push(-min(delta, 0.0) if math.isfinite(delta) else np.nan)
+        loss = state.loss.mean()
+        loss = 1e-10 if loss == 0 else loss
+        row["rsi"] = 100 - (100 / (1 + state.gain.mean() / loss))
+
+        # MACD
+        fast = state.ema["fast"] = _ewm(state.ema["fast"], close, w["macd_fast"])
+        slow = state.ema["slow"] = _ewm(state.ema["slow"], close, w["macd_slow"])
+        row["macd"] = fast - slow
+        state.ema["signal"] = _ewm(state.ema["signal"], row["macd"], w["macd_signal"])
+        row["macd_signal"] = state.ema["signal"]
+
+        # BOLLINGER BAND WIDTH
+        row["bb_width"] = (2 * state.close_short.std()) / row["sma_20"]
+
+        # VOLUME
+        state.volume.push(volume)
+        row["vol_sma"] = state.volume.mean()
+        row["vol_ratio"] = volume / row["vol_sma"]
+
+        # BINARY TREND SIGNAL
+        row["trend_sma"] = int(row["sma_20"] > row["sma_50"])
+
+        # ROLLING Z-SCORES
+        for col in CONTINUOUS:
+            moments = state.z[col]
+            moments.push(row[col])
+            std = moments.std()
+            std = 1e-10 if std == 0 else std
+            row[f"{col}_z"] = (row[col] - moments.mean()) / std
+
+        return pd.Series(
+            [row[col] for col in OUTPUT_COLS], index=OUTPUT_INDEX, name=date, dtype=object
+        )
+
+    def update_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Feed a long frame of bars (date index, symbol column) in date order."""
+        ordered = df.sort_index(kind="stable")
+        rows = [self.update(bar["symbol"], bar) for _, bar in ordered.iterrows()]
+        if not rows:
+            return pd.DataFrame(columns=OUTPUT_COLS)
+        out = pd.DataFrame(rows).infer_objects()
+        out.index.name = df.index.name
+        return out
+
+    # ==================================================
+    # PERSISTENCE
+    # ==================================================
+    def save(self, path: str):
+        """Atomically write the full streaming state to a JSON file."""
+        payload = {
+            "interval": self.interval,
+            "rolling_window": self.rolling_window,
+            "indicators": self.indicators.model_dump(),
+            "symbols": {sym: state.to_dict() for sym, state in self.states.items()},
+        }
+        out_dir = os.path.dirname(path) or "."
+        os.makedirs(out_dir, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=out_dir, suffix=".json.tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(payload, f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "IncrementalFeatureEngineer":
+        with open(path) as f:
+            payload = json.load(f)
+
+        engineer = cls(
+            interval=payload["interval"],
+            rolling_window=payload["rolling_window"],
+            indicators=IndicatorParams(**payload["indicators"]),
+        )
+        engineer.states = {
+            sym: SymbolState.from_dict(engineer.windows, data)
+            for sym, data in payload["symbols"].items()
+        }
+        return engineer
+
+
+def parity_report(
+    df: pd.DataFrame,
+    interval: str = "1d",
+    rolling_window: int = 60,
+    indicators: IndicatorParams | None = None,
+    warmup: int = 0,
+) -> pd.Series:
+    """
+    Max difference per feature column between the batch path and streaming the
+    same bars through IncrementalFeatureEngineer, as |a - b| / (1 + |a|).
+    A NaN on only one side counts as inf.
+
+    The first `warmup` bars of each symbol are skipped: there a z-score can be
+    taken over a near-constant window (e.g. rsi pinned at 100) and is rounding noise.
+    """
+    batch_fe = FeatureEngineer(
+        interval=interval, rolling_window=rolling_window, indicators=indicators
+    )
+    batch = batch_fe.normalize_continuous(batch_fe.calculate_features(df))
+    stream = IncrementalFeatureEngineer(interval, rolling_window, indicators).update_frame(df)
+
+    batch = batch.sort_index(kind="stable")
+    batch = batch[batch.groupby("symbol", observed=True).cumcount() >= warmup]
+    batch = batch.set_index("symbol", append=True)
+    stream = stream.set_index("symbol", append=True).reindex(batch.index)
+
+    cols = [c for c in OUTPUT_COLS if c not in BASE_COLS]
+    a = batch[cols].to_numpy(dtype=np.float64)
+    b = stream[cols].to_numpy(dtype=np.float64)
+    nan_mismatch = np.isnan(a) != np.isnan(b)
+    diff = np.where(np.isnan(a) & np.isnan(b), 0.0, np.abs(a - b) / (1 + np.abs(a)))
+    diff[nan_mismatch] = np.inf
+    return pd.Series(diff.max(axis=0), index=cols)
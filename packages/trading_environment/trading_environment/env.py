@@ -1,44 +1,76 @@
 import gymnasium as gym
 import numpy as np
+from core_utils.config import load_config
 from gymnasium import spaces
 
+ENGINES = ("array", "pandas")
+POSITIONS = (-1, 0, 1)  # action -> position
+
 
 class TradingEnv(gym.Env):
     """
     Trading environment for PPO (Meta-Policy).
     Uses precomputed XGBoost probabilities and current position as part of observation.
+    Feature columns default to the configured feature set (features.columns).
+
+    engine="array" converts the feature block and xgb_prob to contiguous float32
+    arrays (ret_1d keeps its dtype, so rewards are unchanged) once at construction
+    and assembles observations with slice writes instead of row lookups. reset/step
+    return a fresh array (callers such as rollout buffers keep them); only
+    get_observation reuses one buffer, valid until its next call. engine="pandas"
+    is the row-lookup reference implementation.
+
+    With a `sampler` (trading_environment.sampler.EpisodeSampler) the env runs on
+    the sampler's multi-symbol arrays instead of `df`: every reset draws a short
+    episode (symbol, start bar, length) inside the sampler's split, using the env's
+    np_random (seed via reset(seed=...)). Without one, an episode is all of `df`.
     """
 
     metadata = {"render.modes": ["human"]}
 
-    def __init__(self, df):
+    def __init__(self, df=None, feature_cols=None, engine="array", sampler=None):
         super().__init__()
-
-        self.data = df.reset_index(drop=True)
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine '{engine}'. Use one of {ENGINES}")
+        if sampler is not None and engine != "array":
+            raise ValueError("Episode sampling requires engine='array'")
+        self.engine = engine
+        self.sampler = sampler
+        self.symbol = None
 
         # ===============================
         # FEATURE COLUMNS (MUST MATCH TRAINING)
         # ===============================
-        self.feature_cols = [
-            "ret_1d_z",
-            "ret_5d_z",
-            "sma_20_z",
-            "sma_50_z",
-            "rsi_z",
-            "macd_z",
-            "macd_signal_z",
-            "bb_width_z",
-            "vol_sma_z",
-            "vol_ratio_z",
-            "trend_sma",
-        ]
-
-        if "xgb_prob" not in self.data.columns:
-            raise ValueError("Data must contain 'xgb_prob' column for Meta-Policy")
+        if sampler is not None:
+            feature_cols = sampler.data.feature_cols
+        elif feature_cols is None:
+            feature_cols = load_config().features.model_columns()
+        self.feature_cols = list(feature_cols)
 
         # Observation: [Features...] + [xgb_prob] + [position]
         self.n_features = len(self.feature_cols) + 2
 
+        if sampler is not None:
+            self.data = None
+            self._features = sampler.data.features
+            self._xgb_prob = sampler.data.xgb_prob
+            self._ret = sampler.data.ret
+            self._obs = np.empty(self.n_features, dtype=np.float32)
+            self._inference_obs = np.empty(self.n_features, dtype=np.float32)
+        else:
+            self.data = df.reset_index(drop=True)
+            if "xgb_prob" not in self.data.columns:
+                raise ValueError("Data must contain 'xgb_prob' column for Meta-Policy")
+
+        if engine == "array" and sampler is None:
+            self._features = np.ascontiguousarray(
+                self.data[self.feature_cols].to_numpy(dtype=np.float32)
+            )
+            self._xgb_prob = self.data["xgb_prob"].to_numpy(dtype=np.float32)
+            self._ret = self.data["ret_1d"].to_numpy() if "ret_1d" in self.data else None
+            self._obs = np.empty(self.n_features, dtype=np.float32)
+            self._inference_obs = np.empty(self.n_features, dtype=np.float32)
+
         # ===============================
         # ACTION & OBSERVATION SPACES
         # ===============================
@@ -60,6 +92,13 @@ class TradingEnv(gym.Env):
     # TRAINING OBSERVATION
     # ==================================================
     def _get_obs(self):
+        if self.engine == "array":
+            n = len(self.feature_cols)
+            self._obs[:n] = self._features[self.current_step]
+            self._obs[n] = self._xgb_prob[self.current_step]
+            self._obs[n + 1] = self.position
+            return self._obs.copy()
+
         obs = self.data.loc[self.current_step, self.feature_cols].values.tolist()
         xgb_prob = self.data.loc[self.current_step, "xgb_prob"]
         obs.append(xgb_prob)
@@ -73,6 +112,15 @@ class TradingEnv(gym.Env):
         """
         Deterministic, numerically safe observation for inference."""
 
+        if self.engine == "array":
+            obs_arr = self._inference_obs
+            n = len(self.feature_cols)
+            obs_arr[:n] = self._features[idx]
+            obs_arr[n] = xgb_prob
+            obs_arr[n + 1] = current_position
+            np.nan_to_num(obs_arr, copy=False, nan=0.0, posinf=10.0, neginf=-10.0)
+            return np.clip(obs_arr, -10.0, 10.0, out=obs_arr)
+
         obs = self.data.loc[idx, self.feature_cols].values.tolist()
         obs.append(xgb_prob)
         obs.append(current_position)
@@ -86,14 +134,39 @@ class TradingEnv(gym.Env):
 
         return obs_arr
 
+    def get_observations(self, idx, current_position: int, xgb_prob) -> np.ndarray:
+        """
+        Batched get_observation: one row per bar in `idx`, all with the same
+        position. Rows equal get_observation(i, current_position, xgb_prob[k])."""
+
+        idx = np.asarray(idx)
+        if self.engine == "array":
+            features = self._features[idx]
+        else:
+            features = self.data.loc[idx, self.feature_cols].to_numpy(dtype=np.float32)
+
+        n = len(self.feature_cols)
+        obs_arr = np.empty((len(idx), self.n_features), dtype=np.float32)
+        obs_arr[:, :n] = features
+        obs_arr[:, n] = xgb_prob
+        obs_arr[:, n + 1] = current_position
+        np.nan_to_num(obs_arr, copy=False, nan=0.0, posinf=10.0, neginf=-10.0)
+        return np.clip(obs_arr, -10.0, 10.0, out=obs_arr)
+
     def reset(self, seed=None, options=None):
-        self.current_step = 0
+        super().reset(seed=seed)
+        if self.sampler is not None:
+            segment, start, stop = (int(v[0]) for v in self.sampler.sample(self.np_random))
+            self.symbol = self.sampler.data.symbols[segment]
+            self.current_step, self._stop = start, stop
+        else:
+            self.current_step, self._stop = 0, len(self.data)
         self.position = 0
         return self._get_obs(), {}
 
     def step(self, action):
         prev_position = self.position
-        new_position = {0: -1, 1: 0, 2: 1}[int(action)]
+        new_position = POSITIONS[int(action)]
         self.position = new_position
 
         # --------------------------------------------------
@@ -108,7 +181,12 @@ class TradingEnv(gym.Env):
         # REWARD DELAY (NO LOOK-AHEAD)
         # Observation at t -> Action at t -> earns return at t+1
         # --------------------------------------------------
-        next_ret = self.data.loc[self.current_step + 1, "ret_1d"]
+        if self.engine == "array":
+            if self._ret is None:
+                raise KeyError("ret_1d")
+            next_ret = self._ret[self.current_step + 1]
+        else:
+            next_ret = self.data.loc[self.current_step + 1, "ret_1d"]
 
         # Meta-Policy Reward: Penalize excessive switching and optimize for Sharpe-like behavior
         step_pnl = (self.position * next_ret) - costs
@@ -118,7 +196,7 @@ class TradingEnv(gym.Env):
         reward = step_pnl
 
         self.current_step += 1
-        done = self.current_step >= len(self.data) - 2  # buffer for t+1 return
+        done = self.current_step >= self._stop - 2  # buffer for t+1 return
 
         obs = self._get_obs() if not done else np.zeros(self.n_features, dtype=np.float32)
 
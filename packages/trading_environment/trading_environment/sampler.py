@@ -0,0 +1,128 @@
+import numpy as np
+import pandas as pd
+from core_utils.config import load_config
+
+
+class EpisodeData:
+    """
+    Multi-symbol episode data in one set of contiguous arrays.
+
+    Symbols are laid end to end: rows starts[i]:ends[i] belong to symbols[i], in
+    date order. features/xgb_prob are float32 (the observation dtype); ret_1d
+    keeps its stored dtype so rewards match TradingEnv exactly.
+
+    Accepts a long frame with a `symbol` column, a {symbol: frame} mapping or a
+    single frame. Bar dates come from a DatetimeIndex or a `date` column.
+    """
+
+    def __init__(self, frames, feature_cols=None):
+        if feature_cols is None:
+            feature_cols = load_config().features.model_columns()
+        self.feature_cols = list(feature_cols)
+
+        if isinstance(frames, pd.DataFrame):
+            if "symbol" in frames.columns:
+                frames = {str(s): g for s, g in frames.groupby("symbol", sort=False, observed=True)}
+            else:
+                frames = {"": frames}
+
+        self.symbols = list(frames)
+        frames = [self._date_indexed(frames[s]) for s in self.symbols]
+        for frame in frames:
+            if "xgb_prob" not in frame.columns:
+                raise ValueError("Data must contain 'xgb_prob' column for Meta-Policy")
+
+        self.features = np.ascontiguousarray(
+            np.concatenate([f[self.feature_cols].to_numpy(dtype=np.float32) for f in frames])
+        )
+        self.xgb_prob = np.concatenate([f["xgb_prob"].to_numpy(dtype=np.float32) for f in frames])
+        self.ret = np.concatenate([f["ret_1d"].to_numpy() for f in frames])
+        self.dates = (
+            np.concatenate([f.index.as_unit("ns").asi8 for f in frames])
+            if all(isinstance(f.index, pd.DatetimeIndex) for f in frames)
+            else None
+        )
+
+        lengths = np.array([len(f) for f in frames], dtype=np.int64)
+        self.starts = np.concatenate([[0], np.cumsum(lengths)[:-1]]).astype(np.int64)
+        self.ends = self.starts + lengths
+
+    @staticmethod
+    def _date_indexed(frame: pd.DataFrame) -> pd.DataFrame:
+        if "date" in frame.columns:
+            frame = frame.set_index("date")
+        if isinstance(frame.index, pd.DatetimeIndex):
+            return frame.sort_index(kind="stable")
+        return frame.reset_index(drop=True)
+
+    def __len__(self) -> int:
+        return len(self.ret)
+
+    def bounds(self, start=None, end=None) -> tuple[np.ndarray, np.ndarray]:
+        """Row range [lo, hi) of every symbol inside [start, end) (dates, end exclusive)."""
+        lo, hi = self.starts.copy(), self.ends.copy()
+        if start is None and end is None:
+            return lo, hi
+        if self.dates is None:
+            raise ValueError("Split boundaries need dated rows (DatetimeIndex or 'date' column)")
+
+        for i in range(len(self.symbols)):
+            dates = self.dates[self.starts[i] : self.ends[i]]
+            if start is not None:
+                lo[i] = self.starts[i] + np.searchsorted(dates, pd.Timestamp(start).value)
+            if end is not None:
+                hi[i] = self.starts[i] + np.searchsorted(dates, pd.Timestamp(end).value)
+        return lo, np.maximum(lo, hi)
+
+
+class EpisodeSampler:
+    """
+    Draws short episodes (symbol, start bar, length) from EpisodeData.
+
+    An episode of n steps uses bars [start, start + n + 2): observation at t,
+    action, return at t + 1, as in TradingEnv. Every bar it touches lies inside the
+    split [start, end), so train episodes never earn returns from the test period.
+    Symbols are picked in proportion to how many episode starts they offer, so each
+    admissible window is about equally likely; lengths are uniform in
+    [min_length, max_length], capped by what the symbol's split range allows.
+    """
+
+    def __init__(
+        self,
+        data: EpisodeData,
+        min_length: int = 64,
+        max_length: int = 256,
+        start=None,
+        end=None,
+        symbols: list[str] | None = None,
+    ):
+        if not 1 <= min_length <= max_length:
+            raise ValueError("Need 1 <= min_length <= max_length")
+        self.data = data
+        self.min_length = min_length
+        self.max_length = max_length
+
+        lo, hi = data.bounds(start, end)
+        if symbols is not None:
+            keep = np.isin(np.array(data.symbols, dtype=object), symbols)
+            hi = np.where(keep, hi, lo)
+
+        # episode of n steps needs n + 2 bars
+        n_starts = (hi - lo) - (min_length + 2) + 1
+        self.segments = np.flatnonzero(n_starts > 0)
+        if len(self.segments) == 0:
+            raise ValueError(f"No symbol has {min_length + 2} bars inside the split")
+
+        self.lo = lo[self.segments]
+        self.hi = hi[self.segments]
+        self.weights = n_starts[self.segments] / n_starts[self.segments].sum()
+
+    def sample(self, rng: np.random.Generator, n: int = 1):
+        """Draw n episodes; returns (segment, first bar, stop bar) arrays (absolute rows)."""
+        pick = rng.choice(len(self.segments), size=n, p=self.weights)
+        lo, hi = self.lo[pick], self.hi[pick]
+
+        longest = np.minimum(self.max_length, hi - lo - 2)
+        lengths = rng.integers(self.min_length, longest + 1)
+        starts = rng.integers(lo, hi - lengths - 2 + 1)
+        return self.segments[pick], starts, starts + lengths + 2
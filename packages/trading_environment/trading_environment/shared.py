@@ -0,0 +1,99 @@
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+from stable_baselines3.common.vec_env import SubprocVecEnv
+
+from trading_environment.env import TradingEnv
+from trading_environment.sampler import EpisodeData, EpisodeSampler
+
+ARRAYS = ("features", "xgb_prob", "ret", "starts", "ends", "dates")
+META_FILE = "meta.json"
+
+
+class SharedEpisodeData(EpisodeData):
+    """
+    EpisodeData backed by read-only memory-mapped .npy files in one directory.
+
+    Pickling sends only the directory path; unpickling re-attaches to the same
+    files. Envs handed to SubprocVecEnv workers therefore share one copy of the
+    arrays through the page cache: worker startup does not copy the dataset, and
+    total memory stays flat as workers are added.
+    """
+
+    directory: str
+
+    @classmethod
+    def create(cls, data: EpisodeData, directory: str | None = None) -> "SharedEpisodeData":
+        """Write `data` once; the returned owner (or attach(directory)) maps it."""
+        if directory is None:
+            directory = tempfile.mkdtemp(prefix="aegis-episodes-")
+        os.makedirs(directory, exist_ok=True)
+
+        for name in ARRAYS:
+            values = getattr(data, name)
+            if values is None:
+                continue
+            out = np.lib.format.open_memmap(
+                os.path.join(directory, f"{name}.npy"),
+                mode="w+",
+                dtype=values.dtype,
+                shape=values.shape,
+            )
+            out[:] = values
+            out.flush()
+            del out
+
+        meta = {"symbols": data.symbols, "feature_cols": data.feature_cols}
+        with open(os.path.join(directory, META_FILE), "w") as f:
+            json.dump(meta, f)
+        return cls.attach(directory)
+
+    @classmethod
+    def attach(cls, directory: str) -> "SharedEpisodeData":
+        with open(os.path.join(directory, META_FILE)) as f:
+            meta = json.load(f)
+
+        data = cls.__new__(cls)
+        data.directory = directory
+        data.symbols = meta["symbols"]
+        data.feature_cols = meta["feature_cols"]
+        for name in ARRAYS:
+            path = os.path.join(directory, f"{name}.npy")
+            setattr(data, name, np.load(path, mmap_mode="r") if os.path.exists(path) else None)
+        return data
+
+    def __reduce__(self):
+        return (SharedEpisodeData.attach, (self.directory,))
+
+    def unlink(self):
+        """Remove the backing files (owner only, once every worker has exited)."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def _make_env(sampler: EpisodeSampler, seed: int | None):
+    def init():
+        env = TradingEnv(sampler=sampler)
+        env.reset(seed=seed)
+        return env
+
+    return init
+
+
+def subproc_env(
+    data: SharedEpisodeData,
+    n_envs: int,
+    seed: int | None = None,
+    start_method: str = "spawn",
+    **sampler_kwargs,
+) -> SubprocVecEnv:
+    """
+    SubprocVecEnv of sampled TradingEnvs over shared data: one process per env,
+    each attaching to the same memory-mapped arrays. `sampler_kwargs` go to
+    EpisodeSampler (min_length, max_length, start, end, symbols).
+    """
+    sampler = EpisodeSampler(data, **sampler_kwargs)
+    fns = [_make_env(sampler, None if seed is None else seed + i) for i in range(n_envs)]
+    return SubprocVecEnv(fns, start_method=start_method)
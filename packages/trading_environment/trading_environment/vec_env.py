@@ -0,0 +1,155 @@
+import numpy as np
+from gymnasium import spaces
+from stable_baselines3.common.vec_env.base_vec_env import VecEnv
+
+from trading_environment.env import POSITIONS
+from trading_environment.sampler import EpisodeData, EpisodeSampler
+
+POSITION_ARRAY = np.array(POSITIONS, dtype=np.int64)
+# Per-episode TradingEnv attributes -> the VecTradingEnv array holding them
+EPISODE_ATTRS = {"position": "positions", "current_step": "steps", "_stop": "stops"}
+
+
+class VecTradingEnv(VecEnv):
+    """
+    Natively batched TradingEnv implementing the Stable-Baselines3 VecEnv API.
+
+    All episodes share one EpisodeData (contiguous features, xgb_prob, ret_1d of
+    one or more symbols). Each of the `n_envs` episodes is a step index, a stop
+    bar and a position, so step_wait() advances all of them with array
+    operations: observation gather, reward, termination and auto-reset.
+    Observations, rewards and done flags of a single episode match TradingEnv
+    step for step.
+
+    Without a sampler env i replays symbol i % n_symbols from its first bar. With
+    an EpisodeSampler every episode (including auto-resets) is a fresh short
+    window drawn inside the sampler's split, from a generator seeded by seed().
+
+    get_attr/set_attr/env_method act per env index like on a DummyVecEnv of
+    TradingEnvs: position, current_step, _stop and symbol are per episode (steps
+    are rows of the shared EpisodeData, as for a sampled TradingEnv) and
+    env_method supports "reset" and "render". Anything else is shared by all
+    envs; setting it on a subset of them raises NotImplementedError.
+    """
+
+    def __init__(
+        self,
+        data,
+        feature_cols=None,
+        n_envs: int = 8,
+        sampler: EpisodeSampler | None = None,
+        seed: int | None = None,
+    ):
+        if sampler is not None:
+            data = sampler.data
+        elif not isinstance(data, EpisodeData):
+            data = EpisodeData(data, feature_cols)
+        if len(data) and (data.ends - data.starts).min() < 3:
+            raise ValueError("Each symbol needs at least 3 rows (obs, action, t+1 return)")
+        self.data = data
+        self.sampler = sampler
+        self.feature_cols = data.feature_cols
+        self.render_mode = None
+
+        n_obs = len(self.feature_cols) + 2
+        observation_space = spaces.Box(low=-10.0, high=10.0, shape=(n_obs,), dtype=np.float32)
+        super().__init__(n_envs, observation_space, spaces.Discrete(3))
+
+        self.n_features = n_obs
+        self.commission = 0.001  # 0.1% per side (fixed), as in TradingEnv
+
+        self.segments = np.arange(n_envs) % len(data.symbols)
+        self.steps = data.starts[self.segments].copy()
+        self.stops = data.ends[self.segments].copy()
+        self.positions = np.zeros(n_envs, dtype=np.int64)
+        self.actions = np.zeros(n_envs, dtype=np.int64)
+        self._rng = np.random.default_rng(seed)
+
+    # ==================================================
+    # BATCHED INTERNALS
+    # ==================================================
+    def _start(self, envs: np.ndarray):
+        if self.sampler is None:
+            self.steps[envs] = self.data.starts[self.segments[envs]]
+            self.stops[envs] = self.data.ends[self.segments[envs]]
+        else:
+            segments, starts, stops = self.sampler.sample(self._rng, len(envs))
+            self.segments[envs], self.steps[envs], self.stops[envs] = segments, starts, stops
+        self.positions[envs] = 0
+
+    def _observe(self) -> np.ndarray:
+        n = len(self.feature_cols)
+        obs = np.empty((self.num_envs, self.n_features), dtype=np.float32)
+        obs[:, :n] = self.data.features[self.steps]
+        obs[:, n] = self.data.xgb_prob[self.steps]
+        obs[:, n + 1] = self.positions
+        return obs
+
+    # ==================================================
+    # VECENV API
+    # ==================================================
+    def reset(self):
+        if self._seeds[0] is not None:
+            self._rng = np.random.default_rng(self._seeds[0])
+        self._reset_seeds()
+
+        self._start(np.arange(self.num_envs))
+        self.reset_infos = [{} for _ in range(self.num_envs)]
+        return self._observe()
+
+    def step_async(self, actions: np.ndarray):
+        self.actions = np.asarray(actions, dtype=np.int64).reshape(self.num_envs)
+
+    def step_wait(self):
+        new_positions = POSITION_ARRAY[self.actions]
+        costs = np.where(new_positions != self.positions, self.commission, 0)
+        rewards = (new_positions * self.data.ret[self.steps + 1] - costs).astype(np.float32)
+
+        self.positions = new_positions
+        self.steps = self.steps + 1
+        dones = self.steps >= self.stops - 2  # buffer for t+1 return
+
+        infos = [{"TimeLimit.truncated": False} for _ in range(self.num_envs)]
+        finished = np.flatnonzero(dones)
+        if len(finished):
+            # TradingEnv returns a zero observation on the final step
+            terminal = np.zeros(self.n_features, dtype=np.float32)
+            for i in finished:
+                infos[i]["terminal_observation"] = terminal.copy()
+            self._start(finished)
+
+        return self._observe(), rewards, dones, infos
+
+    def close(self):
+        pass
+
+    def get_attr(self, attr_name, indices=None):
+        envs = list(self._get_indices(indices))
+        if attr_name in EPISODE_ATTRS:
+            values = getattr(self, EPISODE_ATTRS[attr_name])
+            return [int(values[i]) for i in envs]
+        if attr_name == "symbol":
+            return [self.data.symbols[self.segments[i]] for i in envs]
+        return [getattr(self, attr_name) for _ in envs]
+
+    def set_attr(self, attr_name, value, indices=None):
+        envs = list(self._get_indices(indices))
+        if attr_name in EPISODE_ATTRS:
+            getattr(self, EPISODE_ATTRS[attr_name])[envs] = value
+        elif sorted(envs) == list(range(self.num_envs)):
+            setattr(self, attr_name, value)
+        else:
+            raise NotImplementedError(f"'{attr_name}' is shared by all envs of a VecTradingEnv")
+
+    def env_method(self, method_name, *method_args, indices=None, **method_kwargs):
+        envs = np.array(list(self._get_indices(indices)), dtype=np.int64)
+        if method_name == "reset":
+            self._start(envs)
+            obs = self._observe()
+            return [(obs[i], {}) for i in envs]
+        if method_name == "render":
+            return [None for _ in envs]
+        raise NotImplementedError(f"VecTradingEnv does not support env_method('{method_name}')")
+
+    def env_is_wrapped(self, wrapper_class, indices=None):
+        return [False for _ in self._get_indices(indices)]
@@ -1,49 +1,157 @@
+import argparse
 import os
+
 import pandas as pd
+from core_utils.intervals import SUPPORTED_INTERVALS
+from data_ingestor.cache import CachedSource
 from data_ingestor.ingestor import DataIngestor
-
+from data_ingestor.sources import SOURCES, get_source
+from data_ingestor.store import MarketDataStore, dataset_name
+from data_ingestor.synthetic import synthetic_symbols
 
 # CONFIG
 SYMBOLS = ["RELIANCE.NS", "TCS.NS"]
 DATA_DIR = "data"
+STORE_DIR = os.path.join(DATA_DIR, "store")
+COMPACT_SCHEMA = True  # float32 features, int32 volume, categorical symbol
 START_DATE = "2020-01-01"
+INTERVAL = "1d"
+MAX_WORKERS = 8  # concurrent downloads
+RATE_LIMIT = 4.0  # max requests per second against the source
+CACHE_DIR = os.path.join(DATA_DIR, "cache", "raw")
+CACHE_MAX_BYTES = 2 * 1024**3  # LRU eviction above this size
+CACHE_RECENT_TTL = 6 * 3600  # seconds before the still-open period is re-downloaded
+OVERLAP_DAYS = 7  # stored history re-fetched on each incremental run to detect restatements
+
+parser = argparse.ArgumentParser(description="Download OHLCV history for the symbol universe")
+parser.add_argument(
+    "--full-refresh",
+    action="store_true",
+    help=f"Ignore stored bars and re-download everything from {START_DATE}",
+)
+parser.add_argument(
+    "--source",
+    default="yfinance",
+    choices=sorted(SOURCES),
+    help="Market data provider (use 'synthetic' for offline load tests)",
+)
+parser.add_argument(
+    "--universe",
+    type=int,
+    default=None,
+    help="Synthetic source only: generate this many symbols instead of SYMBOLS",
+)
+parser.add_argument("--start-date", default=START_DATE)
+parser.add_argument(
+    "--interval",
+    default=INTERVAL,
+    choices=list(SUPPORTED_INTERVALS),
+    help="Bar size; intraday bars go to a separate dataset (e.g. historical_5m)",
+)
+parser.add_argument("--store-dir", default=STORE_DIR)
+parser.add_argument("--no-cache", action="store_true", help="Bypass the raw download cache")
+args = parser.parse_args()
+
+source = get_source(args.source)
+# Only network sources are worth caching
+if args.source == "yfinance" and not args.no_cache:
+    source = CachedSource(
+        source,
+        cache_dir=CACHE_DIR,
+        max_bytes=CACHE_MAX_BYTES,
+        recent_ttl=CACHE_RECENT_TTL,
+    )
+symbols = SYMBOLS
+if args.source == "synthetic" and args.universe:
+    symbols = synthetic_symbols(args.universe)
+# Only throttle real network sources
+rate_limit = RATE_LIMIT if args.source == "yfinance" else None
+dataset = dataset_name("historical", args.interval)
 
 os.makedirs(DATA_DIR, exist_ok=True)
+store = MarketDataStore(root=args.store_dir, legacy_dir=DATA_DIR, compact=COMPACT_SCHEMA)
 
 print("=== RUNNING DATA INGESTION (FINAL) ===")
 
+# --------------------------------------------------
+# INCREMENTAL START POINTS
+# Re-fetch the last OVERLAP_DAYS of stored bars: they are checked against what
+# is already on disk, and the last stored (possibly partial) bar is replaced.
+# --------------------------------------------------
+start_dates = {}
+if not args.full_refresh:
+    for symbol in symbols:
+        last_ts = store.last_timestamp(dataset, symbol)
+        if last_ts is not None:
+            start_dates[symbol] = (last_ts - pd.Timedelta(days=OVERLAP_DAYS)).strftime("%Y-%m-%d")
+
+print(f"Mode: {'FULL REFRESH' if args.full_refresh else 'INCREMENTAL'} | Source: {args.source}")
+
+# Cached closed ranges never expire: drop them so a full refresh re-downloads everything
+if args.full_refresh and isinstance(source, CachedSource):
+    for symbol in symbols:
+        source.invalidate(symbol)
+
 ingestor = DataIngestor(
-    symbols=SYMBOLS,
-    start_date=START_DATE
+    symbols=symbols,
+    start_date=args.start_date,
+    source=source,
+    interval=args.interval,
+    max_workers=MAX_WORKERS,
+    rate_limit=rate_limit,
 )
 
-data = ingestor.fetch_historical()
+report = ingestor.fetch_report(start_dates=start_dates)
+
+print(f"Fetched {len(report.successes)}/{len(symbols)} symbols in {report.wall_time:.1f}s")
+for symbol, error in report.failures.items():
+    print(f"FAILED {symbol}: {error}")
 
-for symbol, df in data.items():
+# --------------------------------------------------
+# PERSIST
+# --------------------------------------------------
+restated = []
 
-    # ENFORCE CANONICAL SCHEMA
-    
-    df = df.rename(columns={
-        "Open": "open",
-        "High": "high",
-        "Low": "low",
-        "Close": "close",
-        "Volume": "volume"
-    })
+for symbol, df in report.successes.items():
+    if symbol not in start_dates:
+        store.write(dataset, df)
+        print(f"Saved {dataset}/{symbol} | Rows: {len(df)}")
+        continue
 
-    # Keep only required columns
-    df = df[["open", "high", "low", "close", "volume"]]
+    try:
+        n_new = store.append(dataset, df)[symbol]
+        print(f"Appended {dataset}/{symbol} | New rows: {n_new}")
+    except ValueError as e:
+        print(f"WARNING: {symbol}: {e}. Scheduling full refresh.")
+        restated.append(symbol)
 
-    # Enforce datetime index
-    df.index = pd.to_datetime(df.index)
-    df = df.sort_index()
+# History was restated upstream (split/dividend/correction): rebuild those symbols.
+# Their cached closed ranges hold the old history, so drop them first.
+if restated:
+    if isinstance(source, CachedSource):
+        for symbol in restated:
+            source.invalidate(symbol)
 
-    # Add symbol column
-    df["symbol"] = symbol
+    refresh = DataIngestor(
+        symbols=restated,
+        start_date=args.start_date,
+        source=source,
+        interval=args.interval,
+        max_workers=MAX_WORKERS,
+        rate_limit=rate_limit,
+    ).fetch_report()
 
-    out_path = os.path.join(DATA_DIR, f"{symbol}_historical.parquet")
-    df.to_parquet(out_path)
+    for symbol, df in refresh.successes.items():
+        store.write(dataset, df)
+        print(f"Rebuilt {dataset}/{symbol} | Rows: {len(df)}")
 
-    print(f"Saved {symbol}_historical.parquet | Rows: {len(df)}")
+if isinstance(source, CachedSource):
+    source.flush()
+    stats = source.stats()
+    print(
+        f"Raw cache: {stats['hits']} hits / {stats['misses']} misses "
+        f"({stats['expired']} expired, {stats['evictions']} evicted) | "
+        f"{stats['entries']} entries, {stats['bytes'] / 1e6:.1f} MB",
+    )
 
 print("\nDATA INGESTION COMPLETED SUCCESSFULLY")
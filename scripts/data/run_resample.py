@@ -0,0 +1,31 @@
+import argparse
+import os
+
+from core_utils.intervals import SUPPORTED_INTERVALS
+from data_ingestor.resample import resample_store
+from data_ingestor.store import MarketDataStore, dataset_name
+
+# CONFIG
+DATA_DIR = "data"
+STORE_DIR = os.path.join(DATA_DIR, "store")
+COMPACT_SCHEMA = True  # float32 features, int32 volume, categorical symbol
+
+parser = argparse.ArgumentParser(description="Aggregate stored fine bars into coarser bars")
+parser.add_argument("--source-interval", default="1m", choices=list(SUPPORTED_INTERVALS))
+parser.add_argument("--target-interval", default="15m", choices=list(SUPPORTED_INTERVALS))
+parser.add_argument("--store-dir", default=STORE_DIR)
+parser.add_argument("--symbols", nargs="*", default=None, help="Default: every stored symbol")
+args = parser.parse_args()
+
+source_dataset = dataset_name("historical", args.source_interval)
+target_dataset = dataset_name("historical", args.target_interval)
+
+print(f"=== RESAMPLING {source_dataset} -> {target_dataset} ===")
+
+store = MarketDataStore(root=args.store_dir, legacy_dir=DATA_DIR, compact=COMPACT_SCHEMA)
+written = resample_store(store, source_dataset, target_dataset, args.target_interval, args.symbols)
+
+for symbol, rows in written.items():
+    print(f"Saved {target_dataset}/{symbol} | Rows: {rows}")
+
+print("\nRESAMPLING COMPLETED SUCCESSFULLY")
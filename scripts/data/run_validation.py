@@ -0,0 +1,39 @@
+import argparse
+import os
+
+from data_ingestor.store import MarketDataStore
+from data_ingestor.validation import validate_store
+
+# CONFIG
+DATA_DIR = "data"
+STORE_DIR = os.path.join(DATA_DIR, "store")
+OUTPUT_PATH = "artifacts/validation/historical_report.csv"
+BATCH_SIZE = 100  # symbols held in memory at once
+JUMP_THRESHOLD = 0.25  # |close-to-close return| flagged as an outlier
+
+parser = argparse.ArgumentParser(description="Validate stored OHLCV data for the whole universe")
+parser.add_argument("--dataset", default="historical")
+parser.add_argument("--store-dir", default=STORE_DIR)
+parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+args = parser.parse_args()
+
+print("=== RUNNING DATA VALIDATION ===")
+
+store = MarketDataStore(root=args.store_dir, legacy_dir=DATA_DIR)
+report = validate_store(
+    store,
+    dataset=args.dataset,
+    batch_size=args.batch_size,
+    jump_threshold=JUMP_THRESHOLD,
+)
+
+os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
+report.table.to_csv(OUTPUT_PATH, index=False)
+
+issues = report.issues()
+n_symbols = report.table["symbol"].nunique() if not report.table.empty else 0
+print(f"Validated {n_symbols} symbols | Issues: {len(issues)}")
+if not issues.empty:
+    print(issues.groupby("check")["count"].sum().to_string())
+
+print(f"\nVALIDATION {'PASSED' if report.ok else 'COMPLETED WITH ISSUES'} -> {OUTPUT_PATH}")
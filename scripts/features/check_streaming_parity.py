@@ -0,0 +1,40 @@
+import argparse
+import os
+
+from core_utils.config import load_config
+from core_utils.intervals import SUPPORTED_INTERVALS
+from data_ingestor.store import MarketDataStore, dataset_name
+from feature_engineer.engineer import FeatureEngineer
+from feature_engineer.streaming import parity_report
+
+SYMBOLS = ["RELIANCE.NS", "TCS.NS"]
+DATA_DIR = "data"
+STORE_DIR = os.path.join(DATA_DIR, "store")
+TOLERANCE = 1e-8  # max |batch - stream| / (1 + |batch|)
+
+parser = argparse.ArgumentParser(description="Check streaming features against the batch path")
+parser.add_argument("--interval", default="1d", choices=list(SUPPORTED_INTERVALS))
+args = parser.parse_args()
+
+config = load_config()
+features = config.features
+warmup = FeatureEngineer(interval=args.interval, indicators=features.indicators).windows()[
+    "sma_short"
+]
+
+store = MarketDataStore(root=STORE_DIR, legacy_dir=DATA_DIR)
+df = store.read(dataset_name("historical", args.interval), symbols=SYMBOLS)
+if df.empty:
+    raise FileNotFoundError(f"No historical data for {SYMBOLS} in {STORE_DIR}")
+
+print("=== STREAMING vs BATCH FEATURE PARITY ===")
+report = parity_report(
+    df, args.interval, features.rolling_window, features.indicators, warmup=warmup
+)
+print(report.to_string())
+
+worst = report.max()
+if worst > TOLERANCE:
+    raise RuntimeError(f"Parity check failed: {report.idxmax()} differs by {worst:.3e}")
+
+print(f"\nPARITY OK (max diff {worst:.3e})")
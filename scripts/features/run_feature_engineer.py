@@ -1,90 +1,89 @@
+import argparse
 import os
+import time
 
-import pandas as pd
-from feature_engineer.engineer import FeatureEngineer
+from core_utils.intervals import SUPPORTED_INTERVALS
+from feature_engineer.chunked import run_chunked
+from feature_engineer.store import FeatureStore
 
 SYMBOLS = ["RELIANCE.NS", "TCS.NS"]
 DATA_DIR = "data"
+STORE_DIR = os.path.join(DATA_DIR, "store")
+COMPACT_SCHEMA = True  # float32 features, int32 volume, categorical symbol
+INTERVAL = "1d"
+MAX_WORKERS = os.cpu_count() or 1
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Compute rolling z-score features per symbol")
+    parser.add_argument("--interval", default=INTERVAL, choices=list(SUPPORTED_INTERVALS))
+    parser.add_argument("--symbols", nargs="*", default=SYMBOLS)
+    parser.add_argument(
+        "--workers", type=int, default=MAX_WORKERS, help="Processes (1 = run in this process)"
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="Recompute even when stored features are current"
+    )
+    parser.add_argument(
+        "--chunk-freq",
+        default=None,
+        help="Out-of-core mode: stream history in periods of this pandas offset (e.g. YS, MS)",
+    )
+    args = parser.parse_args()
 
-engineer = FeatureEngineer()
-print("=== RUNNING FEATURE ENGINEERING (FINAL, MULTIINDEX-SAFE) ===")
-
-for symbol in SYMBOLS:
-    hist_path = os.path.join(DATA_DIR, f"{symbol}_historical.parquet")
-    out_path = os.path.join(DATA_DIR, f"{symbol}_processed.parquet")
-
-    if not os.path.exists(hist_path):
-        raise FileNotFoundError(f"Missing historical file: {hist_path}")
+    features = FeatureStore.from_config(
+        args.interval, root=STORE_DIR, legacy_dir=DATA_DIR, compact=COMPACT_SCHEMA
+    )
+    print("=== RUNNING FEATURE ENGINEERING (FINAL, MULTIINDEX-SAFE) ===")
+    print(f"Symbols: {len(args.symbols)} | Workers: {min(args.workers, len(args.symbols))}")
 
-    print(f"\nProcessing {symbol}...")
+    if args.chunk_freq:
+        run_chunked_mode(features, args.symbols, args.chunk_freq)
+        return
 
     # --------------------------------------------------
-    # LOAD
+    # LOAD -> CANONICALIZE -> FEATURES -> SAVE
+    # (skips current symbols, appends extended ones, recomputes the rest in parallel)
     # --------------------------------------------------
-    df = pd.read_parquet(hist_path)
+    report = features.refresh(args.symbols, max_workers=args.workers, force=args.force)
 
     # --------------------------------------------------
-    # FLATTEN YFINANCE MULTIINDEX (CRITICAL FIX)
+    # SUMMARY
     # --------------------------------------------------
-    if isinstance(df.columns, pd.MultiIndex):
-        df.columns = [c[0] for c in df.columns]
+    print("\n" + report.summary().to_string(index=False))
+    print(f"\nWall time: {report.wall_time:.2f}s")
 
-    # --------------------------------------------------
-    # CANONICALIZE COLUMN NAMES
-    # --------------------------------------------------
-    df = df.rename(
-        columns={
-            "Open": "open",
-            "High": "high",
-            "Low": "low",
-            "Close": "close",
-            "Volume": "volume",
-        }
-    )
+    if report.failures:
+        raise RuntimeError(f"Feature engineering failed for: {sorted(report.failures)}")
 
-    # --------------------------------------------------
-    # REMOVE DUPLICATE COLUMNS
-    # --------------------------------------------------
-    df = df.loc[:, ~df.columns.duplicated()].copy()
+    print("\nFEATURE ENGINEERING COMPLETED SUCCESSFULLY")
 
-    # --------------------------------------------------
-    # ENFORCE REQUIRED SCHEMA
-    # --------------------------------------------------
-    required = {"open", "high", "low", "close", "volume"}
-    missing = required - set(df.columns)
-    if missing:
-        raise ValueError(f"Missing OHLCV columns in {symbol}: {missing}")
 
+def run_chunked_mode(features: FeatureStore, symbols: list[str], freq: str):
     # --------------------------------------------------
-    # INDEX SANITY
+    # STREAM PERIODS -> FEATURES -> APPEND (bounded memory, single process)
     # --------------------------------------------------
-    if isinstance(df.index, pd.MultiIndex):
-        df = df.reset_index(level=0, drop=True)
-
-    df.index = pd.to_datetime(df.index)
-    df = df.sort_index()
+    t0 = time.perf_counter()
+    rows = run_chunked(
+        symbols,
+        features.store,
+        features.source_dataset,
+        features.target_dataset,
+        features.engineer,
+        freq=freq,
+    )
+    features.record(rows)
 
-    # --------------------------------------------------
-    # SYMBOL COLUMN
-    # --------------------------------------------------
-    df["symbol"] = symbol
+    for symbol in symbols:
+        print(f"{symbol}: {rows.get(symbol, 0)} rows")
+    print(f"\nWall time: {time.perf_counter() - t0:.2f}s")
 
-    # --------------------------------------------------
-    # FEATURE ENGINEERING
-    # --------------------------------------------------
-    df_feat = engineer.calculate_features(df)
-    df_final = engineer.normalize_continuous(df_feat)
+    missing = [s for s in symbols if s not in rows]
+    if missing:
+        raise RuntimeError(f"Feature engineering failed for: {missing}")
 
-    # --------------------------------------------------
-    # FINAL SANITY CHECK
-    # --------------------------------------------------
-    if df_final.tail(30).isnull().any().any():
-        raise RuntimeError("NaNs detected in recent rows")
+    print("\nFEATURE ENGINEERING COMPLETED SUCCESSFULLY")
 
-    # --------------------------------------------------
-    # SAVE
-    # --------------------------------------------------
-    df_final.to_parquet(out_path)
-    print(f"Saved {symbol}_processed.parquet | Shape: {df_final.shape}")
 
-print("\nFEATURE ENGINEERING COMPLETED SUCCESSFULLY")
+if __name__ == "__main__":
+    run()
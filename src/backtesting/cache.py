@@ -0,0 +1,144 @@
+import fcntl
+import hashlib
+import json
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+CACHE_DIR = "artifacts/backtests/cache"
+MAX_ENTRIES = 32  # least recently used entries beyond this are evicted
+MANIFEST = "_manifest.json"
+LOCK_FILE = "_manifest.lock"  # flock target; persists, the kernel drops dead holders' locks
+
+
+def file_hash(path: str) -> str:
+    """Content hash of a file ("missing" if it does not exist)."""
+    if not os.path.exists(path):
+        return "missing"
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """Hash of a frame's columns, index and values."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps([str(c) for c in df.columns]).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()[:16]
+
+
+class BacktestCache:
+    """
+    Persistent backtest results: one parquet file per key plus a JSON manifest
+    holding each entry's metrics, parameters and last use.
+
+    The key hashes the files a result depends on (model artifacts, and the code
+    that produced it), the input frame and the backtest parameters, so any change
+    to one of them misses. Entries beyond max_entries are evicted least recently
+    used first. Manifest updates hold an exclusive flock on _manifest.lock, so
+    concurrent runs (a backtest next to the dashboard) never drop each other's
+    entries.
+    """
+
+    def __init__(self, root: str = CACHE_DIR, max_entries: int = MAX_ENTRIES):
+        self.root = root
+        self.max_entries = max_entries
+        self.manifest_path = os.path.join(root, MANIFEST)
+        self.lock_path = os.path.join(root, LOCK_FILE)
+
+    @staticmethod
+    def key(files: list[str], data: pd.DataFrame, params: dict) -> str:
+        parts = {
+            "files": {path: file_hash(path) for path in files},
+            "data": frame_fingerprint(data),
+            "params": params,
+        }
+        raw = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, f"{key}.parquet")
+
+    @contextmanager
+    def _locked(self):
+        """Exclusive access to the manifest across processes and threads (flock)."""
+        os.makedirs(self.root, exist_ok=True)
+        fd = os.open(self.lock_path, os.O_CREAT | os.O_WRONLY)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)  # releases the lock
+
+    def _load_manifest(self) -> dict:
+        if not os.path.exists(self.manifest_path):
+            return {}
+        try:
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self, manifest: dict):
+        os.makedirs(self.root, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.root, prefix=".", suffix=".json")
+        with os.fdopen(fd, "w") as f:
+            json.dump(manifest, f, indent=2, default=str)
+        os.replace(tmp, self.manifest_path)
+
+    def get(self, key: str) -> tuple[pd.DataFrame, dict] | None:
+        """(results, metrics) stored under key, or None."""
+        if key not in self._load_manifest() or not os.path.exists(self._path(key)):
+            return None
+        try:
+            results = pd.read_parquet(self._path(key))
+        except (OSError, ValueError):
+            return None
+
+        with self._locked():
+            manifest = self._load_manifest()
+            if key not in manifest:  # evicted meanwhile
+                return None
+            manifest[key]["used"] = time.time()
+            self._save_manifest(manifest)
+        return results, manifest[key]["metrics"]
+
+    def put(self, key: str, results: pd.DataFrame, metrics: dict | None = None, params=None):
+        os.makedirs(self.root, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.root, prefix=".", suffix=".parquet")
+        os.close(fd)
+        results.to_parquet(tmp, index=False)
+        os.replace(tmp, self._path(key))
+
+        with self._locked():
+            manifest = self._load_manifest()
+            now = time.time()
+            manifest[key] = {
+                "created": now,
+                "used": now,
+                "rows": len(results),
+                "params": params or {},
+                "metrics": metrics or {},
+            }
+            self._evict(manifest)
+            self._save_manifest(manifest)
+
+    def _evict(self, manifest: dict):
+        by_use = sorted(manifest, key=lambda k: manifest[k]["used"], reverse=True)
+        for key in by_use[self.max_entries :]:
+            del manifest[key]
+            if os.path.exists(self._path(key)):
+                os.remove(self._path(key))
+
+    def clear(self):
+        with self._locked():
+            for key in self._load_manifest():
+                if os.path.exists(self._path(key)):
+                    os.remove(self._path(key))
+            self._save_manifest({})
@@ -0,0 +1,82 @@
+import numpy as np
+from trading_environment.env import POSITIONS, TradingEnv
+
+ENGINES = ("batched", "loop")
+BATCH_SIZE = 4096  # observations per policy forward pass
+
+
+def action_tables(model, env: TradingEnv, xgb_prob, batch_size: int = BATCH_SIZE) -> np.ndarray:
+    """
+    Deterministic policy action for every bar and every previous position.
+
+    The observation at bar t depends on past decisions only through the current
+    position, which is one of POSITIONS. Column j holds the action taken at each
+    bar when the position is POSITIONS[j]: three batched forward passes in place
+    of one per bar.
+    """
+    xgb_prob = np.asarray(xgb_prob)
+    n = len(xgb_prob)
+    table = np.empty((n, len(POSITIONS)), dtype=np.int64)
+    for j, position in enumerate(POSITIONS):
+        for lo in range(0, n, batch_size):
+            idx = np.arange(lo, min(lo + batch_size, n))
+            obs = env.get_observations(idx, position, xgb_prob[idx])
+            table[idx, j], _ = model.predict(obs, deterministic=True)
+    return table
+
+
+def scan_positions(table: np.ndarray, initial_position: int = 0) -> np.ndarray:
+    """Walk the action table from `initial_position`; returns the position held after each bar."""
+    # Action a moves to POSITIONS[a], which is also that position's table column
+    column = POSITIONS.index(initial_position)
+    actions = []
+    for row in table.tolist():
+        column = row[column]
+        actions.append(column)
+    return np.array(POSITIONS, dtype=np.int64)[actions]
+
+
+def loop_positions(model, env: TradingEnv, xgb_prob, initial_position: int = 0) -> np.ndarray:
+    """Reference engine: one observation and one policy call per bar."""
+    positions = np.empty(len(xgb_prob), dtype=np.int64)
+    prev_position = initial_position
+    for t in range(len(xgb_prob)):
+        obs = env.get_observation(t, prev_position, xgb_prob[t])
+        ppo_act, _ = model.predict(obs, deterministic=True)
+        prev_position = POSITIONS[int(ppo_act)]
+        positions[t] = prev_position
+    return positions
+
+
+def policy_positions(model, env: TradingEnv, xgb_prob, engine: str = "batched") -> np.ndarray:
+    """Positions the policy holds after bars 0..len(xgb_prob)-1, starting flat."""
+    if engine == "batched":
+        return scan_positions(action_tables(model, env, xgb_prob))
+    if engine == "loop":
+        return loop_positions(model, env, xgb_prob)
+    raise ValueError(f"Unknown engine '{engine}'. Use one of {ENGINES}")
+
+
+def check_parity(model, env: TradingEnv, xgb_prob) -> np.ndarray:
+    """Run both engines; returns batched positions, raises if any bar differs."""
+    batched = policy_positions(model, env, xgb_prob, "batched")
+    loop = policy_positions(model, env, xgb_prob, "loop")
+    mismatched = np.flatnonzero(batched != loop)
+    if len(mismatched):
+        raise RuntimeError(
+            f"Batched and per-step engines disagree on {len(mismatched)} bars "
+            f"(first at bar {mismatched[0]})"
+        )
+    return batched
+
+
+def simulate(positions: np.ndarray, next_ret: np.ndarray, commission: float):
+    """
+    Per-bar pnl and compounded equity of holding `positions[t]` over the return
+    of bar t + 1, paying `commission` whenever the position changes (from flat).
+    """
+    prev = np.concatenate([[0], positions[:-1]])
+    costs = np.where(positions != prev, commission, 0.0)
+    pnl = positions * next_ret - costs
+    equity = np.cumprod(1 + pnl)
+    return pnl, equity
@@ -0,0 +1,156 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from feature_engineer.panel import Panel
+from trading_environment.env import POSITIONS, TradingEnv
+
+from src.backtesting.engine import action_tables
+
+ALLOCATIONS = ("equal", "active")
+POSITION_ARRAY = np.array(POSITIONS, dtype=np.int64)
+
+
+@dataclass
+class PortfolioResult:
+    """(dates x symbols) positions and weights, plus per-date portfolio accounting."""
+
+    dates: pd.DatetimeIndex
+    symbols: pd.Index
+    positions: np.ndarray  # -1/0/+1 held after each bar
+    weights: np.ndarray  # signed fraction of equity held after each bar
+    contributions: np.ndarray  # per-symbol pnl earned over the next bar, net of costs
+    pnl: np.ndarray
+    equity: np.ndarray
+    turnover: np.ndarray  # sum |weight change| per date
+
+    def frame(self) -> pd.DataFrame:
+        """One row per date: equity, pnl, drawdown, gross/net exposure and turnover."""
+        out = pd.DataFrame(
+            {
+                "equity": self.equity,
+                "pnl": self.pnl,
+                "gross": np.abs(self.weights).sum(axis=1),
+                "net": self.weights.sum(axis=1),
+                "turnover": self.turnover,
+            },
+            index=self.dates,
+        )
+        out.insert(2, "drawdown", out["equity"] / out["equity"].cummax() - 1)
+        return out
+
+    def attribution(self) -> pd.DataFrame:
+        """One row per symbol: summed pnl contribution, trades, exposure and hit rate."""
+        held = self.positions != 0
+        changed = self.positions != np.vstack(
+            [np.zeros_like(self.positions[:1]), self.positions[:-1]]
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            hit_rate = ((self.contributions > 0) & held).sum(axis=0) / held.sum(axis=0)
+        return pd.DataFrame(
+            {
+                "contribution": self.contributions.sum(axis=0),
+                "trades": changed.sum(axis=0),
+                "exposure": held.mean(axis=0),
+                "hit_rate": hit_rate,
+            },
+            index=self.symbols,
+        )
+
+
+def scan_panel(tables: np.ndarray, decide: np.ndarray, initial_position: int = 0) -> np.ndarray:
+    """
+    engine.scan_positions for every symbol at once: tables is (dates x symbols x 3),
+    one step per date across all symbols. Where decide is False the symbol keeps
+    its position (no bar, or its last bar).
+    """
+    n_dates, n_symbols, _ = tables.shape
+    column = np.full(n_symbols, POSITIONS.index(initial_position))
+    columns = np.empty((n_dates, n_symbols), dtype=np.int64)
+    symbols = np.arange(n_symbols)
+    for t in range(n_dates):
+        column = np.where(decide[t], tables[t, symbols, column], column)
+        columns[t] = column
+    return POSITION_ARRAY[columns]
+
+
+def panel_positions(model, booster: xgb.Booster, df: pd.DataFrame, feature_cols) -> tuple:
+    """
+    Run the XGB + PPO stack over a long frame (DatetimeIndex, `symbol` column) of
+    many symbols. Inference is batched over all rows of all symbols; only the
+    position scan steps through dates. Returns (panel, positions, live).
+    """
+    xgb_prob = booster.predict(xgb.DMatrix(df[feature_cols]))
+    frame = df[feature_cols].reset_index(drop=True).assign(xgb_prob=xgb_prob)
+    rows = action_tables(model, TradingEnv(frame, feature_cols), xgb_prob)
+
+    panel = Panel(df, ["ret_1d"])
+    tables = np.zeros(panel.shape + (len(POSITIONS),), dtype=np.int64)
+    tables[panel.rows] = rows
+
+    # A symbol trades from its first bar to its last; its last bar has no next return
+    t = np.arange(panel.shape[0])[:, None]
+    first = panel.mask.argmax(axis=0)
+    last = panel.shape[0] - 1 - panel.mask[::-1].argmax(axis=0)
+    live = (t >= first) & (t <= last)
+    positions = scan_panel(tables, panel.mask & (t < last))
+    return panel, np.where(live, positions, 0), live
+
+
+def allocate(
+    positions: np.ndarray,
+    live: np.ndarray,
+    allocation: str = "equal",
+    leverage_cap: float = 1.0,
+) -> np.ndarray:
+    """
+    Signed weights from positions. "equal" gives every live symbol 1/N of equity
+    (flat symbols leave theirs in cash); "active" splits leverage_cap across the
+    symbols holding a position. Dates whose gross exposure exceeds leverage_cap
+    are scaled down to it.
+    """
+    if allocation not in ALLOCATIONS:
+        raise ValueError(f"Unknown allocation '{allocation}'. Use one of {ALLOCATIONS}")
+
+    n = (live if allocation == "equal" else positions != 0).sum(axis=1, keepdims=True)
+    budget = 1.0 if allocation == "equal" else leverage_cap
+    with np.errstate(divide="ignore", invalid="ignore"):
+        weights = np.where(n > 0, positions * budget / n, 0.0)
+        gross = np.abs(weights).sum(axis=1, keepdims=True)
+        return weights * np.where(gross > leverage_cap, leverage_cap / gross, 1.0)
+
+
+def account(
+    panel: Panel,
+    positions: np.ndarray,
+    weights: np.ndarray,
+    commission: float = 0.001,
+) -> PortfolioResult:
+    """
+    Portfolio accounting on (dates x symbols) arrays. Weights held after date t
+    earn each symbol's next bar return (a symbol without a bar keeps its weight
+    until its next bar, whose ret_1d spans the gap). A position change pays
+    `commission` on the symbol's allocated capital, as in the single-symbol
+    backtest.
+    """
+    ret = np.nan_to_num(panel["ret_1d"], nan=0.0)
+    next_ret = np.vstack([ret[1:], np.zeros_like(ret[:1])])
+
+    prev_positions = np.vstack([np.zeros_like(positions[:1]), positions[:-1]])
+    prev_weights = np.vstack([np.zeros_like(weights[:1]), weights[:-1]])
+    capital = np.abs(np.where(positions != 0, weights, prev_weights))
+    costs = np.where(positions != prev_positions, commission * capital, 0.0)
+
+    contributions = weights * next_ret - costs
+    pnl = contributions.sum(axis=1)
+    return PortfolioResult(
+        dates=panel.dates,
+        symbols=panel.symbols,
+        positions=positions,
+        weights=weights,
+        contributions=contributions,
+        pnl=pnl,
+        equity=np.cumprod(1 + pnl),
+        turnover=np.abs(weights - prev_weights).sum(axis=1),
+    )
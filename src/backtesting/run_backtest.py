@@ -2,117 +2,176 @@ import os
 
 import numpy as np
 import pandas as pd
-import xgboost as xgb
-from stable_baselines3 import PPO
+import trading_environment.env
+from core_utils.config import load_config
+from core_utils.intervals import periods_per_year
+from data_ingestor.store import MarketDataStore, dataset_name
+from feature_engineer.store import FeatureStore
 from trading_environment.env import TradingEnv
 
+import src.backtesting.engine
+import src.backtesting.splits
+from src.backtesting.cache import BacktestCache
+from src.backtesting.engine import check_parity, policy_positions, simulate
+from src.backtesting.splits import meta_policy_split, period_labels
+
 # ==================================================
 # CONFIG
 # ==================================================
-DATA_PATH = "data/RELIANCE.NS_processed.parquet"
+SYMBOL = "RELIANCE.NS"
+INTERVAL = "1d"
+ANN_FACTOR = periods_per_year(INTERVAL)  # bars per year
+START_DATE = None  # optional date slice (inclusive), e.g. "2024-01-01"
+END_DATE = None  # optional date slice (exclusive)
 XGB_PATH = "artifacts/xgb/xgb_directional.json"
 PPO_PATH = "artifacts/ppo/ppo_meta_policy"
 OUTPUT_PATH = "artifacts/backtests/meta_policy_results.csv"
 
 COMMISSION = 0.001  # 0.1% per trade
+ENGINE = "batched"  # "batched" (per-position action tables) or "loop" (per-step reference)
+PARITY_CHECK = False  # run both engines and fail if any position differs
+USE_CACHE = True  # reuse results while models, code, data and parameters are unchanged
+PERIODS = ["IS_XGB_TRAIN", "IS_PPO_TRAIN", "OOS_TEST"]
 
 print("=== RUNNING META-POLICY BACKTEST ===")
 
 # ==================================================
 # LOAD DATA & PRECOMPUTE XGB
 # ==================================================
-df = pd.read_parquet(DATA_PATH).reset_index(drop=True)
-
-feature_cols = [
-    "ret_1d_z",
-    "ret_5d_z",
-    "sma_20_z",
-    "sma_50_z",
-    "rsi_z",
-    "macd_z",
-    "macd_signal_z",
-    "bb_width_z",
-    "vol_sma_z",
-    "vol_ratio_z",
-    "trend_sma",
-]
+feature_cols = load_config().features.model_columns()
+
+if FeatureStore.from_config(INTERVAL).stale([SYMBOL]):
+    print(f"WARNING: stored features for {SYMBOL} are stale; rerun run_feature_engineer.py")
+
+df = (
+    MarketDataStore()
+    .read(
+        dataset_name("processed", INTERVAL),
+        symbols=[SYMBOL],
+        start=START_DATE,
+        end=END_DATE,
+        columns=feature_cols + ["ret_1d"],
+    )
+    .reset_index(drop=True)
+)
 
 # Clean data
 df = df[np.isfinite(df[feature_cols]).all(axis=1)].reset_index(drop=True)
 
-# LOAD XGB
-booster = xgb.Booster()
-booster.load_model(XGB_PATH)
-
-# PRECOMPUTE PROBABILITIES
-dmat = xgb.DMatrix(df[feature_cols])
-df["xgb_prob"] = booster.predict(dmat)
-
-# ==================================================
-# LOAD PPO META-POLICY
-# ==================================================
-env = TradingEnv(df)
-model = PPO.load(PPO_PATH, env=env, device="cpu")
-
-# ==================================================
-# MAIN BACKTEST LOOP
-# ==================================================
-results = []
-current_equity = 1.0
-prev_position = 0
-
-# Split points
-split_1 = int(len(df) * 0.6)
-split_2 = int(len(df) * 0.8)
-
-for t in range(len(df) - 1):
-    # --- Observation at t ---
-    obs = env.get_observation(t, prev_position, df.loc[t, "xgb_prob"])
 
-    # --- PPO Decision ---
-    ppo_act, _ = model.predict(obs, deterministic=True)
-    final_pos = {0: -1, 1: 0, 2: 1}[int(ppo_act)]
-
-    # --- Execution & Costs ---
-    cost = COMMISSION if final_pos != prev_position else 0
-
-    # --- Earn return of t+1 ---
-    next_ret = df.loc[t + 1, "ret_1d"]
-    step_pnl = (final_pos * next_ret) - cost
+def run_backtest(df: pd.DataFrame) -> pd.DataFrame:
+    # Model libraries load here, so a cache hit never imports xgboost or torch
+    import xgboost as xgb
+    from stable_baselines3 import PPO
+
+    # LOAD XGB
+    booster = xgb.Booster()
+    booster.load_model(XGB_PATH)
+
+    # PRECOMPUTE PROBABILITIES
+    df = df.copy()
+    dmat = xgb.DMatrix(df[feature_cols])
+    df["xgb_prob"] = booster.predict(dmat)
+
+    # ==================================================
+    # LOAD PPO META-POLICY
+    # ==================================================
+    env = TradingEnv(df, feature_cols)
+    model = PPO.load(PPO_PATH, env=env, device="cpu")
+
+    # ==================================================
+    # MAIN BACKTEST LOOP
+    # ==================================================
+    # Positions depend on the past only through the previous position, so the
+    # batched engine precomputes the policy's action for each bar and position
+    # and scans that table; "loop" is the one-forward-pass-per-bar reference.
+    xgb_prob = df["xgb_prob"].to_numpy()[:-1]
+    if PARITY_CHECK:
+        positions = check_parity(model, env, xgb_prob)
+        print("Parity check passed: batched and per-step engines agree on every bar")
+    else:
+        positions = policy_positions(model, env, xgb_prob, ENGINE)
 
-    # Update Equity (Compounded)
-    current_equity *= 1 + step_pnl
+    pnl, equity = simulate(positions, df["ret_1d"].to_numpy()[1:], COMMISSION)
 
-    # Track results
-    if t < split_1:
-        period = "IS_XGB_TRAIN"
-    elif t < split_2:
-        period = "IS_PPO_TRAIN"
-    else:
-        period = "OOS_TEST"
+    # Split points
+    t = np.arange(len(positions))
+    period = period_labels(meta_policy_split(len(df)), len(positions))
 
-    results.append(
+    res_df = pd.DataFrame(
         {
-            "date": df.loc[t, "date"] if "date" in df.columns else t,
-            "equity": current_equity,
-            "position": final_pos,
-            "xgb_prob": df.loc[t, "xgb_prob"],
-            "pnl": step_pnl,
+            "date": df["date"].iloc[:-1].to_numpy() if "date" in df.columns else t,
+            "equity": equity,
+            "position": positions,
+            "xgb_prob": df["xgb_prob"].iloc[:-1].to_numpy(),
+            "pnl": pnl,
             "period": period,
         }
     )
 
-    prev_position = final_pos
+    # Calculate Drawdown
+    res_df["peak"] = res_df["equity"].cummax()
+    res_df["drawdown"] = (res_df["equity"] / res_df["peak"]) - 1
+    return res_df
+
+
+def period_metrics(res_df: pd.DataFrame) -> dict:
+    metrics = {}
+    for period in PERIODS:
+        subset = res_df[res_df["period"] == period]
+        if not subset.empty:
+            pnl_std = subset["pnl"].std()
+            metrics[period] = {
+                "cum_ret": (subset["equity"].iloc[-1] / subset["equity"].iloc[0]) - 1,
+                "sharpe": (
+                    np.sqrt(ANN_FACTOR) * subset["pnl"].mean() / pnl_std if pnl_std != 0 else 0
+                ),
+                "max_drawdown": subset["drawdown"].min(),
+                "exposure": (subset["position"] != 0).mean(),
+            }
+    return metrics
+
 
 # ==================================================
-# FINALIZE
+# RESULT CACHE
 # ==================================================
-res_df = pd.DataFrame(results)
-
-# Calculate Drawdown
-res_df["peak"] = res_df["equity"].cummax()
-res_df["drawdown"] = (res_df["equity"] / res_df["peak"]) - 1
+# Keyed on the model artifacts, the code producing positions, the input bars
+# and the parameters: an unchanged rerun skips XGB and PPO inference entirely.
+cache = BacktestCache()
+cache_key = cache.key(
+    [
+        XGB_PATH,
+        PPO_PATH + ".zip",
+        __file__,
+        src.backtesting.engine.__file__,
+        src.backtesting.splits.__file__,
+        trading_environment.env.__file__,
+    ],
+    df,
+    {
+        "symbol": SYMBOL,
+        "interval": INTERVAL,
+        "start": START_DATE,
+        "end": END_DATE,
+        "commission": COMMISSION,
+        "engine": ENGINE,
+        "feature_cols": feature_cols,
+    },
+)
+
+cached = cache.get(cache_key) if USE_CACHE and not PARITY_CHECK else None
+if cached is not None:
+    res_df, metrics = cached
+    print(f"Loaded cached results ({cache_key}): models, data and parameters unchanged")
+else:
+    res_df = run_backtest(df)
+    metrics = period_metrics(res_df)
+    if USE_CACHE:
+        cache.put(cache_key, res_df, metrics, params={"script": "run_backtest", "symbol": SYMBOL})
 
+# ==================================================
+# FINALIZE
+# ==================================================
 # Save
 os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
 res_df.to_csv(OUTPUT_PATH, index=False)
@@ -120,17 +179,11 @@ res_df.to_csv(OUTPUT_PATH, index=False)
 print(f"DONE: Meta-Policy Backtest Complete. Results saved to {OUTPUT_PATH}")
 
 # Print metrics by period
-for period in ["IS_XGB_TRAIN", "IS_PPO_TRAIN", "OOS_TEST"]:
-    subset = res_df[res_df["period"] == period]
-    if not subset.empty:
-        cum_ret = (subset["equity"].iloc[-1] / subset["equity"].iloc[0]) - 1
-        pnl_std = subset["pnl"].std()
-        sharpe = np.sqrt(252) * subset["pnl"].mean() / pnl_std if pnl_std != 0 else 0
-        mdd = subset["drawdown"].min()
-        exposure = (subset["position"] != 0).mean()
-        print(
-            f"[{period}] Cum Ret: {cum_ret:.2%}, Sharpe: {sharpe:.2f}, "
-            f"MaxDD: {mdd:.2%}, Exposure: {exposure:.2%}",
-        )
+for period, m in metrics.items():
+    print(
+        f"[{period}] Cum Ret: {m['cum_ret']:.2%}, Sharpe: {m['sharpe']:.2f}, "
+        f"MaxDD: {m['max_drawdown']:.2%}, Exposure: {m['exposure']:.2%}",
+    )
 
+current_equity = res_df["equity"].iloc[-1] if len(res_df) else 1.0
 print(f"Final Equity (Overall): {current_equity:.4f}")
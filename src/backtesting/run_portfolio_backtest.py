@@ -0,0 +1,77 @@
+import os
+
+import numpy as np
+import xgboost as xgb
+from core_utils.config import load_config
+from core_utils.intervals import periods_per_year
+from data_ingestor.store import MarketDataStore, dataset_name
+from stable_baselines3 import PPO
+
+from src.backtesting.portfolio import account, allocate, panel_positions
+
+# ==================================================
+# CONFIG
+# ==================================================
+CONFIG = load_config()
+SYMBOLS = CONFIG.strategy.symbols
+INTERVAL = "1d"
+ANN_FACTOR = periods_per_year(INTERVAL)  # bars per year
+START_DATE = None  # optional date slice (inclusive)
+END_DATE = None  # optional date slice (exclusive)
+XGB_PATH = "artifacts/xgb/xgb_directional.json"
+PPO_PATH = "artifacts/ppo/ppo_meta_policy"
+OUTPUT_DIR = "artifacts/backtests"
+
+ALLOCATION = "equal"  # "equal" (1/N per live symbol) or "active" (leverage cap over open positions)
+LEVERAGE_CAP = CONFIG.risk.leverage_cap
+COMMISSION = CONFIG.strategy.commission
+
+
+def main():
+    print(f"=== RUNNING PORTFOLIO BACKTEST ({len(SYMBOLS)} symbols) ===")
+
+    # ==================================================
+    # LOAD DATA & MODELS
+    # ==================================================
+    feature_cols = CONFIG.features.model_columns()
+    df = MarketDataStore().read(
+        dataset_name("processed", INTERVAL),
+        symbols=SYMBOLS,
+        start=START_DATE,
+        end=END_DATE,
+        columns=feature_cols + ["ret_1d"],
+    )
+    df = df[np.isfinite(df[feature_cols]).all(axis=1)]
+
+    booster = xgb.Booster()
+    booster.load_model(XGB_PATH)
+    model = PPO.load(PPO_PATH, device="cpu")
+
+    # ==================================================
+    # POSITIONS, WEIGHTS, ACCOUNTING (dates x symbols)
+    # ==================================================
+    panel, positions, live = panel_positions(model, booster, df, feature_cols)
+    weights = allocate(positions, live, ALLOCATION, LEVERAGE_CAP)
+    result = account(panel, positions, weights, COMMISSION)
+
+    # ==================================================
+    # SAVE & REPORT
+    # ==================================================
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    curve, attribution = result.frame(), result.attribution()
+    curve.to_csv(os.path.join(OUTPUT_DIR, "portfolio_results.csv"), index_label="date")
+    attribution.to_csv(os.path.join(OUTPUT_DIR, "portfolio_attribution.csv"), index_label="symbol")
+    print(f"DONE: Portfolio Backtest Complete. Results saved to {OUTPUT_DIR}")
+
+    pnl_std = curve["pnl"].std()
+    sharpe = np.sqrt(ANN_FACTOR) * curve["pnl"].mean() / pnl_std if pnl_std != 0 else 0
+    print(
+        f"[PORTFOLIO] Cum Ret: {curve['equity'].iloc[-1] - 1:.2%}, Sharpe: {sharpe:.2f}, "
+        f"MaxDD: {curve['drawdown'].min():.2%}, Avg Gross: {curve['gross'].mean():.2f}, "
+        f"Avg Turnover: {curve['turnover'].mean():.3f}"
+    )
+    print(attribution.sort_values("contribution", ascending=False).head(20).to_string())
+
+
+if __name__ == "__main__":
+    main()
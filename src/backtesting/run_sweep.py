@@ -0,0 +1,86 @@
+import os
+
+import numpy as np
+import xgboost as xgb
+from core_utils.config import load_config
+from core_utils.intervals import periods_per_year
+from data_ingestor.store import MarketDataStore, dataset_name
+from stable_baselines3 import PPO
+from trading_environment.env import TradingEnv
+
+from src.backtesting.engine import policy_positions
+from src.backtesting.splits import meta_policy_split, period_labels
+from src.backtesting.sweep import cost_grid, sweep
+
+# ==================================================
+# CONFIG
+# ==================================================
+SYMBOL = "RELIANCE.NS"
+INTERVAL = "1d"
+ANN_FACTOR = periods_per_year(INTERVAL)  # bars per year
+START_DATE = None  # optional date slice (inclusive)
+END_DATE = None  # optional date slice (exclusive)
+XGB_PATH = "artifacts/xgb/xgb_directional.json"
+PPO_PATH = "artifacts/ppo/ppo_meta_policy"
+OUTPUT_PATH = "artifacts/backtests/cost_sensitivity.csv"
+
+STRATEGY = load_config().strategy
+COMMISSIONS = (0.0, 0.0005, STRATEGY.commission, 0.002)  # per position change
+SLIPPAGES = (0.0, STRATEGY.slippage, 0.001)  # per unit of position traded
+DELAYS = (0, 1, 2)  # bars between decision and execution
+MAX_WORKERS = None  # process pool size for large grids (None = all cores)
+
+
+def main():
+    print("=== RUNNING COST SENSITIVITY SWEEP ===")
+
+    # ==================================================
+    # LOAD DATA & POSITIONS (ONCE)
+    # ==================================================
+    feature_cols = load_config().features.model_columns()
+    df = (
+        MarketDataStore()
+        .read(
+            dataset_name("processed", INTERVAL),
+            symbols=[SYMBOL],
+            start=START_DATE,
+            end=END_DATE,
+            columns=feature_cols + ["ret_1d"],
+        )
+        .reset_index(drop=True)
+    )
+    df = df[np.isfinite(df[feature_cols]).all(axis=1)].reset_index(drop=True)
+
+    booster = xgb.Booster()
+    booster.load_model(XGB_PATH)
+    df["xgb_prob"] = booster.predict(xgb.DMatrix(df[feature_cols]))
+
+    env = TradingEnv(df, feature_cols)
+    model = PPO.load(PPO_PATH, env=env, device="cpu")
+    positions = policy_positions(model, env, df["xgb_prob"].to_numpy()[:-1])
+
+    periods = period_labels(meta_policy_split(len(df)), len(positions))
+
+    # ==================================================
+    # SWEEP
+    # ==================================================
+    grid = cost_grid(COMMISSIONS, SLIPPAGES, DELAYS)
+    results = sweep(
+        positions,
+        df["ret_1d"].to_numpy()[1:],
+        grid,
+        periods=periods,
+        ann_factor=ANN_FACTOR,
+        max_workers=MAX_WORKERS,
+    )
+
+    os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
+    results.to_csv(OUTPUT_PATH, index=False)
+    print(f"DONE: {len(grid)} cost settings evaluated. Results saved to {OUTPUT_PATH}")
+
+    oos = results[results["period"] == "OOS_TEST"]
+    print(oos.sort_values("sharpe", ascending=False).head(10).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
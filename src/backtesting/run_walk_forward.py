@@ -0,0 +1,71 @@
+import os
+
+import numpy as np
+from core_utils.config import load_config
+from core_utils.intervals import periods_per_year
+from data_ingestor.store import MarketDataStore, dataset_name
+
+from src.backtesting.splits import walk_forward_folds
+from src.backtesting.walk_forward import run_walk_forward
+
+# ==================================================
+# CONFIG
+# ==================================================
+SYMBOL = "RELIANCE.NS"
+INTERVAL = "1d"
+ANN_FACTOR = periods_per_year(INTERVAL)  # bars per year
+WINDOW = "expanding"  # "expanding" (XGB from the first bar) or "rolling" (fixed XGB window)
+XGB_BARS = 500  # XGBoost training bars (initial size when expanding)
+PPO_BARS = 250  # PPO training bars just before each test window
+TEST_BARS = 125  # out-of-sample bars per fold (also the step between folds)
+OUTPUT_DIR = "artifacts/walk_forward"
+MAX_WORKERS = None  # folds trained in parallel (None = all cores)
+FORCE = False  # retrain folds that already have results
+
+CONFIG = load_config()
+COMMISSION = CONFIG.strategy.commission
+TIMESTEPS = CONFIG.ppo.total_timesteps
+
+
+def main():
+    print("=== RUNNING WALK-FORWARD META-POLICY ===")
+
+    feature_cols = CONFIG.features.model_columns()
+    df = MarketDataStore().read(
+        dataset_name("processed", INTERVAL),
+        symbols=[SYMBOL],
+        columns=feature_cols + ["ret_1d"],
+    )
+    df = df[np.isfinite(df[feature_cols]).all(axis=1)].reset_index()
+
+    folds = walk_forward_folds(len(df), XGB_BARS, PPO_BARS, TEST_BARS, WINDOW)
+    if not folds:
+        raise ValueError(f"Need more than {XGB_BARS + PPO_BARS} bars, have {len(df)}")
+    print(f"{len(folds)} {WINDOW} folds over {len(df)} bars")
+
+    oos, summary = run_walk_forward(
+        df,
+        folds,
+        feature_cols,
+        OUTPUT_DIR,
+        commission=COMMISSION,
+        timesteps=TIMESTEPS,
+        ann_factor=ANN_FACTOR,
+        max_workers=MAX_WORKERS,
+        force=FORCE,
+    )
+
+    oos.to_csv(os.path.join(OUTPUT_DIR, "oos_equity.csv"), index=False)
+    summary.to_csv(os.path.join(OUTPUT_DIR, "folds.csv"), index=False)
+    print(summary[["index", "test_start", "test_end", "cum_ret", "sharpe", "trades"]].to_string())
+
+    pnl_std = oos["pnl"].std()
+    sharpe = np.sqrt(ANN_FACTOR) * oos["pnl"].mean() / pnl_std if pnl_std != 0 else 0
+    print(
+        f"[STITCHED OOS] Cum Ret: {oos['equity'].iloc[-1] - 1:.2%}, Sharpe: {sharpe:.2f}, "
+        f"MaxDD: {oos['drawdown'].min():.2%}, Bars: {len(oos)}"
+    )
+
+
+if __name__ == "__main__":
+    main()
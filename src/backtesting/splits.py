@@ -0,0 +1,80 @@
+from dataclasses import asdict, dataclass
+
+import numpy as np
+
+XGB_END = 0.6  # first 60% of bars train XGBoost
+PPO_END = 0.8  # next 20% train PPO on unseen XGB signals; the last 20% is the test
+WINDOWS = ("expanding", "rolling")
+
+
+@dataclass(frozen=True)
+class Fold:
+    """
+    Row ranges of one meta-policy train/test cycle, all [start, end):
+    XGBoost trains on [xgb_start, ppo_start), PPO on [ppo_start, test_start)
+    and the pair is tested on [test_start, test_end).
+    """
+
+    index: int
+    xgb_start: int
+    ppo_start: int
+    test_start: int
+    test_end: int
+
+    @property
+    def xgb(self) -> slice:
+        return slice(self.xgb_start, self.ppo_start)
+
+    @property
+    def ppo(self) -> slice:
+        return slice(self.ppo_start, self.test_start)
+
+    @property
+    def test(self) -> slice:
+        return slice(self.test_start, self.test_end)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def meta_policy_split(n_rows: int) -> Fold:
+    """The single 60/20/20 split used by training and the backtest."""
+    return Fold(0, 0, int(n_rows * XGB_END), int(n_rows * PPO_END), n_rows)
+
+
+def period_labels(fold: Fold, n_bars: int) -> np.ndarray:
+    """IS_XGB_TRAIN / IS_PPO_TRAIN / OOS_TEST label of bars 0..n_bars-1."""
+    t = np.arange(n_bars)
+    return np.select(
+        [t < fold.ppo_start, t < fold.test_start], ["IS_XGB_TRAIN", "IS_PPO_TRAIN"], "OOS_TEST"
+    )
+
+
+def walk_forward_folds(
+    n_rows: int,
+    xgb_bars: int,
+    ppo_bars: int,
+    test_bars: int,
+    window: str = "expanding",
+) -> list[Fold]:
+    """
+    Consecutive folds whose test windows tile the data after the first training
+    period, so their out-of-sample results stitch into one curve. Each fold moves
+    forward by test_bars. "rolling" keeps the XGBoost window at xgb_bars;
+    "expanding" starts it at bar 0. PPO always trains on the ppo_bars just before
+    the test window. The last test window is cut at n_rows.
+    """
+    if window not in WINDOWS:
+        raise ValueError(f"Unknown window '{window}'. Use one of {WINDOWS}")
+    if min(xgb_bars, ppo_bars, test_bars) < 1:
+        raise ValueError("Window lengths must be positive")
+
+    folds: list[Fold] = []
+    test_start = xgb_bars + ppo_bars
+    while test_start < n_rows:
+        ppo_start = test_start - ppo_bars
+        xgb_start = 0 if window == "expanding" else ppo_start - xgb_bars
+        test_end = min(test_start + test_bars, n_rows)
+        folds.append(Fold(len(folds), xgb_start, ppo_start, test_start, test_end))
+        test_start = test_end
+    return folds
@@ -0,0 +1,131 @@
+import itertools
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+CHUNK_SIZE = 256  # grid rows per task; each holds a (rows x bars) pnl matrix
+ALL_PERIODS = "ALL"
+
+
+def cost_grid(commissions, slippages=(0.0,), delays=(0,)) -> pd.DataFrame:
+    """Every (commission, slippage, delay) combination, one row each."""
+    rows = list(itertools.product(commissions, slippages, delays))
+    grid = pd.DataFrame(rows, columns=["commission", "slippage", "delay"])
+    if (grid[["commission", "slippage"]] < 0).any().any() or (grid["delay"] < 0).any():
+        raise ValueError("Costs and delays must be non-negative")
+    return grid.astype({"commission": float, "slippage": float, "delay": int})
+
+
+def delayed(positions: np.ndarray, delay: int) -> np.ndarray:
+    """Positions executed `delay` bars after the decision (flat until the first fill)."""
+    if delay == 0:
+        return positions
+    held = np.zeros_like(positions)
+    held[delay:] = positions[:-delay]
+    return held
+
+
+def evaluate(
+    positions: np.ndarray,
+    next_ret: np.ndarray,
+    grid: pd.DataFrame,
+    periods: np.ndarray | None = None,
+    ann_factor: float = 252,
+) -> pd.DataFrame:
+    """
+    Metrics of every grid row over the same decisions, vectorised across the grid.
+
+    Position held after bar t earns next_ret[t]. Each change of position pays
+    `commission` (as in the backtest) plus `slippage` per unit traded, so a flip
+    from short to long pays it twice. Metrics follow run_backtest: per-period
+    cumulative return (first to last equity of the period), annualised Sharpe,
+    max drawdown from the running peak, exposure and number of trades.
+    """
+    labels = [ALL_PERIODS]
+    masks = [np.ones(len(positions), dtype=bool)]
+    if periods is not None:
+        for period in pd.unique(periods):
+            labels.append(period)
+            masks.append(periods == period)
+
+    frames = []
+    for delay, group in grid.groupby("delay", sort=False):
+        held = delayed(positions, int(delay))
+        prev = np.concatenate([[0], held[:-1]])
+        changed = held != prev
+        turnover = np.abs(held - prev)
+
+        commission = group["commission"].to_numpy()[:, None]
+        slippage = group["slippage"].to_numpy()[:, None]
+        pnl = held * next_ret - (commission * changed + slippage * turnover)
+        equity = np.cumprod(1 + pnl, axis=1)
+        drawdown = equity / np.maximum.accumulate(equity, axis=1) - 1
+
+        for order, (label, mask) in enumerate(zip(labels, masks, strict=True)):
+            if not mask.any():
+                continue
+            sub = pnl[:, mask]
+            std = sub.std(axis=1, ddof=1) if sub.shape[1] > 1 else np.zeros(len(group))
+            with np.errstate(divide="ignore", invalid="ignore"):
+                sharpe = np.where(std != 0, np.sqrt(ann_factor) * sub.mean(axis=1) / std, 0.0)
+            eq = equity[:, mask]
+            frames.append(
+                pd.DataFrame(
+                    {
+                        "row": group.index,
+                        "order": order,
+                        "commission": group["commission"].to_numpy(),
+                        "slippage": group["slippage"].to_numpy(),
+                        "delay": int(delay),
+                        "period": label,
+                        "cum_ret": eq[:, -1] / eq[:, 0] - 1,
+                        "sharpe": sharpe,
+                        "max_drawdown": drawdown[:, mask].min(axis=1),
+                        "exposure": (held[mask] != 0).mean(),
+                        "trades": int(changed[mask].sum()),
+                        "final_equity": eq[:, -1],
+                    }
+                )
+            )
+
+    if not frames:
+        return pd.DataFrame()
+    out = pd.concat(frames, ignore_index=True).sort_values(["row", "order"])
+    return out.drop(columns=["row", "order"]).reset_index(drop=True)
+
+
+def sweep(
+    positions: np.ndarray,
+    next_ret: np.ndarray,
+    grid: pd.DataFrame,
+    periods: np.ndarray | None = None,
+    ann_factor: float = 252,
+    max_workers: int | None = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> pd.DataFrame:
+    """
+    evaluate() over a large grid: chunks of `chunk_size` rows spread across a
+    process pool (spawn), results concatenated in grid order. Small grids and
+    max_workers=1 run in-process.
+    """
+    positions = np.asarray(positions)
+    next_ret = np.asarray(next_ret, dtype=np.float64)
+    if len(positions) != len(next_ret):
+        raise ValueError("positions and next_ret must have the same length")
+
+    grid = grid.reset_index(drop=True)
+    chunks = [grid.iloc[lo : lo + chunk_size] for lo in range(0, len(grid), chunk_size)]
+    max_workers = min(max_workers or os.cpu_count() or 1, len(chunks)) or 1
+
+    args = (positions, next_ret)
+    if max_workers == 1:
+        results = [evaluate(*args, chunk, periods, ann_factor) for chunk in chunks]
+    else:
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as pool:
+            futures = [pool.submit(evaluate, *args, chunk, periods, ann_factor) for chunk in chunks]
+            results = [future.result() for future in futures]
+    return pd.concat(results, ignore_index=True) if results else pd.DataFrame()
@@ -0,0 +1,200 @@
+import json
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from trading_environment.env import TradingEnv
+from trading_environment.sampler import EpisodeData, EpisodeSampler
+from trading_environment.vec_env import VecTradingEnv
+
+from src.backtesting.cache import frame_fingerprint
+from src.backtesting.engine import policy_positions, simulate
+from src.backtesting.splits import Fold
+from src.models.ppo.agent import build_ppo
+from src.models.xgb.model import XGBDirectionalModel
+
+FOLD_FILE = "fold.json"  # written last: its presence marks a finished fold
+RESULTS_FILE = "results.csv"
+N_ENVS = 8
+EPISODE_LENGTH = (64, 256)
+
+
+def fold_dir(out_dir: str, fold: Fold) -> str:
+    return os.path.join(out_dir, f"fold_{fold.index:03d}")
+
+
+def data_fingerprint(df: pd.DataFrame, fold: Fold) -> str:
+    """Hash of every row the fold reads: its training windows, test window and the bar after."""
+    return frame_fingerprint(df.iloc[fold.xgb_start : fold.test_end + 1])
+
+
+def _write_json(path: str, payload: dict):
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".", suffix=".json")
+    with os.fdopen(fd, "w") as f:
+        json.dump(payload, f, indent=2)
+    os.replace(tmp, path)
+
+
+def _fit_xgb(X: pd.DataFrame, y: pd.Series) -> xgb.Booster:
+    # Same recipe as the final model of src/models/xgb/train.py: last 10% for early stopping
+    split_val = int(len(X) * 0.9)
+    model = XGBDirectionalModel()
+    model.train(X.iloc[:split_val], y.iloc[:split_val], X.iloc[split_val:], y.iloc[split_val:])
+    return model.model.get_booster()
+
+
+def _fit_ppo(frame: pd.DataFrame, feature_cols: list[str], timesteps: int):
+    # Short episodes sampled inside the PPO window, as in src/models/ppo/train.py
+    sampler = EpisodeSampler(
+        EpisodeData(frame.reset_index(drop=True), feature_cols),
+        min_length=min(EPISODE_LENGTH[0], len(frame) - 2),
+        max_length=EPISODE_LENGTH[1],
+    )
+    model = build_ppo(VecTradingEnv(None, n_envs=N_ENVS, sampler=sampler, seed=42))
+    model.learn(total_timesteps=timesteps)
+    return model
+
+
+def run_fold(
+    fold: Fold,
+    df: pd.DataFrame,
+    feature_cols: list[str],
+    out_dir: str,
+    config: dict,
+) -> dict:
+    """
+    Train XGBoost on the fold's XGB window and PPO on its PPO window, then backtest
+    the test window (starting flat). Writes xgb.json, ppo.zip and results.csv
+    (one row per decision bar) to the fold's directory, then fold.json.
+    """
+    path = fold_dir(out_dir, fold)
+    os.makedirs(path, exist_ok=True)
+
+    # Target: direction of the next bar's return
+    target = (df["ret_1d"].shift(-1) > 0).astype(int)
+    booster = _fit_xgb(df[feature_cols].iloc[fold.xgb], target.iloc[fold.xgb])
+    booster.save_model(os.path.join(path, "xgb.json"))
+
+    # Test bars earn the return of the following bar, so carry one extra row
+    frame = df.iloc[fold.ppo_start : min(fold.test_end + 1, len(df))].copy()
+    frame["xgb_prob"] = booster.predict(xgb.DMatrix(frame[feature_cols]))
+
+    ppo_rows = fold.test_start - fold.ppo_start
+    model = _fit_ppo(frame.iloc[:ppo_rows], feature_cols, config["timesteps"])
+    model.save(os.path.join(path, "ppo"))
+
+    test = frame.iloc[ppo_rows:].reset_index(drop=True)
+    env = TradingEnv(test, feature_cols)
+    xgb_prob = test["xgb_prob"].to_numpy()[:-1]
+    positions = policy_positions(model, env, xgb_prob)
+    pnl, equity = simulate(positions, test["ret_1d"].to_numpy()[1:], config["commission"])
+
+    results = pd.DataFrame(
+        {
+            "date": (
+                test["date"].iloc[:-1].to_numpy()
+                if "date" in test
+                else np.arange(fold.test_start, fold.test_start + len(positions))
+            ),
+            "fold": fold.index,
+            "position": positions,
+            "xgb_prob": xgb_prob,
+            "pnl": pnl,
+        }
+    )
+    results.to_csv(os.path.join(path, RESULTS_FILE), index=False)
+
+    std = pnl.std(ddof=1) if len(pnl) > 1 else 0.0
+    summary = {
+        **fold.to_dict(),
+        "config": config,
+        "data": data_fingerprint(df, fold),
+        "bars": len(pnl),
+        "cum_ret": float(equity[-1] - 1) if len(equity) else 0.0,
+        "sharpe": float(np.sqrt(config["ann_factor"]) * pnl.mean() / std) if std else 0.0,
+        "exposure": float((positions != 0).mean()) if len(positions) else 0.0,
+        "trades": int((positions != np.concatenate([[0], positions[:-1]])).sum()),
+    }
+    _write_json(os.path.join(path, FOLD_FILE), summary)
+    return summary
+
+
+def _run_fold_worker(fold, df, feature_cols, out_dir, config) -> dict:
+    import torch
+
+    torch.set_num_threads(1)  # one fold per core
+    return run_fold(fold, df, feature_cols, out_dir, config)
+
+
+def completed(fold: Fold, out_dir: str, config: dict, data: str) -> dict | None:
+    """
+    Stored summary of a fold finished with the same ranges, config and input rows
+    (`data`, see data_fingerprint), else None.
+    """
+    path = os.path.join(fold_dir(out_dir, fold), FOLD_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        summary = json.load(f)
+    same_fold = all(summary.get(k) == v for k, v in fold.to_dict().items())
+    same_inputs = summary.get("config") == config and summary.get("data") == data
+    return summary if same_fold and same_inputs else None
+
+
+def run_walk_forward(
+    df: pd.DataFrame,
+    folds: list[Fold],
+    feature_cols: list[str],
+    out_dir: str,
+    commission: float = 0.001,
+    timesteps: int = 100_000,
+    ann_factor: float = 252,
+    max_workers: int | None = None,
+    force: bool = False,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Run every fold not already finished in `out_dir` (same ranges, config and data),
+    independent folds in parallel across a spawn process pool, then stitch the
+    test windows into one out-of-sample curve.
+
+    Returns (oos, summary): per-bar stitched results with compounded equity and
+    drawdown, and one row per fold.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    config = {
+        "commission": commission,
+        "timesteps": timesteps,
+        "ann_factor": ann_factor,
+        "feature_cols": list(feature_cols),
+    }
+    data = {f.index: data_fingerprint(df, f) for f in folds}
+    pending = [f for f in folds if force or completed(f, out_dir, config, data[f.index]) is None]
+    print(f"Walk-forward: {len(folds) - len(pending)}/{len(folds)} folds already done")
+
+    max_workers = min(max_workers or os.cpu_count() or 1, len(pending)) or 1
+    args = (df, feature_cols, out_dir, config)
+    if max_workers == 1:
+        for fold in pending:
+            run_fold(fold, *args)
+            print(f"  fold {fold.index} done")
+    elif pending:
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as pool:
+            futures = {pool.submit(_run_fold_worker, fold, *args): fold for fold in pending}
+            for future, fold in futures.items():
+                future.result()
+                print(f"  fold {fold.index} done")
+
+    summary = pd.DataFrame([completed(f, out_dir, config, data[f.index]) for f in folds])
+    summary = summary.drop(columns=["config", "data"])
+    oos = pd.concat(
+        [pd.read_csv(os.path.join(fold_dir(out_dir, f), RESULTS_FILE)) for f in folds],
+        ignore_index=True,
+    )
+    oos["equity"] = np.cumprod(1 + oos["pnl"].to_numpy())
+    oos["drawdown"] = oos["equity"] / oos["equity"].cummax() - 1
+    return oos, summary
@@ -1,24 +1,59 @@
+import argparse
+
 import numpy as np
-import pandas as pd
 import xgboost as xgb
-from stable_baselines3.common.vec_env import DummyVecEnv
+from core_utils.config import load_config
+from data_ingestor.store import MarketDataStore
+from feature_engineer.store import FeatureStore
+from stable_baselines3.common.vec_env import VecEnv
 from trading_environment.env import TradingEnv
+from trading_environment.sampler import EpisodeData, EpisodeSampler
+from trading_environment.shared import SharedEpisodeData, subproc_env
+from trading_environment.vec_env import VecTradingEnv
 
+from src.backtesting.splits import meta_policy_split
 from src.models.ppo.agent import build_ppo
 
-DATA_PATH = "data/RELIANCE.NS_processed.parquet"
+SYMBOL = "RELIANCE.NS"
 XGB_PATH = "artifacts/xgb/xgb_directional.json"
+N_ENVS = 8  # parallel episodes, stepped as one batch
+EPISODE_LENGTH = (64, 256)  # steps per sampled training episode (min, max)
+# "native": one process, envs stepped as one array batch (VecTradingEnv)
+# "subproc": one worker process per env (SubprocVecEnv) over memory-mapped shared data
+VEC_ENV = "native"
+VEC_ENVS = ("native", "subproc")
+
+parser = argparse.ArgumentParser(description="Train the PPO meta-policy on XGBoost signals")
+parser.add_argument("--n-envs", type=int, default=N_ENVS, help="Episodes trained in parallel")
+parser.add_argument(
+    "--episode-length",
+    type=int,
+    nargs=2,
+    default=EPISODE_LENGTH,
+    metavar=("MIN", "MAX"),
+    help="Steps per sampled training episode",
+)
+parser.add_argument(
+    "--full-window",
+    action="store_true",
+    help="Every episode is the whole PPO window; with --n-envs 1 this is the original "
+    "single-episode regime (DummyVecEnv over the window) the shipped model was trained with",
+)
+parser.add_argument("--vec-env", default=VEC_ENV, choices=VEC_ENVS)
+args = parser.parse_args()
 
 print("=== PPO TRAINING (META-POLICY MODE) ===")
 
 # --------------------------------------------------
 # LOAD DATA & XGBOOST MODEL
 # --------------------------------------------------
-df = pd.read_parquet(DATA_PATH)
+if FeatureStore.from_config().stale([SYMBOL]):
+    print(f"WARNING: stored features for {SYMBOL} are stale; rerun run_feature_engineer.py")
+df = MarketDataStore().read("processed", symbols=[SYMBOL])
 
-feature_cols = [c for c in df.columns if c.endswith("_z")] + ["trend_sma"]
+feature_cols = load_config().features.model_columns()
 mask = np.isfinite(df[feature_cols]).all(axis=1)
-df = df.loc[mask].reset_index(drop=True)
+df = df.loc[mask].reset_index()  # keep dates for the split boundaries
 
 booster = xgb.Booster()
 booster.load_model(XGB_PATH)
@@ -32,26 +67,53 @@ print(f"Filtered data rows: {len(df)}")
 # --------------------------------------------------
 # TIME-BASED SPLIT (60% XGB, 20% PPO Train, 20% PPO Test)
 # --------------------------------------------------
-split_1 = int(len(df) * 0.6)
-split_2 = int(len(df) * 0.8)
+split = meta_policy_split(len(df))
 
 # PPO trains on the validation set of XGBoost to learn how to handle unseen XGB signals
-train_df = df.iloc[split_1:split_2].copy().reset_index(drop=True)
-test_df = df.iloc[split_2:].copy().reset_index(drop=True)
+train_start, test_start = df["date"].iloc[split.ppo_start], df["date"].iloc[split.test_start]
+test_df = df.iloc[split.test].copy().reset_index(drop=True)
 
 # --------------------------------------------------
 # TRAINING ENV
 # --------------------------------------------------
-train_env = DummyVecEnv([lambda: TradingEnv(train_df)])
+# Short episodes sampled inside [train_start, test_start), or the whole window
+# (n bars give an episode of n - 2 steps: obs at t, return at t + 1)
+episodes = EpisodeData(df, feature_cols)
+min_length, max_length = args.episode_length
+if args.full_window:
+    min_length = max_length = split.test_start - split.ppo_start - 2
+print(
+    f"Training on {args.n_envs} x {args.vec_env} envs, episodes of {min_length}-{max_length} steps"
+)
+sampler_kwargs = {
+    "min_length": min_length,
+    "max_length": max_length,
+    "start": train_start,
+    "end": test_start,
+}
+shared = None
+train_env: VecEnv
+if args.vec_env == "subproc":
+    # fork: this script has no __main__ guard for spawn/forkserver to re-import
+    shared = SharedEpisodeData.create(episodes)
+    train_env = subproc_env(shared, args.n_envs, seed=42, start_method="fork", **sampler_kwargs)
+else:
+    sampler = EpisodeSampler(episodes, **sampler_kwargs)
+    train_env = VecTradingEnv(None, n_envs=args.n_envs, sampler=sampler, seed=42)
 model = build_ppo(train_env)
 
 # Train PPO
-model.learn(total_timesteps=100_000)
+try:
+    model.learn(total_timesteps=100_000)
+finally:
+    train_env.close()
+    if shared is not None:
+        shared.unlink()
 
 # --------------------------------------------------
 # EVALUATION
 # --------------------------------------------------
-test_env = TradingEnv(test_df)
+test_env = TradingEnv(test_df, feature_cols)
 obs, _ = test_env.reset()
 
 done = False
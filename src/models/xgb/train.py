@@ -1,13 +1,16 @@
 import os
 
 import numpy as np
-import pandas as pd
+from core_utils.config import load_config
+from data_ingestor.store import MarketDataStore
+from feature_engineer.store import FeatureStore
 from sklearn.metrics import roc_auc_score
 from sklearn.model_selection import TimeSeriesSplit
 
+from src.backtesting.splits import meta_policy_split
 from src.models.xgb.model import XGBDirectionalModel
 
-DATA_PATH = "data/RELIANCE.NS_processed.parquet"
+SYMBOL = "RELIANCE.NS"
 ARTIFACT_DIR = "artifacts/xgb"
 os.makedirs(ARTIFACT_DIR, exist_ok=True)
 
@@ -16,7 +19,9 @@ print("=== XGBOOST TRAINING (META-POLICY MODE) ===")
 # --------------------------------------------------
 # LOAD DATA
 # --------------------------------------------------
-df = pd.read_parquet(DATA_PATH)
+if FeatureStore.from_config().stale([SYMBOL]):
+    print(f"WARNING: stored features for {SYMBOL} are stale; rerun run_feature_engineer.py")
+df = MarketDataStore().read("processed", symbols=[SYMBOL])
 
 # --------------------------------------------------
 # TARGET
@@ -27,7 +32,7 @@ df = df.dropna()
 # --------------------------------------------------
 # FEATURE SELECTION
 # --------------------------------------------------
-feature_cols = [c for c in df.columns if c.endswith("_z")] + ["trend_sma"]
+feature_cols = load_config().features.model_columns()
 
 X = df[feature_cols]
 y = df["target"]
@@ -35,9 +40,9 @@ y = df["target"]
 # --------------------------------------------------
 # SPLIT FOR META-POLICY (60% XGB, 20% PPO, 20% TEST)
 # --------------------------------------------------
-split_1 = int(len(df) * 0.6)
+split = meta_policy_split(len(df))
 
-X_train, y_train = X.iloc[:split_1], y.iloc[:split_1]
+X_train, y_train = X.iloc[split.xgb], y.iloc[split.xgb]
 
 # --------------------------------------------------
 # TIME-SERIES CROSS VALIDATION
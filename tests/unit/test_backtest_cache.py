@@ -0,0 +1,59 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pandas as pd
+
+from src.backtesting.cache import BacktestCache
+
+
+def test_concurrent_puts_keep_every_entry(tmp_path):
+    cache = BacktestCache(str(tmp_path), max_entries=100)
+    results = pd.DataFrame({"pnl": [0.1, -0.2]})
+
+    def put(i):
+        cache.put(f"key{i}", results, metrics={"i": i})
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(put, range(40)))
+
+    for i in range(40):
+        stored, metrics = cache.get(f"key{i}")
+        pd.testing.assert_frame_equal(stored, results)
+        assert metrics == {"i": i}
+
+
+def _put_from_process(root, i):
+    BacktestCache(root, max_entries=100).put(f"key{i}", pd.DataFrame({"pnl": [float(i)]}))
+
+
+def _die_holding_lock(root):
+    with BacktestCache(root)._locked():
+        os._exit(1)
+
+
+def test_concurrent_processes_and_dead_holders(tmp_path):
+    root = str(tmp_path)
+    context = multiprocessing.get_context("fork")
+    crashed = context.Process(target=_die_holding_lock, args=(root,))
+    crashed.start()
+    crashed.join()
+    assert crashed.exitcode == 1
+
+    with ProcessPoolExecutor(max_workers=4, mp_context=context) as pool:
+        list(pool.map(_put_from_process, [root] * 12, range(12)))
+
+    cache = BacktestCache(root, max_entries=100)
+    assert sorted(cache._load_manifest()) == sorted(f"key{i}" for i in range(12))
+
+
+def test_key_follows_data_and_files(tmp_path):
+    source = tmp_path / "model.json"
+    source.write_text("v1")
+    df = pd.DataFrame({"close": [1.0, 2.0]})
+    key = BacktestCache.key([str(source)], df, {"commission": 0.001})
+
+    assert BacktestCache.key([str(source)], df.copy(), {"commission": 0.001}) == key
+    assert BacktestCache.key([str(source)], df * 2, {"commission": 0.001}) != key
+    source.write_text("v2")
+    assert BacktestCache.key([str(source)], df, {"commission": 0.001}) != key
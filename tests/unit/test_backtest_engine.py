@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+from trading_environment.env import POSITIONS, TradingEnv
+
+from src.backtesting.engine import (
+    action_tables,
+    check_parity,
+    loop_positions,
+    policy_positions,
+    scan_positions,
+    simulate,
+)
+
+FEATURES = ["f0", "f1"]
+
+
+class ThresholdPolicy:
+    """Fixed path-dependent policy: follow strong signals, flat when neutral, else hold."""
+
+    def predict(self, obs, deterministic=True):
+        obs = np.atleast_2d(obs)
+        signal = obs[:, -2] + 0.1 * obs[:, 0]
+        hold = np.searchsorted(POSITIONS, obs[:, -1].astype(int))
+        action = np.select([signal > 0.6, signal < 0.4, abs(signal - 0.5) < 0.02], [2, 0, 1], hold)
+        return (action if len(action) > 1 else action[0]), None
+
+
+def make_frame(n=500, seed=0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "f0": rng.normal(size=n),
+            "f1": rng.normal(size=n),
+            "xgb_prob": rng.uniform(size=n),
+            "ret_1d": rng.normal(0, 0.01, n),
+        }
+    )
+
+
+@pytest.mark.parametrize("engine", ["array", "pandas"])
+def test_scan_matches_per_step_loop(engine):
+    df = make_frame()
+    env = TradingEnv(df, FEATURES, engine=engine)
+    xgb_prob = df["xgb_prob"].to_numpy()[:-1]
+    model = ThresholdPolicy()
+
+    batched = scan_positions(action_tables(model, env, xgb_prob, batch_size=64))
+    loop = loop_positions(model, env, xgb_prob)
+
+    np.testing.assert_array_equal(batched, loop)
+    assert set(np.unique(loop)) == set(POSITIONS)
+    np.testing.assert_array_equal(check_parity(model, env, xgb_prob), loop)
+
+
+def test_policy_positions_rejects_unknown_engine():
+    df = make_frame(n=10)
+    with pytest.raises(ValueError, match="Unknown engine"):
+        policy_positions(ThresholdPolicy(), TradingEnv(df, FEATURES), df["xgb_prob"], "gpu")
+
+
+def test_simulate_matches_per_step_loop():
+    rng = np.random.default_rng(1)
+    positions = rng.choice(POSITIONS, size=300)
+    next_ret = rng.normal(0, 0.01, 300)
+    commission = 0.001
+
+    pnl, equity = simulate(positions, next_ret, commission)
+
+    prev_position, value = 0, 1.0
+    for t in range(len(positions)):
+        costs = commission if positions[t] != prev_position else 0.0
+        step_pnl = positions[t] * next_ret[t] - costs
+        value *= 1 + step_pnl
+        prev_position = positions[t]
+
+        assert pnl[t] == pytest.approx(step_pnl, rel=1e-12, abs=1e-15)
+        assert equity[t] == pytest.approx(value, rel=1e-12)
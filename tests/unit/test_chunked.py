@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import pytest
+from feature_engineer.chunked import ChunkedFeatureEngineer, alignment, warmup_bars
+from feature_engineer.engineer import FeatureEngineer
+
+
+def make_panel(n=2500, symbols=("AAA", "BBB", "CCC"), seed=0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2010-01-01", periods=n)
+    frames = []
+    for i, symbol in enumerate(symbols):
+        # staggered listings: symbols enter the panel at different bars
+        start = 150 * i
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n - start)))
+        volume = rng.integers(1_000, 10_000, n - start).astype(float)
+        frames.append(
+            pd.DataFrame({"symbol": symbol, "close": close, "volume": volume}, dates[start:])
+        )
+    return pd.concat(frames).sort_index(kind="stable")
+
+
+@pytest.mark.parametrize("n_chunks", [2, 7])
+def test_chunked_matches_in_memory(n_chunks):
+    df = make_panel()
+    engineer = FeatureEngineer()
+    expected = engineer.normalize_continuous(engineer.calculate_features(df))
+
+    chunked = ChunkedFeatureEngineer(engineer)
+    # uneven cuts, so tails are trimmed at several aligned boundaries
+    dates = df.index.unique()
+    cuts = np.sort(np.random.default_rng(n_chunks).choice(len(dates), n_chunks - 1, False))
+    bounds = [dates[0], *dates[cuts], dates[-1] + pd.Timedelta(days=1)]
+    chunks = [
+        df[(df.index >= lo) & (df.index < hi)]
+        for lo, hi in zip(bounds[:-1], bounds[1:], strict=True)
+    ]
+    result = pd.concat(list(chunked.run(chunks)))
+
+    assert len(df) > 2 * (warmup_bars(engineer) + alignment(engineer))
+    assert max(chunked.starts.values()) > 0
+    pd.testing.assert_frame_equal(result, expected, check_exact=True)
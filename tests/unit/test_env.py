@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+from trading_environment.env import TradingEnv
+
+FEATURES = ["f0", "f1"]
+
+
+def make_frame(n=20, seed=0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "f0": rng.normal(size=n),
+            "f1": rng.normal(size=n),
+            "xgb_prob": rng.uniform(size=n),
+            "ret_1d": rng.normal(0, 0.01, n),
+        }
+    )
+
+
+@pytest.mark.parametrize("engine", ["array", "pandas"])
+def test_observations_are_not_aliased(engine):
+    env = TradingEnv(make_frame(), FEATURES, engine=engine)
+    first, _ = env.reset()
+    kept = first.copy()
+    second, *_ = env.step(2)
+
+    np.testing.assert_array_equal(first, kept)
+    assert not np.shares_memory(first, second)
+
+
+def test_array_engine_matches_pandas():
+    df = make_frame()
+    envs = [TradingEnv(df, FEATURES, engine=e) for e in ("array", "pandas")]
+    observations = [[env.reset()[0]] for env in envs]
+    for action in [2, 2, 0, 1, 0, 2, 1, 1]:
+        for env, obs in zip(envs, observations, strict=True):
+            obs.append(env.step(action)[0])
+
+    np.testing.assert_array_equal(np.stack(observations[0]), np.stack(observations[1]))
@@ -0,0 +1,29 @@
+import pandas as pd
+import pytest
+from data_ingestor.incremental import merge_new_bars
+
+DATES = pd.bdate_range("2024-01-01", periods=10, name="date")
+
+
+def bars(dates, close=100.0) -> pd.DataFrame:
+    return pd.DataFrame(
+        {"open": close, "high": close, "low": close, "close": close, "volume": 1.0}, dates
+    )
+
+
+def test_appends_newer_bars_and_replaces_last():
+    existing = bars(DATES[:6])
+    new = bars(DATES[3:], close=100.0)
+    new.loc[DATES[5], "close"] = 101.0  # the last stored bar was partial
+
+    merged = merge_new_bars(existing, new)
+    assert merged.index.equals(DATES)
+    assert merged.loc[DATES[5], "close"] == 101.0
+
+
+def test_restated_history_raises():
+    existing = bars(DATES[:6])
+    new = bars(DATES[3:], close=100.0)
+    new.loc[DATES[4], "close"] = 50.0
+    with pytest.raises(ValueError, match="differ from stored history"):
+        merge_new_bars(existing, new)
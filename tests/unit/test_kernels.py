@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+from feature_engineer.engineer import FeatureEngineer
+from feature_engineer.kernels import ewm_mean
+from feature_engineer.registry import DEFAULT_FEATURES
+
+
+def make_panel(lengths=(400, 250, 320), seed=0) -> pd.DataFrame:
+    """Interleaved multi-symbol bars of different lengths (a long frame)."""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for i, n in enumerate(lengths):
+        dates = pd.bdate_range("2020-01-01", periods=n)[-n:] + pd.offsets.BDay(i * 7)
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+        volume = rng.integers(1_000, 10_000, n).astype(float)
+        frames.append(pd.DataFrame({"symbol": f"S{i}", "close": close, "volume": volume}, dates))
+    return pd.concat(frames).sort_index(kind="stable")
+
+
+@pytest.mark.parametrize("span", [3, 12, 26, 500])
+def test_ewm_mean_matches_pandas_with_gaps(span):
+    rng = np.random.default_rng(1)
+    grid = rng.normal(size=(4, 700)).cumsum(axis=1) + 100
+    grid[0, 5:9] = np.nan  # interior gap
+    grid[1, :3] = np.nan  # late start
+    grid[2, 300] = np.nan
+    grid[2, 650:] = np.nan  # ragged tail (padding)
+
+    out = ewm_mean(grid, span)
+    ref = pd.DataFrame(grid.T).ewm(span=span, adjust=False).mean().to_numpy().T
+
+    valid = ~np.isnan(grid)
+    np.testing.assert_allclose(out[valid], ref[valid], rtol=1e-12)
+    # a missing bar carries the previous level
+    np.testing.assert_allclose(out[0, 5:9], ref[0, 5:9], rtol=1e-12)
+    assert np.isnan(out[1, :3]).all()
+
+
+def test_ewm_mean_init_continues_series():
+    rng = np.random.default_rng(2)
+    grid = rng.normal(size=(3, 600)).cumsum(axis=1)
+    grid[1, 400:410] = np.nan
+
+    full = ewm_mean(grid, 26)
+    cut = 333
+    resumed = ewm_mean(grid[:, cut:], 26, init=full[:, cut - 1])
+    np.testing.assert_allclose(resumed, full[:, cut:], rtol=1e-10, atol=1e-10)
+
+
+def test_numpy_engine_matches_pandas_engine():
+    df = make_panel()
+    fast = FeatureEngineer(engine="numpy").calculate_features(df)
+    ref = FeatureEngineer(engine="pandas").calculate_features(df)
+
+    pd.testing.assert_frame_equal(fast[list(DEFAULT_FEATURES)], ref[list(DEFAULT_FEATURES)])
+
+
+def test_numpy_engine_macd_matches_pandas_with_missing_closes():
+    df = make_panel()
+    df.loc[df["symbol"] == "S0", "close"] = df.loc[df["symbol"] == "S0", "close"].mask(
+        lambda s: s.index.isin(s.index[100:104])
+    )
+    df.loc[df.index[:6], "close"] = np.nan  # late start for every symbol
+
+    columns = ["macd", "macd_signal"]
+    fast = FeatureEngineer(engine="numpy", features=columns).calculate_features(df)
+    ref = FeatureEngineer(engine="pandas", features=columns).calculate_features(df)
+
+    pd.testing.assert_frame_equal(fast[columns], ref[columns], rtol=1e-10)
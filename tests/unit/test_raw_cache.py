@@ -0,0 +1,33 @@
+import pandas as pd
+from data_ingestor.cache import CachedSource
+from data_ingestor.sources import DataSource
+
+
+class CountingSource(DataSource):
+    name = "counting"
+
+    def __init__(self):
+        self.calls = 0
+
+    def fetch(self, symbol, start=None, end=None, interval="1d"):
+        self.calls += 1
+        index = pd.date_range(start, end, freq="D", inclusive="left")
+        return pd.DataFrame({"close": float(self.calls)}, index=index)
+
+
+def test_invalidate_drops_closed_history(tmp_path):
+    inner = CountingSource()
+    source = CachedSource(inner, cache_dir=str(tmp_path))
+
+    first = source.fetch("AAA", "2020-01-01", "2020-02-01")
+    source.fetch("BBB", "2020-01-01", "2020-02-01")
+    assert source.fetch("AAA", "2020-01-01", "2020-02-01").equals(first)
+    assert inner.calls == 2
+
+    assert source.invalidate("AAA") == 1
+    refetched = source.fetch("AAA", "2020-01-01", "2020-02-01")
+    assert inner.calls == 3
+    assert (refetched["close"] == 3.0).all()
+
+    source.fetch("BBB", "2020-01-01", "2020-02-01")
+    assert inner.calls == 3
@@ -0,0 +1,42 @@
+import runpy
+import sys
+from pathlib import Path
+
+import data_ingestor.sources
+import pandas as pd
+from data_ingestor.sources import DataSource
+
+SCRIPT = Path(__file__).resolve().parents[2] / "scripts" / "data" / "run_ingestion.py"
+
+
+class RecordingSource(DataSource):
+    name = "yfinance"
+
+    def __init__(self):
+        self.requests = []
+
+    def fetch(self, symbol, start=None, end=None, interval="1d"):
+        self.requests.append((symbol, str(start), str(end)))
+        index = pd.bdate_range(start, end or pd.Timestamp.now().normalize(), name="date")
+        bars = pd.DataFrame({c: 100.0 for c in ["open", "high", "low", "close"]}, index=index)
+        bars["volume"] = 1_000.0
+        return bars
+
+
+def run_script(monkeypatch, *argv):
+    monkeypatch.setattr(sys, "argv", [str(SCRIPT), "--store-dir", "store", *argv])
+    runpy.run_path(str(SCRIPT), run_name="__main__")
+
+
+def test_full_refresh_bypasses_cached_history(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    source = RecordingSource()
+    monkeypatch.setattr(data_ingestor.sources, "get_source", lambda name: source)
+
+    run_script(monkeypatch, "--start-date", "2023-01-02")
+    first = [r for r in source.requests if r[1] == "2023-01-02"]
+    assert first  # closed history fetched (and cached) once per symbol
+
+    source.requests.clear()
+    run_script(monkeypatch, "--start-date", "2023-01-02", "--full-refresh")
+    assert sorted(r for r in source.requests if r[1] == "2023-01-02") == sorted(first)
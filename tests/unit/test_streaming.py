@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+from feature_engineer.streaming import IncrementalFeatureEngineer, parity_report
+
+
+def make_bars(n=300, symbols=("AAA", "BBB"), seed=0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2021-01-01", periods=n)
+    frames = []
+    for symbol in symbols:
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+        frames.append(
+            pd.DataFrame(
+                {
+                    "open": close,
+                    "high": close * 1.01,
+                    "low": close * 0.99,
+                    "close": close,
+                    "volume": rng.integers(1_000, 10_000, n).astype(float),
+                    "symbol": symbol,
+                },
+                index=dates,
+            )
+        )
+    return pd.concat(frames).sort_index(kind="stable")
+
+
+def test_streaming_matches_batch():
+    report = parity_report(make_bars(), warmup=60)
+    assert (report < 1e-8).all(), report[report >= 1e-8]
+
+
+def test_missing_close_carries_ewm_level():
+    bars = make_bars(n=80, symbols=("AAA",))
+    bars.iloc[40, bars.columns.get_loc("close")] = np.nan
+
+    engineer = IncrementalFeatureEngineer()
+    out = engineer.update_frame(bars)
+
+    state = engineer.states["AAA"]
+    assert all(np.isfinite(v) for v in state.ema.values())
+    assert out["macd"].iloc[41:].notna().all()
+    assert out["macd"].iloc[40] == out["macd"].iloc[39]
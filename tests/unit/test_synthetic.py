@@ -0,0 +1,20 @@
+import pytest
+from core_utils.intervals import SUPPORTED_INTERVALS, bars_per_day
+from data_ingestor.synthetic import SyntheticSource, bar_index
+
+
+@pytest.mark.parametrize("interval", SUPPORTED_INTERVALS)
+def test_bars_per_day_matches_generated_sessions(interval):
+    idx = bar_index("2024-01-01", "2024-01-31", interval)
+    per_session = idx.normalize().value_counts()
+    assert (per_session == bars_per_day(interval)).all()
+
+
+@pytest.mark.parametrize("interval", ["1d", "30m", "1h"])
+def test_generate_is_deterministic(interval):
+    source = SyntheticSource()
+    a = source.generate("AAA.NS", interval)
+    b = source.generate("AAA.NS", interval)
+    assert a.equals(b)
+    assert (a["high"] >= a[["open", "close"]].max(axis=1)).all()
+    assert (a["low"] <= a[["open", "close"]].min(axis=1)).all()
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+from data_ingestor.validation import CHECKS, validate_panel
+
+SESSIONS = pd.bdate_range("2024-01-01", periods=30, name="date")
+
+
+def make_panel(symbols=("AAA", "BBB")) -> pd.DataFrame:
+    frames = []
+    for i, symbol in enumerate(symbols):
+        close = 100.0 + i + np.arange(len(SESSIONS))
+        frames.append(
+            pd.DataFrame(
+                {
+                    "open": close,
+                    "high": close + 1,
+                    "low": close - 1,
+                    "close": close,
+                    "volume": 1_000.0,
+                    "symbol": symbol,
+                },
+                index=SESSIONS,
+            )
+        )
+    return pd.concat(frames)
+
+
+def test_clean_panel_passes():
+    report = validate_panel(make_panel())
+    assert report.ok
+    assert list(report.summary().columns) == list(CHECKS)
+
+
+def test_row_checks():
+    df = make_panel()
+    aaa = np.flatnonzero(df["symbol"] == "AAA")
+    df.iloc[aaa[3], df.columns.get_loc("volume")] = 0.0
+    df.iloc[aaa[5], df.columns.get_loc("low")] = 1_000.0
+    df.iloc[aaa[7], df.columns.get_loc("close")] = np.nan
+    prices = [df.columns.get_loc(c) for c in ["open", "high", "low", "close"]]
+    df.iloc[aaa[20:], prices] *= 2  # one jump at bar 20
+
+    summary = validate_panel(df).summary()
+    assert summary.loc["AAA", "zero_volume"] == 1
+    assert summary.loc["AAA", "ohlc_inconsistent"] == 1
+    assert summary.loc["AAA", "missing_values"] == 1
+    assert summary.loc["AAA", "price_jump"] == 1
+    assert summary.loc["BBB"].sum() == 0
+
+
+def test_duplicate_and_non_monotonic():
+    df = make_panel(("AAA",))
+    df = pd.concat([df.iloc[:10], df.iloc[[9]], df.iloc[12:11:-1], df.iloc[11:12], df.iloc[13:]])
+    issues = validate_panel(df).issues().set_index("check")["count"]
+    assert issues["duplicate_timestamp"] == 1
+    assert issues["non_monotonic"] >= 1
+
+
+@pytest.mark.parametrize("order", ["sorted", "reversed", "shuffled"])
+def test_missing_days_with_explicit_calendar_in_any_order(order):
+    df = make_panel(("AAA",)).drop(SESSIONS[[4, 10, 11]])
+    calendar = {
+        "sorted": SESSIONS,
+        "reversed": SESSIONS[::-1],
+        "shuffled": SESSIONS[np.random.default_rng(0).permutation(len(SESSIONS))],
+    }[order]
+
+    report = validate_panel(df, calendar=calendar).table.set_index("check")
+    assert report.loc["missing_days", "count"] == 3
+    assert report.loc["missing_days", "first_timestamp"] == SESSIONS[4]
+
+
+def test_missing_days_uses_panel_union_by_default():
+    df = make_panel()
+    df = df[~((df["symbol"] == "BBB") & df.index.isin(SESSIONS[[6, 7]]))]
+    summary = validate_panel(df).summary()
+    assert summary.loc["BBB", "missing_days"] == 2
+    assert summary.loc["AAA", "missing_days"] == 0
+
+
+def test_empty_calendar_expects_no_sessions():
+    df = make_panel(("AAA",)).drop(SESSIONS[[4]])
+    report = validate_panel(df, calendar=pd.DatetimeIndex([]))
+    assert report.summary().loc["AAA", "missing_days"] == 0
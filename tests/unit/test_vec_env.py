@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+from trading_environment.env import TradingEnv
+from trading_environment.vec_env import VecTradingEnv
+
+FEATURES = ["f0", "f1"]
+
+
+def make_frames(n=40, symbols=("AAA", "BBB"), seed=0) -> dict[str, pd.DataFrame]:
+    rng = np.random.default_rng(seed)
+    return {
+        s: pd.DataFrame(
+            {
+                "f0": rng.normal(size=n),
+                "f1": rng.normal(size=n),
+                "xgb_prob": rng.uniform(size=n),
+                "ret_1d": rng.normal(0, 0.01, n),
+            }
+        )
+        for s in symbols
+    }
+
+
+def test_matches_trading_env_step_for_step():
+    frames = make_frames()
+    venv = VecTradingEnv(frames, FEATURES, n_envs=2)
+    envs = [TradingEnv(frames[s], FEATURES) for s in frames]
+
+    obs = venv.reset()
+    actions = np.random.default_rng(1).integers(0, 3, size=(10, 2))
+    for row in actions:
+        expected = [env.step(a) for env, a in zip(envs, row, strict=True)]
+        obs, rewards, dones, _ = venv.step(row)
+        np.testing.assert_array_equal(obs, np.stack([e[0] for e in expected]))
+        np.testing.assert_allclose(rewards, [e[1] for e in expected], rtol=1e-6)
+
+
+def test_env_method_reset_only_touches_given_envs():
+    venv = VecTradingEnv(make_frames(), FEATURES, n_envs=2)
+    venv.reset()
+    venv.step(np.array([2, 0]))
+    venv.step(np.array([2, 0]))
+
+    ((obs, info),) = venv.env_method("reset", indices=[0])
+    # current_step is the row in the shared EpisodeData (BBB starts at row 40)
+    assert venv.get_attr("current_step") == [0, 42]
+    assert venv.get_attr("position") == [0, -1]
+    assert obs[-1] == 0
+    assert info == {}
+
+
+def test_per_env_attributes():
+    venv = VecTradingEnv(make_frames(), FEATURES, n_envs=2)
+    venv.reset()
+    assert venv.get_attr("symbol") == ["AAA", "BBB"]
+
+    venv.set_attr("position", 1, indices=[1])
+    assert venv.get_attr("position") == [0, 1]
+
+    venv.set_attr("commission", 0.002)
+    assert venv.get_attr("commission", indices=[1]) == [0.002]
+    with pytest.raises(NotImplementedError):
+        venv.set_attr("commission", 0.0, indices=[0])
+    with pytest.raises(NotImplementedError):
+        venv.env_method("step", 1, indices=[0])
+    assert venv.env_method("render") == [None, None]
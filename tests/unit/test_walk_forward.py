@@ -0,0 +1,41 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.backtesting.splits import walk_forward_folds
+from src.backtesting.walk_forward import (
+    FOLD_FILE,
+    _write_json,
+    completed,
+    data_fingerprint,
+    fold_dir,
+)
+
+
+def test_folds_tile_the_test_period():
+    folds = walk_forward_folds(1000, 500, 250, 100, "rolling")
+    assert [f.test_start for f in folds] == [750, 850, 950]
+    assert folds[-1].test_end == 1000
+    assert all(f.xgb_start == f.ppo_start - 500 for f in folds)
+
+
+def test_completed_requires_same_data(tmp_path):
+    df = pd.DataFrame({"x": np.arange(1000.0), "ret_1d": 0.0})
+    fold = walk_forward_folds(len(df), 500, 250, 100)[0]
+    config = {"commission": 0.001}
+    out_dir = str(tmp_path)
+    os.makedirs(fold_dir(out_dir, fold))
+    summary = {**fold.to_dict(), "config": config, "data": data_fingerprint(df, fold)}
+    _write_json(os.path.join(fold_dir(out_dir, fold), FOLD_FILE), summary)
+
+    assert completed(fold, out_dir, config, data_fingerprint(df, fold)) == summary
+    assert completed(fold, out_dir, {"commission": 0.002}, data_fingerprint(df, fold)) is None
+
+    # rows outside the fold do not matter, rows inside it (incl. the bar after) do
+    later = df.copy()
+    later.loc[fold.test_end + 1 :, "x"] = -1.0
+    assert completed(fold, out_dir, config, data_fingerprint(later, fold)) is not None
+    restated = df.copy()
+    restated.loc[fold.test_end, "x"] = -1.0
+    assert completed(fold, out_dir, config, data_fingerprint(restated, fold)) is None